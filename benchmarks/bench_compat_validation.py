@@ -0,0 +1,78 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares constructing models with legacy keys from `json.loads` output
+against validating the same JSON directly with `model_validate_json`.
+Before compat. handling moved into model validators, only the constructor
+path remapped legacy keys.
+
+Usage: python benchmarks/bench_compat_validation.py [iterations]
+"""
+
+import json
+import sys
+
+from time import time
+from timeit import repeat
+
+from neon_data_models.models.base.contexts import TimingContext
+from neon_data_models.models.client.node import NodeData, NodeLocation
+
+
+def _timeit(func, number: int) -> float:
+    # Best of several runs to reduce noise
+    return min(repeat(func, number=number, repeat=5))
+
+
+def _report(name: str, iterations: int, seconds: float):
+    print(f"{name:<48} {iterations / seconds:>12,.0f} ops/s")
+
+
+def main(iterations: int = 100000):
+    cases = {
+        TimingContext: json.dumps({"transcribed": time(),
+                                   "text_parsers": 0.0123,
+                                   "get_stt": 0.5, "get_tts": 0.25,
+                                   "client_sent": time()}),
+        NodeLocation: json.dumps({"lat": 47.6, "lon": -122.2,
+                                  "site_id": "test"}),
+        NodeData: json.dumps({"device_id": "test", "device_name": "test",
+                              "location": {"lat": 47.6, "lon": -122.2}}),
+    }
+    for model, serialized in cases.items():
+        assert model(**json.loads(serialized)) == \
+               model.model_validate_json(serialized)
+        _report(f"{model.__name__}(**json.loads())", iterations,
+                _timeit(lambda: model(**json.loads(serialized)),
+                       number=iterations))
+        _report(f"{model.__name__}.model_validate_json()", iterations,
+                _timeit(lambda: model.model_validate_json(serialized),
+                       number=iterations))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,68 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures the per-stage overhead of timing instrumentation, enabled and
+disabled, against recording a stage by hand with `datetime.now()`.
+
+Usage: python benchmarks/bench_instrumentation.py [iterations]
+"""
+
+import sys
+
+from datetime import datetime
+from timeit import repeat
+
+from neon_data_models.instrumentation import set_enabled
+from neon_data_models.models.base.contexts import TimingContext
+
+
+def _report(name: str, iterations: int, seconds: float):
+    print(f"{name:<32} {seconds / iterations * 1e9:>8,.0f} ns/stage")
+
+
+def main(iterations: int = 200000):
+    timing = TimingContext()
+
+    def manual():
+        start = datetime.now()
+        timing.get_stt = datetime.now() - start
+
+    def instrumented():
+        with timing.stage("get_stt"):
+            pass
+
+    _report("datetime.now() by hand", iterations,
+            min(repeat(manual, number=iterations, repeat=5)))
+    _report("TimingContext.stage()", iterations,
+            min(repeat(instrumented, number=iterations, repeat=5)))
+    set_enabled(False)
+    _report("TimingContext.stage() disabled", iterations,
+            min(repeat(instrumented, number=iterations, repeat=5)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,76 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Compares forwarding a `NodeAudioInput` with a large base64 payload as a
+`PassthroughMessage` against fully validating and re-serializing it.
+
+Usage: python benchmarks/bench_passthrough.py [audio_bytes]
+"""
+
+import sys
+
+from os import urandom
+from timeit import repeat
+
+from neon_data_models.models.api.node_v1 import NodeAudioInput
+from neon_data_models.models.base.messagebus import PassthroughMessage
+
+
+def _timeit(func, number: int) -> float:
+    # Best of several runs to reduce noise
+    return min(repeat(func, number=number, repeat=5)) / number
+
+
+def _report(name: str, seconds: float):
+    print(f"{name:<44} {seconds * 1000:>10.3f} ms")
+
+
+def main(audio_bytes: int = 1024 * 1024):
+    message = NodeAudioInput(
+        data={"audio_data": urandom(audio_bytes), "lang": "en-us"},
+        context={"session": {"session_id": "abc123"},
+                 "timing": {"client_sent": 1.0, "get_stt": 0.5},
+                 "username": "test_user", "source": "node",
+                 "destination": ["audio"]})
+    serialized = message.model_dump_json().encode()
+    passthrough = PassthroughMessage.model_validate_json(serialized)
+    assert passthrough.model_dump_json().encode() == serialized
+    print(f"Message size: {len(serialized):,} bytes")
+
+    number = 50
+    _report("NodeAudioInput validate + dump", _timeit(
+        lambda: NodeAudioInput.model_validate_json(
+            serialized).model_dump_json(), number=number))
+    _report("PassthroughMessage validate + dump", _timeit(
+        lambda: PassthroughMessage.model_validate_json(
+            serialized).model_dump_json(), number=number))
+    _report("PassthroughMessage validate", _timeit(
+        lambda: PassthroughMessage.model_validate_json(serialized),
+        number=number))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024 * 1024)
@@ -0,0 +1,78 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares authorization checks against `PermissionsConfig` attributes with
+`PermissionPolicy` checks of packed permissions, for single checks and for
+listing the users allowed to perform an action.
+
+Usage: python benchmarks/bench_permissions.py [users]
+"""
+
+import sys
+
+from random import choice
+from timeit import repeat
+
+from neon_data_models.enum import AccessRoles
+from neon_data_models.models.user import PermissionPolicy, User
+
+
+def _timeit(func, number: int) -> float:
+    # Best of several runs to reduce noise
+    return min(repeat(func, number=number, repeat=5))
+
+
+def _report(name: str, iterations: int, seconds: float):
+    print(f"{name:<44} {iterations / seconds:>12,.0f} ops/s")
+
+
+def main(users: int = 100000):
+    roles = list(AccessRoles)
+    records = [User.model_validate({"username": f"user_{i}", "permissions": {
+        "klat": choice(roles), "llm": choice(roles)}}) for i in range(users)]
+    packed = [u.permissions.to_bits() for u in records]
+    policy = PermissionPolicy({"moderate": ("klat", AccessRoles.ADMIN),
+                               "infer": ("llm", AccessRoles.USER)})
+    user = records[0]
+    bits = packed[0]
+
+    _report("attribute check", 100000,
+            _timeit(lambda: user.permissions.klat >= AccessRoles.ADMIN,
+                    number=100000))
+    _report("PermissionPolicy.allows(packed)", 100000,
+            _timeit(lambda: policy.allows(bits, "moderate"), number=100000))
+    _report(f"attribute listing ({users:,} users)", users,
+            _timeit(lambda: [u for u in records
+                             if u.permissions.klat >= AccessRoles.ADMIN],
+                    number=1))
+    _report(f"evaluate_many(packed) ({users:,} users)", users,
+            _timeit(lambda: policy.evaluate_many(packed, "moderate"),
+                    number=1))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,79 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures ingesting and summarizing `TimingContext` records with
+`TimingTable`, with and without NumPy, and computing derived metrics per
+record compared to columns of a `TimingTable`.
+
+Usage: python benchmarks/bench_timing_analytics.py [records]
+"""
+
+import sys
+
+from random import random
+from time import perf_counter, time
+
+from neon_data_models.analytics import TimingTable, _get_numpy
+from neon_data_models.models.base.contexts import (TimingContext,
+                                                   DERIVED_METRICS)
+
+
+def main(records: int = 1000000):
+    now = time()
+    timings = [TimingContext.model_validate(
+        {"client_sent": now, "response_sent": now + 2, "get_stt": random(),
+         "get_tts": random(),
+         "mq_from_client": random() / 10, "wait_in_queue": random() / 100})
+        for _ in range(records)]
+    for use_numpy in (False, True):
+        if use_numpy and not _get_numpy():
+            print("NumPy is not installed")
+            continue
+        start = perf_counter()
+        table = TimingTable(use_numpy=use_numpy)
+        table.extend(timings)
+        ingested = perf_counter()
+        table.summarize()
+        for field in ("get_stt", "get_tts"):
+            table.histogram(field, bins=50)
+        done = perf_counter()
+        print(f"{'numpy' if use_numpy else 'stdlib':<8} "
+              f"{records:,} records: ingest {ingested - start:.2f}s, "
+              f"summarize {done - ingested:.2f}s")
+        start = perf_counter()
+        for name in DERIVED_METRICS:
+            table.stats(name)
+        print(f"{'':<8} derived metrics from table: "
+              f"{perf_counter() - start:.2f}s")
+    start = perf_counter()
+    for name in DERIVED_METRICS:
+        [getattr(t, name) for t in timings]
+    print(f"derived metrics per record: {perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,92 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares finding expired tokens by scanning every user's tokens against
+`TokenExpiryIndex.pop_expired`, for a sweep where a small fraction of tokens
+has expired, and for repeated refresh sweeps when most access tokens have
+expired but can still be refreshed.
+
+Usage: python benchmarks/bench_token_expiry.py [users]
+"""
+
+import sys
+
+from random import randint
+from time import perf_counter
+
+from neon_data_models.models.user import User, TokenExpiryIndex
+
+
+def _report(name: str, seconds: float):
+    print(f"{name:<44} {seconds * 1000:>10,.2f} ms")
+
+
+def main(users: int = 50000):
+    records = [User.model_validate({"username": f"user_{i}", "tokens": [
+        {"username": f"user_{i}", "client_id": f"client_{j}",
+         "permissions": {}, "refresh_token": "", "token_name": "token",
+         "expiration": randint(0, 100000),
+         "refresh_expiration": randint(0, 100000),
+         "creation_timestamp": 0, "last_refresh_timestamp": 0}
+        for j in range(2)]}) for i in range(users)]
+    start = perf_counter()
+    index = TokenExpiryIndex.from_users(records)
+    _report(f"build index ({users:,} users)", perf_counter() - start)
+
+    # One sweep 1% of the way through the expiration range
+    now = 1000
+    start = perf_counter()
+    scanned = [(u.username, t.token_name) for u in records
+               for t in u.tokens if t.refresh_expiration <= now]
+    _report("full scan", perf_counter() - start)
+    start = perf_counter()
+    expired = index.pop_expired(now=now, kind="refresh")
+    _report(f"pop_expired ({len(expired):,} expired)",
+            perf_counter() - start)
+    assert len(expired) == len(scanned)
+
+    # Steady state: access tokens expired, refresh tokens still valid
+    for user in records:
+        for token in user.tokens:
+            token.expiration = 0
+            token.refresh_expiration = 200000
+    index = TokenExpiryIndex.from_users(records)
+    now = 100000
+    start = perf_counter()
+    scanned = [(u.username, t.token_name) for u in records
+               for t in u.tokens if t.refresh_expiration <= now]
+    _report("full scan (access expired)", perf_counter() - start)
+    for sweep in range(2):
+        start = perf_counter()
+        expired = index.pop_expired(now=now, kind="refresh")
+        _report(f"pop_expired refresh, sweep {sweep + 1}",
+                perf_counter() - start)
+        assert len(expired) == len(scanned) == 0
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
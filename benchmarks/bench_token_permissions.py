@@ -0,0 +1,87 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures memory used by `TokenConfig.permissions` for many tokens, with
+interned `PermissionSet` values compared to a plain dict per token.
+
+Usage: python benchmarks/bench_token_permissions.py [tokens]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from random import choice
+from typing import Dict
+from timeit import repeat
+
+from neon_data_models.models.user import TokenConfig
+
+
+class DictTokenConfig(TokenConfig):
+    permissions: Dict[str, bool]
+
+
+def _measure(model, records: list) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    tokens = [model.model_validate(r) for r in records]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokens, size
+
+
+def main(tokens: int = 1000000):
+    # A few distinct permission maps, as assigned by role
+    maps = [{"chat": True, "admin": admin, "llm": llm, "node": node,
+             "hub": False} for admin in (True, False)
+            for llm in (True, False) for node in (True, False)]
+    records = [{"username": f"user_{i}", "client_id": "client",
+                "permissions": dict(choice(maps)), "refresh_token": "",
+                "expiration": 0, "refresh_expiration": 0,
+                "token_name": "token", "creation_timestamp": 0,
+                "last_refresh_timestamp": 0} for i in range(tokens)]
+    for name, model in (("Dict[str, bool]", DictTokenConfig),
+                        ("PermissionSet", TokenConfig)):
+        validated, size = _measure(model, records)
+        permissions = validated[0].permissions
+        if isinstance(permissions, dict):
+            checks = {"get": lambda: permissions.get("admin", False)}
+        else:
+            checks = {"allows": lambda: permissions.allows("admin"),
+                      "in granted": lambda: "admin" in permissions.granted}
+        checks = ", ".join(
+            f"{check} {min(repeat(func, number=1000000, repeat=5)) * 1000:.0f}"
+            f" ns" for check, func in checks.items())
+        print(f"{name:<16} {tokens:,} tokens: {size / 2 ** 20:,.0f} MiB, "
+              f"{len({id(t.permissions) for t in validated})} permission "
+              f"objects, {checks}")
+        del validated
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
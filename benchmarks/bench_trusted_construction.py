@@ -0,0 +1,87 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares validating a realistic, nested `NodeTextInput` and a flat
+`TimingContext` from `model_dump()` output against `model_validate_trusted`.
+
+Usage: python benchmarks/bench_trusted_construction.py [iterations]
+"""
+
+import sys
+
+from time import time
+from timeit import repeat
+
+from neon_data_models.models.api.node_v1 import NodeTextInput
+from neon_data_models.models.base.contexts import TimingContext
+
+
+def _timeit(func, number: int) -> float:
+    # Best of several runs to reduce noise
+    return min(repeat(func, number=number, repeat=5))
+
+
+def _report(name: str, iterations: int, seconds: float):
+    print(f"{name:<44} {iterations / seconds:>12,.0f} ops/s")
+
+
+def main(iterations: int = 20000):
+    message = NodeTextInput(
+        data={"utterances": ["what time is it"], "lang": "en-us"},
+        context={"session": {"session_id": "abc123", "lang": "en-us"},
+                 "node_data": {"device_name": "test",
+                               "location": {"latitude": 47.6,
+                                            "longitude": -122.2}},
+                 "timing": {"client_sent": time(), "get_stt": 0.5,
+                            "mq_from_client": 0.01},
+                 "user_profiles": [{"user": {"first_name": "Test"},
+                                    "units": {"measure": "metric"}}],
+                 "mq": {"message_id": "test_message"},
+                 "username": "test_user",
+                 "source": "node",
+                 "destination": ["skills"]})
+    serialized = message.model_dump()
+    assert NodeTextInput.model_validate_trusted(serialized) == message
+
+    _report("NodeTextInput.model_validate()", iterations,
+            _timeit(lambda: NodeTextInput.model_validate(serialized),
+                   number=iterations))
+    _report("NodeTextInput.model_validate_trusted()", iterations,
+            _timeit(lambda: NodeTextInput.model_validate_trusted(serialized),
+                   number=iterations))
+
+    timing = serialized["context"]["timing"]
+    _report("TimingContext.model_validate()", iterations,
+            _timeit(lambda: TimingContext.model_validate(timing),
+                   number=iterations))
+    _report("TimingContext.model_validate_trusted()", iterations,
+            _timeit(lambda: TimingContext.model_validate_trusted(timing),
+                   number=iterations))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,93 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares `User` field equality and hashing by content digest against
+comparing `model_dump()` output.
+
+Usage: python benchmarks/bench_user_equality.py [iterations]
+"""
+
+import sys
+
+from time import time
+from timeit import repeat
+
+from neon_data_models.models.user import User
+
+
+def _timeit(func, number: int) -> float:
+    # Best of several runs to reduce noise
+    return min(repeat(func, number=number, repeat=5))
+
+
+def _report(name: str, iterations: int, seconds: float):
+    print(f"{name:<44} {iterations / seconds:>12,.0f} ops/s")
+
+
+def _get_user() -> dict:
+    now = round(time())
+    return {
+        "username": "test_user", "user_id": "test_id",
+        "created_timestamp": now,
+        "neon": {"user": {"first_name": "Test", "email": "test@neon.ai"},
+                 "skills": {f"skill_{i}.neongeckocom": {
+                     "setting": i, "options": list(range(10))}
+                     for i in range(20)}},
+        "klat": {"preferences": {"theme": "dark"}},
+        "permissions": {"klat": 1, "core": 1},
+        "tokens": [{"username": "test_user", "client_id": f"client_{i}",
+                    "permissions": {"admin": False},
+                    "refresh_token": f"refresh_{i}",
+                    "access_token": f"access_{i}", "expiration": now,
+                    "refresh_expiration": now, "token_name": f"token_{i}",
+                    "creation_timestamp": now, "last_refresh_timestamp": now}
+                   for i in range(5)]}
+
+
+def main(iterations: int = 20000):
+    user = User.model_validate(_get_user())
+    other = User.model_validate(_get_user())
+    assert user == other
+
+    _report("User == User (model_dump())", iterations,
+            _timeit(lambda: user.model_dump() == other.model_dump(),
+                    number=iterations))
+    _report("User == User", iterations,
+            _timeit(lambda: user == other, number=iterations))
+    _report("hash(User)", iterations,
+            _timeit(lambda: hash(user), number=iterations))
+
+    def _uncached():
+        user.invalidate_digest()
+        return user.content_digest
+
+    _report("User.content_digest (not cached)", iterations,
+            _timeit(_uncached, number=iterations))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
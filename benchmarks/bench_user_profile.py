@@ -0,0 +1,77 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures converting users to legacy `UserProfile` objects, one at a time
+and in bulk.
+
+Usage: python benchmarks/bench_user_profile.py [users]
+"""
+
+import gc
+import sys
+
+from datetime import date
+from random import choice, randint
+from time import perf_counter
+
+from neon_data_models.models.user import User, UserProfile
+
+TIMEZONES = ("America/Los_Angeles", "America/New_York", "Europe/Kyiv",
+             "Asia/Tokyo", "UTC", None)
+
+
+def main(users: int = 100000):
+    records = [User.model_validate({
+        "username": f"user_{i}",
+        "neon": {"user": {"first_name": "Test", "last_name": f"User {i}",
+                          "dob": date(randint(1950, 2010), randint(1, 12),
+                                      randint(1, 28))},
+                 "language": {"input_languages": ["en-us", "uk-ua"],
+                              "output_languages": ["en-us"]},
+                 "location": {"latitude": 47.6, "longitude": -122.2,
+                              "timezone": choice(TIMEZONES)}}})
+        for i in range(users)]
+    # Garbage collection of the growing heap would otherwise dominate the
+    # measurement. Profiles are kept in both cases
+    gc.collect()
+    gc.disable()
+    start = perf_counter()
+    profiles = [UserProfile.from_user_object(user) for user in records]
+    elapsed = perf_counter() - start
+    print(f"from_user_object ({users:,} users): {elapsed:.2f}s, "
+          f"{users / elapsed:,.0f} users/s")
+    del profiles
+    start = perf_counter()
+    profiles = UserProfile.from_user_objects(records)
+    elapsed = perf_counter() - start
+    print(f"from_user_objects ({users:,} users): {elapsed:.2f}s, "
+          f"{users / elapsed:,.0f} users/s")
+    gc.enable()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
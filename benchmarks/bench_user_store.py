@@ -0,0 +1,88 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures `UserStore` lookups as the number of stored users grows, compared
+to scanning a list of users.
+
+Usage: python benchmarks/bench_user_store.py [max_users]
+"""
+
+import sys
+
+from random import choice
+from time import time
+from timeit import repeat
+
+from neon_data_models.models.user import User, UserStore
+
+
+def _timeit(func, number: int) -> float:
+    # Best of several runs to reduce noise
+    return min(repeat(func, number=number, repeat=5))
+
+
+def _report(name: str, iterations: int, seconds: float):
+    print(f"{name:<44} {iterations / seconds:>12,.0f} ops/s")
+
+
+def _get_user(index: int) -> User:
+    now = round(time())
+    return User.model_validate({
+        "username": f"user_{index}", "user_id": f"id_{index}",
+        "neon": {"user": {"email": f"user_{index}@neon.ai"}},
+        "tokens": [{"username": f"user_{index}", "client_id": "client",
+                    "permissions": {}, "refresh_token": f"refresh_{index}",
+                    "access_token": f"access_{index}", "expiration": now,
+                    "refresh_expiration": now, "token_name": "token",
+                    "creation_timestamp": now,
+                    "last_refresh_timestamp": now}]})
+
+
+def main(max_users: int = 100000):
+    users = []
+    size = 1000
+    while size <= max_users:
+        users.extend(_get_user(i) for i in range(len(users), size))
+        store = UserStore()
+        store.put_many(users)
+        names = [f"user_{choice(range(size))}" for _ in range(1000)]
+        tokens = [f"access_{choice(range(size))}" for _ in range(1000)]
+        _report(f"{size:>9,} users get_by_username()", len(names),
+                _timeit(lambda: [store.get_by_username(n) for n in names],
+                        number=1))
+        _report(f"{size:>9,} users get_by_token()", len(tokens),
+                _timeit(lambda: [store.get_by_token(t) for t in tokens],
+                        number=1))
+        if size <= 10000:
+            _report(f"{size:>9,} users list scan by username", 100,
+                    _timeit(lambda: [next(u for u in users if u.username == n)
+                                     for n in names[:100]], number=1))
+        size *= 10
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
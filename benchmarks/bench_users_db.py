@@ -0,0 +1,113 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Load test of the `UserDbRequest` protocol against the reference users
+database service. Concurrent clients send a mix of reads, patch updates and
+projected reads; throughput and latency percentiles are reported.
+
+Usage: python benchmarks/bench_users_db.py [--users N] [--requests N]
+    [--concurrency N] [--database PATH]
+"""
+
+import asyncio
+
+from argparse import ArgumentParser
+from random import choice, random
+from time import perf_counter
+
+from neon_data_models.analytics import _percentile
+from neon_data_models.models.api.mq import UserDbBatchRequest, UserDbRequest
+from neon_data_models.users_db import UsersDatabase, UsersDbServer
+
+
+def _get_request(users: int) -> UserDbRequest:
+    username = f"user_{choice(range(users))}"
+    kind = random()
+    if kind < 0.6:
+        return UserDbRequest(operation="read", username=username,
+                             message_id="bench")
+    if kind < 0.9:
+        return UserDbRequest(operation="read", username=username,
+                             message_id="bench", fields=["permissions"])
+    return UserDbRequest(operation="update", username=username,
+                         message_id="bench",
+                         patch={"neon": {"units": {"time": choice((12, 24))}}})
+
+
+async def _client(server: UsersDbServer, requests: list, latencies: list):
+    for request in requests:
+        start = perf_counter()
+        result = await server.request(request)
+        latencies.append(perf_counter() - start)
+        assert result.success, result.error
+
+
+async def _run(users: int, requests: int, concurrency: int, database: str):
+    async with UsersDbServer(UsersDatabase(database)) as server:
+        start = perf_counter()
+        for batch in UserDbBatchRequest.from_operations(
+                (UserDbRequest(operation="create", username=f"user_{i}",
+                               message_id="bench",
+                               user={"username": f"user_{i}",
+                                     "neon": {"skills": {
+                                         f"skill_{j}": {"setting": j}
+                                         for j in range(20)}}})
+                 for i in range(users)), batch_size=500):
+            response = await server.request(batch)
+            assert not response.errors, response.errors
+        print(f"created {users:,} users in batches: "
+              f"{perf_counter() - start:.2f}s")
+
+        per_client = [[_get_request(users)
+                       for _ in range(requests // concurrency)]
+                      for _ in range(concurrency)]
+        latencies = []
+        start = perf_counter()
+        await asyncio.gather(*(_client(server, r, latencies)
+                               for r in per_client))
+        elapsed = perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies):,} requests, concurrency {concurrency}: "
+          f"{len(latencies) / elapsed:,.0f} requests/s")
+    print("latency ms: " + ", ".join(
+        f"p{p} {_percentile(latencies, p) * 1000:.2f}" for p in (50, 95, 99)))
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--database", default=":memory:",
+                        help="SQLite database path")
+    args = parser.parse_args()
+    asyncio.run(_run(args.users, args.requests, args.concurrency,
+                     args.database))
+
+
+if __name__ == "__main__":
+    main()
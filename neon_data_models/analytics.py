@@ -0,0 +1,282 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from array import array
+from datetime import datetime, timedelta
+from itertools import islice
+from math import fsum, isnan, nan
+from operator import sub
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from neon_data_models.models.base.contexts import (
+    TimingContext, DERIVED_METRICS, PROCESSING_DURATIONS, QUEUE_DURATIONS,
+    TRANSPORT_DURATIONS)
+
+# TimingContext fields by type; timestamps are stored as Unix time and
+# durations as seconds
+TIMESTAMP_FIELDS = tuple(name for name, field in
+                         TimingContext.model_fields.items()
+                         if field.annotation == Optional[datetime])
+DURATION_FIELDS = tuple(name for name, field in
+                        TimingContext.model_fields.items()
+                        if field.annotation == Optional[timedelta])
+
+# Number of records converted to columns at a time by `TimingTable.extend`
+_EXTEND_BATCH_SIZE = 4096
+
+
+def _get_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _to_array(values: Any) -> array:
+    # Copy a NumPy float64 array into a column
+    column = array("d")
+    column.frombytes(values.tobytes())
+    return column
+
+
+class TimingStats(NamedTuple):
+    """
+    Summary statistics for one timing column, in seconds. Values other than
+    `count` are `None` if there are no values.
+    """
+    count: int
+    mean: Optional[float]
+    p50: Optional[float]
+    p95: Optional[float]
+    p99: Optional[float]
+    max: Optional[float]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """
+    Get a percentile of sorted values with linear interpolation (matching
+    the NumPy default).
+    """
+    rank = percent / 100 * (len(values) - 1)
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class TimingTable:
+    """
+    Columnar store of `TimingContext` records. Each field is stored in a
+    contiguous array of floats with NaN for unset values, so statistics are
+    computed in single passes over each column. NumPy is used if installed;
+    otherwise statistics are computed with the standard library.
+    """
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        @param use_numpy: If False, never use NumPy. If unset, NumPy is used
+            if it is installed
+        """
+        self._np = _get_numpy() if use_numpy is not False else None
+        if use_numpy and self._np is None:
+            raise ImportError("NumPy is not installed")
+        self._columns: Dict[str, array] = {
+            name: array("d") for name in TimingContext.model_fields}
+        # Derived metric columns, computed on first use
+        self._derived: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._columns[TIMESTAMP_FIELDS[0]])
+
+    def add(self, timing: TimingContext):
+        """
+        Add a single record.
+        """
+        self.extend((timing,))
+
+    def extend(self, timings: Iterable[TimingContext]):
+        """
+        Add many records. Records are consumed in fixed-size batches and
+        each column is extended once per batch, so memory use does not grow
+        with the length of `timings` beyond the columns themselves.
+        """
+        self._derived.clear()
+        timings = iter(timings)
+        while records := [t.__dict__ for t in islice(timings,
+                                                     _EXTEND_BATCH_SIZE)]:
+            for name in TIMESTAMP_FIELDS:
+                self._columns[name].extend(
+                    [nan if (v := r[name]) is None else v.timestamp()
+                     for r in records])
+            for name in DURATION_FIELDS:
+                self._columns[name].extend(
+                    [nan if (v := r[name]) is None else v.total_seconds()
+                     for r in records])
+
+    @classmethod
+    def from_jsonl(cls, source: Any, use_numpy: Optional[bool] = None,
+                   **kwargs) -> 'TimingTable':
+        """
+        Build a table from a JSON lines stream of `TimingContext` records.
+        @param source: Path or binary file object; see
+            `neon_data_models.stream.read_messages`
+        @param use_numpy: See `TimingTable.__init__`
+        @param kwargs: Additional arguments passed to `read_messages`
+        @returns: TimingTable containing all records in `source`
+        """
+        from neon_data_models.stream import read_messages
+        table = cls(use_numpy)
+        table.extend(read_messages(source, model=TimingContext, **kwargs))
+        return table
+
+    def column(self, name: str) -> array:
+        """
+        Get the values of one field or derived metric (see
+        `TimingContext.round_trip` etc.); unset values are NaN.
+        """
+        if name in self._columns:
+            return self._columns[name]
+        if name not in DERIVED_METRICS:
+            raise KeyError(name)
+        if name not in self._derived:
+            self._derived[name] = self._compute_derived(name)
+        return self._derived[name]
+
+    def _compute_derived(self, name: str) -> array:
+        columns = self._columns
+        if name == "round_trip":
+            return self._difference(columns["response_sent"],
+                                    columns["client_sent"])
+        if name == "audio_duration":
+            return self._difference(columns["audio_end"],
+                                    columns["audio_begin"])
+        if name == "transport":
+            return self._sum(TRANSPORT_DURATIONS)
+        if name == "processing":
+            return self._sum(PROCESSING_DURATIONS)
+        # Durations not covering any of `round_trip` count as 0
+        accounted = self._sum(PROCESSING_DURATIONS + TRANSPORT_DURATIONS +
+                              QUEUE_DURATIONS)
+        if self._np is None:
+            accounted = array("d", [0. if isnan(v) else v
+                                    for v in accounted])
+        elif len(accounted):
+            accounted = _to_array(self._np.nan_to_num(self._np.frombuffer(
+                accounted, dtype=self._np.float64), nan=0.))
+        return self._difference(self.column("round_trip"), accounted)
+
+    def _difference(self, left: array, right: array) -> array:
+        # NaN in either column propagates to the result
+        if self._np is None:
+            return array("d", map(sub, left, right))
+        return _to_array(self._np.frombuffer(left, dtype=self._np.float64) -
+                         self._np.frombuffer(right, dtype=self._np.float64))
+
+    def _sum(self, names: Tuple[str, ...]) -> array:
+        # Sum of set values per record; NaN if no values are set
+        if self._np is None:
+            result = [nan] * len(self)
+            for name in names:
+                result = [r if isnan(v) else v if isnan(r) else r + v
+                          for r, v in zip(result, self._columns[name])]
+            return array("d", result)
+        np = self._np
+        if not len(self):
+            return array("d")
+        stacked = np.stack([np.frombuffer(self._columns[name],
+                                          dtype=np.float64)
+                            for name in names])
+        totals = np.nansum(stacked, axis=0)
+        totals[np.isnan(stacked).all(axis=0)] = nan
+        return _to_array(totals)
+
+    def _values(self, name: str) -> Any:
+        column = self.column(name)
+        if self._np is not None:
+            values = self._np.frombuffer(column, dtype=self._np.float64) \
+                if len(column) else self._np.empty(0)
+            return values[~self._np.isnan(values)]
+        return [v for v in column if not isnan(v)]
+
+    def stats(self, name: str) -> TimingStats:
+        """
+        Get summary statistics for one field or derived metric.
+        """
+        values = self._values(name)
+        if not len(values):
+            return TimingStats(0, None, None, None, None, None)
+        if self._np is not None:
+            p50, p95, p99 = (float(p) for p in
+                             self._np.percentile(values, (50, 95, 99)))
+            return TimingStats(len(values), float(values.mean()), p50, p95,
+                               p99, float(values.max()))
+        values.sort()
+        return TimingStats(len(values), fsum(values) / len(values),
+                           _percentile(values, 50), _percentile(values, 95),
+                           _percentile(values, 99), values[-1])
+
+    def summarize(self, fields: Iterable[str] = DURATION_FIELDS) -> \
+            Dict[str, TimingStats]:
+        """
+        Get summary statistics for each field with any values.
+        @param fields: Fields to summarize. Defaults to all duration fields
+        @returns: dict of field name to TimingStats
+        """
+        summary = {}
+        for name in fields:
+            stats = self.stats(name)
+            if stats.count:
+                summary[name] = stats
+        return summary
+
+    def histogram(self, name: str, bins: int = 10,
+                  value_range: Optional[Tuple[float, float]] = None) -> \
+            Tuple[List[int], List[float]]:
+        """
+        Get a histogram of one field.
+        @param name: Field name
+        @param bins: Number of equal-width bins
+        @param value_range: (min, max) of the histogram. Defaults to the range
+            of the values; values outside the range are ignored
+        @returns: List of counts per bin and list of `bins + 1` bin edges
+        """
+        values = self._values(name)
+        if self._np is not None:
+            counts, edges = self._np.histogram(values, bins=bins,
+                                               range=value_range)
+            return counts.tolist(), edges.tolist()
+        if value_range is None:
+            value_range = (min(values), max(values)) if values else (0., 1.)
+        low, high = value_range
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        width = (high - low) / bins
+        edges = [low + width * i for i in range(bins)] + [high]
+        counts = [0] * bins
+        for value in values:
+            if low <= value <= high:
+                counts[min(int((value - low) / width), bins - 1)] += 1
+        return counts, edges
+
@@ -0,0 +1,348 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import mmap
+import os
+
+from os import PathLike
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from pydantic_core import from_json
+
+from neon_data_models.registry import get_adapter
+
+
+def _get_keys(record: dict) -> dict:
+    """
+    Get index keys for a serialized message.
+    """
+    context = record.get("context") or {}
+    return {"message_id": (context.get("mq") or {}).get("message_id"),
+            "msg_type": record.get("msg_type"),
+            "session_id": (context.get("session") or {}).get("session_id")}
+
+
+class MessageArchive:
+    """
+    Append-only archive of serialized messages. Messages are stored as JSON
+    lines with a sidecar index (`<path>.idx`) of the offset of each message,
+    keyed by `MQContext.message_id`, with secondary indexes on `msg_type` and
+    `session_id`. Reads slice a memory map of the archive, so lookups are a
+    single seek and do not copy the stored JSON.
+    """
+    def __init__(self, path: Union[str, PathLike]):
+        """
+        @param path: Path to the archive file; it is created if it does not
+            exist. The index is rebuilt if missing or out of date
+        """
+        self.path = str(path)
+        self.index_path = f"{self.path}.idx"
+        self._mmap: Optional[mmap.mmap] = None
+        self._by_id: Dict[str, int] = {}
+        # Secondary indexes map keys to ordered sets of offsets
+        self._by_msg_type: Dict[str, Dict[int, None]] = {}
+        self._by_session: Dict[str, Dict[int, None]] = {}
+        # Offset to (length, msg_type, session_id) of each current message
+        self._entries: Dict[int, Tuple[int, Optional[str], Optional[str]]] = {}
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "ab+")
+        self._size = os.path.getsize(self.path)
+        if not self._load_index():
+            self.rebuild_index()
+        self._index_file = open(self.index_path, "a")
+
+    def _add_to_index(self, offset: int, length: int, keys: dict):
+        msg_type = keys.get("msg_type")
+        session_id = keys.get("session_id")
+        self._entries[offset] = (length, msg_type, session_id)
+        if keys.get("message_id") is not None:
+            replaced = self._by_id.get(keys["message_id"])
+            self._by_id[keys["message_id"]] = offset
+            if replaced is not None:
+                self._remove_from_index(replaced)
+        if msg_type is not None:
+            self._by_msg_type.setdefault(msg_type, {})[offset] = None
+        if session_id is not None:
+            self._by_session.setdefault(session_id, {})[offset] = None
+
+    def _remove_from_index(self, offset: int):
+        _, msg_type, session_id = self._entries.pop(offset)
+        for index, key in ((self._by_msg_type, msg_type),
+                           (self._by_session, session_id)):
+            if key is not None:
+                index[key].pop(offset, None)
+                if not index[key]:
+                    del index[key]
+
+    def _clear_index(self):
+        self._by_id.clear()
+        self._by_msg_type.clear()
+        self._by_session.clear()
+        self._entries.clear()
+
+    def _load_index(self) -> bool:
+        """
+        Load the sidecar index. Returns False if the index is missing, can't
+        be parsed (i.e. a write was interrupted), or does not cover the whole
+        archive.
+        """
+        if not os.path.isfile(self.index_path):
+            return self._size == 0
+        end = 0
+        try:
+            with open(self.index_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn final entry; its message is checked below
+                        break
+                    entry = from_json(line)
+                    self._add_to_index(entry["offset"], entry["length"],
+                                       entry)
+                    end = max(end, entry["offset"] + entry["length"] + 1)
+        except (ValueError, KeyError, TypeError):
+            end = -1
+        if 0 <= end < self._size and not self._has_complete_record(end):
+            self._truncate(end)
+        if end != self._size:
+            self._clear_index()
+            return False
+        return True
+
+    def _has_complete_record(self, offset: int) -> bool:
+        """
+        Check if the archive has a newline-terminated record after `offset`.
+        """
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.readline().endswith(b"\n")
+
+    def _truncate(self, size: int):
+        """
+        Remove a torn final record (i.e. from an interrupted write) from the
+        end of the archive.
+        """
+        self._file.truncate(size)
+        self._size = size
+
+    def rebuild_index(self):
+        """
+        Rebuild the sidecar index by scanning the archive. A torn final
+        record (not newline-terminated or not valid JSON) is removed.
+        @raises ValueError: if any other record is not valid JSON
+        """
+        self._file.flush()
+        self._clear_index()
+        entries = []
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                length = len(line) - 1
+                if length:
+                    try:
+                        keys = _get_keys(from_json(line))
+                    except ValueError:
+                        if offset + len(line) < self._size:
+                            raise
+                        break
+                    self._add_to_index(offset, length, keys)
+                    entries.append(json.dumps({"offset": offset,
+                                               "length": length, **keys}))
+                offset += len(line)
+        if offset < self._size:
+            self._truncate(offset)
+        with open(self.index_path, "w") as f:
+            f.writelines(f"{e}\n" for e in entries)
+
+    def append(self, message: BaseModel) -> int:
+        """
+        Add a message to the archive. A message with the same `message_id`
+        as an archived message replaces it in the index.
+        @param message: Message to archive
+        @returns: Offset of the message in the archive
+        """
+        serialized = message.model_dump_json().encode()
+        offset = self._size
+        self._file.write(serialized + b"\n")
+        self._size += len(serialized) + 1
+        context = getattr(message, "context", None)
+        mq = getattr(context, "mq", None)
+        session = getattr(context, "session", None)
+        keys = {"message_id": getattr(mq, "message_id", None),
+                "msg_type": getattr(message, "msg_type", None),
+                "session_id": getattr(session, "session_id", None)}
+        self._add_to_index(offset, len(serialized), keys)
+        self._index_file.write(json.dumps({"offset": offset,
+                                           "length": len(serialized),
+                                           **keys}) + "\n")
+        return offset
+
+    def flush(self):
+        """
+        Flush pending writes to the archive and index.
+        """
+        self._file.flush()
+        self._index_file.flush()
+
+    def _read(self, offset: int) -> memoryview:
+        if self._mmap is None or offset >= len(self._mmap):
+            self.flush()
+            # The previous map is released with any views still referencing it
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        length = self._entries[offset][0]
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def get_raw(self, message_id: str) -> Optional[memoryview]:
+        """
+        Get the serialized message with the specified `message_id`.
+        @returns: View of the stored JSON bytes, or None if not archived
+        """
+        offset = self._by_id.get(message_id)
+        return None if offset is None else self._read(offset)
+
+    def get(self, message_id: str, model: Any = None) -> Optional[BaseModel]:
+        """
+        Get the message with the specified `message_id`.
+        @param message_id: `MQContext.message_id` of the message
+        @param model: Type to validate the message as. Defaults to
+            `NodeMessage`
+        @returns: Validated message, or None if not archived
+        """
+        raw = self.get_raw(message_id)
+        return None if raw is None else self._validate(raw, model)
+
+    def find(self, msg_type: Optional[str] = None,
+             session_id: Optional[str] = None,
+             model: Any = None) -> Iterator[BaseModel]:
+        """
+        Iterate over archived messages matching all specified keys, in the
+        order they were archived. Messages replaced by a later message with
+        the same `message_id` are not included.
+        """
+        offsets = None
+        for index, key in ((self._by_msg_type, msg_type),
+                           (self._by_session, session_id)):
+            if key is not None:
+                matched = index.get(key, {})
+                offsets = list(matched) if offsets is None else \
+                    sorted(set(offsets).intersection(matched))
+        if offsets is None:
+            offsets = sorted(self._entries)
+        for offset in offsets:
+            yield self._validate(self._read(offset), model)
+
+    @staticmethod
+    def _validate(raw: memoryview, model: Any) -> BaseModel:
+        if model is None:
+            from neon_data_models.models.api.node_v1 import NodeMessage
+            model = NodeMessage
+        return get_adapter(model).validate_json(raw.tobytes())
+
+    def compact(self, keep: Optional[Callable[[dict], bool]] = None) -> int:
+        """
+        Rewrite the archive without messages replaced by a later message with
+        the same `message_id`, and optionally without messages rejected by
+        `keep`.
+        @param keep: Optional function called with each deserialized message
+            which returns False for messages to remove
+        @returns: Number of messages removed
+        """
+        latest = set(self._by_id.values())
+        tmp_path = f"{self.path}.compact"
+        removed = 0
+        self.flush()
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            offset = 0
+            for line in src:
+                if line.strip():
+                    record = from_json(line)
+                    if (_get_keys(record)["message_id"] is not None and
+                            offset not in latest) or \
+                            (keep is not None and not keep(record)):
+                        removed += 1
+                    else:
+                        dst.write(line)
+                offset += len(line)
+        self._close_files()
+        os.replace(tmp_path, self.path)
+        os.remove(self.index_path)
+        self._clear_index()
+        self._open()
+        return removed
+
+    def __contains__(self, message_id: str) -> bool:
+        return message_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _close_files(self):
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views returned by `get_raw` are still referenced
+                pass
+            self._mmap = None
+        self._file.close()
+        self._index_file.close()
+
+    def close(self):
+        """
+        Flush pending writes and close the archive.
+        """
+        self.flush()
+        self._close_files()
+
+    def __enter__(self) -> 'MessageArchive':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main():
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description="Message archive maintenance")
+    parser.add_argument("command", choices=("rebuild-index", "compact"))
+    parser.add_argument("path", help="Path to the archive file")
+    args = parser.parse_args()
+    with MessageArchive(args.path) as archive:
+        if args.command == "rebuild-index":
+            archive.rebuild_index()
+            print(f"Indexed {len(archive)} messages")
+        else:
+            print(f"Removed {archive.compact()} messages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import (Any, Dict, Iterable, List, NamedTuple, Optional, Tuple,
+                    Type, Union)
+
+from pydantic import ValidationError
+from pydantic_core import from_json
+
+from neon_data_models.registry import get_list_adapter
+
+
+class BatchResult(NamedTuple):
+    """
+    Result of validating a batch of records. `models` has one entry per input
+    record, with `None` for records which failed validation. `errors` maps
+    the index of each failed record to its validation errors.
+    """
+    models: List[Optional[Any]]
+    errors: Dict[int, List[dict]]
+
+    @property
+    def valid(self) -> List[Any]:
+        """
+        Successfully validated models.
+        """
+        return [m for i, m in enumerate(self.models) if i not in self.errors]
+
+
+def _group_errors(error: ValidationError) -> Dict[int, List[dict]]:
+    grouped = {}
+    for e in error.errors(include_url=False):
+        index, *loc = e["loc"]
+        grouped.setdefault(index, []).append({**e, "loc": tuple(loc)})
+    return grouped
+
+
+def _split_jsonl(data: Union[bytes, str]) -> list:
+    """
+    Split JSON lines on newlines, skipping blank lines.
+    """
+    return [line for line in data.split("\n" if isinstance(data, str)
+                                        else b"\n") if line.strip()]
+
+
+def _parse_jsonl(lines: list) -> Tuple[list, Dict[int, List[dict]]]:
+    """
+    Parse JSON lines individually, returning parsed records and errors for
+    lines which are not valid JSON.
+    """
+    records = []
+    errors = {}
+    for line in lines:
+        try:
+            records.append(from_json(line))
+        except ValueError as e:
+            errors[len(records)] = [{"type": "json_invalid", "loc": (),
+                                     "msg": str(e), "input": line}]
+            records.append(None)
+    return records, errors
+
+
+def validate_many(model: Type[Any],
+                  data: Union[bytes, str, Iterable[Any]],
+                  jsonl: Optional[bool] = None) -> BatchResult:
+    """
+    Validate many records as `model` in a single pydantic-core call. Invalid
+    records do not prevent other records from being validated.
+    @param model: Type to validate records as (i.e. `User`, `TimingContext`,
+        or `NodeMessage`)
+    @param data: JSON array or JSON lines as `bytes` or `str`, or an iterable
+        of Python objects
+    @param jsonl: If True, `data` is JSON lines; if False, `data` is a JSON
+        array. If unset, the format is determined from the first character.
+        Streams of JSON lines should set this, so a corrupt line is not
+        mistaken for an array
+    @returns: BatchResult with validated models and per-record errors
+    """
+    adapter = get_list_adapter(model)
+    if isinstance(data, (bytes, bytearray, str)):
+        if jsonl is None:
+            jsonl = data.lstrip()[:1] not in ("[", b"[")
+        if jsonl:
+            lines = _split_jsonl(data)
+            buffer = f"[{','.join(lines)}]" if isinstance(data, str) else \
+                b"[" + b",".join(lines) + b"]"
+        else:
+            buffer = data
+        try:
+            models = adapter.validate_json(buffer)
+            if not jsonl or len(models) == len(lines):
+                return BatchResult(models, {})
+            # A line contained more than one value
+            records, errors = _parse_jsonl(lines)
+        except ValidationError as e:
+            if e.errors()[0]["type"] != "json_invalid":
+                errors = _group_errors(e)
+                records = from_json(buffer)
+                if jsonl and len(records) != len(lines):
+                    records, errors = _parse_jsonl(lines)
+            elif not jsonl:
+                raise
+            else:
+                records, errors = _parse_jsonl(lines)
+    else:
+        records = data if isinstance(data, list) else list(data)
+        try:
+            return BatchResult(adapter.validate_python(records), {})
+        except ValidationError as e:
+            errors = _group_errors(e)
+
+    # Validate the remaining records; this should only repeat if a record is
+    # valid JSON but not valid as a Python object
+    while True:
+        valid_indices = [i for i in range(len(records)) if i not in errors]
+        try:
+            validated = adapter.validate_python([records[i]
+                                                 for i in valid_indices])
+            break
+        except ValidationError as e:
+            for index, errs in _group_errors(e).items():
+                errors[valid_indices[index]] = errs
+    models = [None] * len(records)
+    for index, obj in zip(valid_indices, validated):
+        models[index] = obj
+    return BatchResult(models, errors)
@@ -0,0 +1,158 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from os import environ
+from time import perf_counter_ns
+from typing import Any, Callable, Optional
+
+_enabled = environ.get("NEON_DATA_MODELS_DISABLE_TIMING",
+                       "false") == "false"
+
+
+def set_enabled(enabled: bool):
+    """
+    Globally enable or disable timing instrumentation. While disabled, stages
+    are not timed and no values are recorded.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """
+    Check if timing instrumentation is enabled.
+    """
+    return _enabled
+
+
+def _get_fields(annotation: type) -> frozenset:
+    # Imported here since `TimingContext` uses this module
+    from neon_data_models.models.base.contexts import TimingContext
+    return frozenset(name for name, field in
+                     TimingContext.model_fields.items()
+                     if field.annotation == Optional[annotation])
+
+
+def _set_field(timing: Any, name: str, value: Any):
+    # Sets the value directly, without pydantic's `__setattr__` overhead
+    timing.__dict__[name] = value
+    timing.__pydantic_fields_set__.add(name)
+    timing._clear_derived()
+
+
+class _NoOpStage:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NoOpStage':
+        return self
+
+    def __exit__(self, *args) -> bool:
+        return False
+
+
+_NO_OP_STAGE = _NoOpStage()
+
+
+class _Stage:
+    __slots__ = ("_timing", "_name", "_start")
+
+    def __init__(self, timing: Any, name: str):
+        self._timing = timing
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> '_Stage':
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *args) -> bool:
+        elapsed_us = (perf_counter_ns() - self._start) // 1000
+        # Integer microseconds are much faster to convert than a float
+        _set_field(self._timing, self._name, timedelta(0, 0, elapsed_us))
+        return False
+
+
+_duration_fields: Optional[frozenset] = None
+_timestamp_fields: Optional[frozenset] = None
+
+
+def stage(timing: Any, name: str):
+    """
+    Get a context manager which records the time spent in its body as a
+    duration field of a `TimingContext`. Stages may be nested, i.e. a
+    `get_stt` stage within a `mq_input_handler` stage.
+    @param timing: TimingContext to record into. If None, nothing is recorded
+    @param name: Name of a duration field (i.e. `get_stt`)
+    @returns: Context manager
+    @raises ValueError: if `name` is not a TimingContext duration field
+    """
+    global _duration_fields
+    if not _enabled or timing is None:
+        return _NO_OP_STAGE
+    if _duration_fields is None:
+        _duration_fields = _get_fields(timedelta)
+    if name not in _duration_fields:
+        raise ValueError(f"Not a TimingContext duration: {name}")
+    return _Stage(timing, name)
+
+
+def mark(timing: Any, name: str):
+    """
+    Record the current time in a timestamp field of a `TimingContext`.
+    @param timing: TimingContext to record into. If None, nothing is recorded
+    @param name: Name of a timestamp field (i.e. `client_sent`)
+    @raises ValueError: if `name` is not a TimingContext timestamp field
+    """
+    global _timestamp_fields
+    if not _enabled or timing is None:
+        return
+    if _timestamp_fields is None:
+        _timestamp_fields = _get_fields(datetime)
+    if name not in _timestamp_fields:
+        raise ValueError(f"Not a TimingContext timestamp: {name}")
+    _set_field(timing, name, datetime.now(timezone.utc))
+
+
+def timed(name: str, get_timing: Callable[..., Any]) -> Callable:
+    """
+    Decorator which records the duration of each call to the decorated
+    function as a stage.
+    @param name: Name of a TimingContext duration field
+    @param get_timing: Function called with the decorated function's
+        arguments which returns the TimingContext to record into, or None
+    @returns: Decorator
+    """
+    def wrapper(func: Callable) -> Callable:
+        @wraps(func)
+        def timed_func(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with stage(get_timing(*args, **kwargs), name):
+                return func(*args, **kwargs)
+        return timed_func
+    return wrapper
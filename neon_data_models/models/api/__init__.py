@@ -24,5 +24,39 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from neon_data_models.models.api.node_v1 import *
-from neon_data_models.models.api.mq import *
+from importlib import import_module
+
+# Exports are imported on first access so that importing one model does not
+# import every module in this package
+_LAZY_EXPORTS = {
+    "NodeAudioInput": "neon_data_models.models.api.node_v1",
+    "NodeTextInput": "neon_data_models.models.api.node_v1",
+    "NodeGetStt": "neon_data_models.models.api.node_v1",
+    "NodeGetTts": "neon_data_models.models.api.node_v1",
+    "NodeKlatResponse": "neon_data_models.models.api.node_v1",
+    "NodeAudioInputResponse": "neon_data_models.models.api.node_v1",
+    "NodeGetSttResponse": "neon_data_models.models.api.node_v1",
+    "NodeGetTtsResponse": "neon_data_models.models.api.node_v1",
+    "CoreWWDetected": "neon_data_models.models.api.node_v1",
+    "CoreIntentFailure": "neon_data_models.models.api.node_v1",
+    "CoreErrorResponse": "neon_data_models.models.api.node_v1",
+    "CoreClearData": "neon_data_models.models.api.node_v1",
+    "CoreAlertExpired": "neon_data_models.models.api.node_v1",
+    "NodeMessage": "neon_data_models.models.api.node_v1",
+    "parse_node_message": "neon_data_models.models.api.node_v1",
+    "UserDbOperation": "neon_data_models.models.api.mq",
+    "UserDbRequest": "neon_data_models.models.api.mq",
+    "UserDbBatchRequest": "neon_data_models.models.api.mq",
+    "UserDbResult": "neon_data_models.models.api.mq",
+    "UserDbBatchResponse": "neon_data_models.models.api.mq",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
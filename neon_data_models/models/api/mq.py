@@ -24,17 +24,125 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from typing import Literal, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional
+from uuid import uuid4
+
+from pydantic import Field, field_validator, model_validator
+
+from neon_data_models.models.base import BaseModel
+
 from neon_data_models.models.base.contexts import MQContext
 from neon_data_models.models.user.database import User
+from neon_data_models.models.user.patch import validate_patch
+from neon_data_models.models.user.projection import get_field_tree
 
 
-class UserDbRequest(MQContext):
+class UserDbOperation(BaseModel):
+    """
+    A single operation on the users database.
+    """
     operation: Literal["create", "read", "update", "delete"]
     username: str
     password: Optional[str] = None
     access_token: Optional[str] = None
     user: Optional[User] = None
+    patch: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="JSON merge patch of the user to `update`, as an "
+                    "alternative to sending the whole `user`")
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description="Dotted paths of `User` fields to return from `read` "
+                    "(i.e. `permissions` or `neon.units`). If unset, the "
+                    "whole user is returned")
+
+    @field_validator("patch")
+    @classmethod
+    def _validate_patch(cls, patch):
+        return None if patch is None else validate_patch(patch)
+
+    @field_validator("fields")
+    @classmethod
+    def _validate_fields(cls, fields):
+        if fields is not None:
+            get_field_tree(fields)
+        return fields
+
+    @model_validator(mode="after")
+    def _validate_update(self):
+        if self.patch is not None:
+            if self.operation != "update":
+                raise ValueError("`patch` is only valid for `update`")
+            if self.user is not None:
+                raise ValueError("Only one of `user` and `patch` may be set")
+        if self.fields is not None and self.operation != "read":
+            raise ValueError("`fields` is only valid for `read`")
+        return self
+
+
+class UserDbRequest(UserDbOperation, MQContext):
+    """
+    A single operation on the users database, sent as one message.
+    """
+
+
+class UserDbBatchRequest(MQContext):
+    """
+    Many operations on the users database in one message. Operations are
+    handled in order; a failed operation does not stop later operations.
+    """
+    requests: List[UserDbOperation] = Field(min_length=1)
+
+    @classmethod
+    def from_operations(cls, operations: Iterable[UserDbOperation],
+                        batch_size: int = 500,
+                        **kwargs) -> Iterator['UserDbBatchRequest']:
+        """
+        Split operations into batch requests.
+        @param operations: Operations (or `UserDbRequest`s) to send
+        @param batch_size: Maximum number of operations per request
+        @param kwargs: Additional fields of each request (i.e. `routing_key`)
+        @returns: Iterator of requests, each with a new `message_id`
+        """
+        batch = []
+        for operation in operations:
+            batch.append(operation)
+            if len(batch) == batch_size:
+                yield cls(message_id=str(uuid4()), requests=batch, **kwargs)
+                batch = []
+        if batch:
+            yield cls(message_id=str(uuid4()), requests=batch, **kwargs)
+
+
+class UserDbResult(BaseModel):
+    """
+    Result of a single operation on the users database.
+    """
+    success: bool
+    user: Optional[User] = None
+    projection: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Requested `fields` of the user from a `read` with "
+                    "`fields`. This validates as the model returned by "
+                    "`get_partial_model(fields)`")
+    error: Optional[str] = None
+
+
+class UserDbBatchResponse(MQContext):
+    """
+    Results of a `UserDbBatchRequest`, in the order of its `requests`.
+    """
+    results: List[UserDbResult]
+
+    @property
+    def errors(self) -> Dict[int, str]:
+        """
+        Errors of failed operations by index.
+        """
+        return {i: r.error for i, r in enumerate(self.results)
+                if not r.success}
 
 
-__all__ = [UserDbRequest.__name__]
+__all__ = [UserDbOperation.__name__, UserDbRequest.__name__,
+           UserDbBatchRequest.__name__, UserDbResult.__name__,
+           UserDbBatchResponse.__name__]
@@ -25,22 +25,24 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from datetime import datetime, timedelta
-from pydantic import Field
-from typing import List, Literal, Optional, Annotated, Dict
+from functools import lru_cache
+from pydantic import Field, TypeAdapter
+from typing import List, Literal, Optional, Annotated, Dict, Union
 
 from neon_data_models.enum import UserData, AlertType, Weekdays
 from neon_data_models.models.base import BaseModel
 from neon_data_models.models.base.messagebus import BaseMessage, MessageContext
+from neon_data_models.types import Base64Audio
 
 
 class AudioInputData(BaseModel):
-    audio_data: str = Field(description="base64-encoded audio")
+    audio_data: Base64Audio = Field(description="base64-encoded audio")
     lang: str = Field(description="BCP-47 language code")
 
 
 class KlatResponse(BaseModel):
     sentence: str = Field(description="Text response")
-    audio: Dict[Literal["male", "female"], Optional[str]] = Field(
+    audio: Dict[Literal["male", "female"], Optional[Base64Audio]] = Field(
         description="Mapping of gender to b64-encoded audio")
 
 
@@ -147,9 +149,39 @@ class CoreAlertExpired(BaseMessage):
     data: AlertData
 
 
+NodeMessage = Annotated[Union[NodeAudioInput, NodeTextInput, NodeGetStt,
+                              NodeGetTts, NodeKlatResponse,
+                              NodeAudioInputResponse, NodeGetSttResponse,
+                              NodeGetTtsResponse, CoreWWDetected,
+                              CoreIntentFailure, CoreErrorResponse,
+                              CoreClearData, CoreAlertExpired],
+                        Field(discriminator="msg_type")]
+
+
+@lru_cache(maxsize=1)
+def _node_message_adapter() -> TypeAdapter:
+    return TypeAdapter(NodeMessage)
+
+
+def parse_node_message(message: Union[bytes, str, dict]) -> BaseMessage:
+    """
+    Parse a Node API message into the model matching its `msg_type`.
+    Serialized messages are validated directly from JSON, without an
+    intermediate `dict`.
+    @param message: Serialized JSON message or `dict` message
+    @returns: Validated message object
+    @raises ValidationError: if `msg_type` is unknown or the message is invalid
+    """
+    adapter = _node_message_adapter()
+    if isinstance(message, (bytes, bytearray, str)):
+        return adapter.validate_json(message)
+    return adapter.validate_python(message)
+
+
 __all__ = [NodeAudioInput.__name__, NodeTextInput.__name__, NodeGetStt.__name__,
            NodeGetTts.__name__, NodeKlatResponse.__name__,
            NodeAudioInputResponse.__name__, NodeGetSttResponse.__name__,
            NodeGetTtsResponse.__name__, CoreWWDetected.__name__,
            CoreIntentFailure.__name__, CoreErrorResponse.__name__,
-           CoreClearData.__name__, CoreAlertExpired.__name__]
+           CoreClearData.__name__, CoreAlertExpired.__name__,
+           "NodeMessage", parse_node_message.__name__]
@@ -25,9 +25,111 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from os import environ
+from typing import (Any, Callable, Dict, Optional, Tuple, Union, get_args,
+                    get_origin)
+
 from pydantic import ConfigDict, BaseModel as _BaseModel
 
+# Per-model field names, builders of fields which are not used as-is, and
+# initial `__pydantic_extra__`, or `None` for models which are always validated
+_trusted_fields: Dict[type, Optional[Tuple[frozenset,
+                                           Tuple[Tuple[str, Callable], ...],
+                                           Optional[dict]]]] = {}
+
+# Setters of pydantic's instance slots, which are faster than `setattr`
+_set_fields_set = _BaseModel.__pydantic_fields_set__.__set__
+_set_extra = _BaseModel.__pydantic_extra__.__set__
+_set_private = _BaseModel.__pydantic_private__.__set__
+
+
+def _is_plain_type(annotation: Any) -> bool:
+    """
+    Check if values of the specified type are used as-is, i.e. the type does
+    not contain any models or custom types.
+    """
+    if isinstance(annotation, type):
+        return not hasattr(annotation, "__get_pydantic_core_schema__")
+    return all(_is_plain_type(arg) for arg in get_args(annotation)
+               if not isinstance(arg, (str, int, bool)) and arg is not ...)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _get_builder(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Get a function which builds a value of the specified type from trusted
+    `model_dump()` output, or None if values of the type must be validated.
+    """
+    if _is_plain_type(annotation):
+        return _identity
+    if isinstance(annotation, type) and issubclass(annotation, _BaseModel):
+        # Models not derived from this package's `BaseModel` are validated
+        return getattr(annotation, "model_validate_trusted", None)
+    args = get_args(annotation)
+    origin = get_origin(annotation)
+    if origin is Union and len(args) == 2 and type(None) in args:
+        build = _get_builder(args[0] if args[1] is type(None) else args[1])
+        return build and (lambda value: None if value is None else
+                          build(value))
+    if origin is list and len(args) == 1:
+        build = _get_builder(args[0])
+        return build and (lambda value: [build(v) for v in value])
+    return None
+
 
 class BaseModel(_BaseModel):
+    # Core schemas are built on first use rather than at import
     model_config = ConfigDict(extra="allow" if environ.get(
-            "NEON_DATA_MODELS_ALLOW_EXTRA", "false") != "false" else "ignore")
+            "NEON_DATA_MODELS_ALLOW_EXTRA", "false") != "false" else "ignore",
+                              defer_build=True)
+
+    @classmethod
+    def model_validate_trusted(cls, obj: Dict[str, Any]) -> 'BaseModel':
+        """
+        Build a model from trusted `model_dump()` output, skipping validation.
+        Models given a value for every field are built directly, as are
+        nested models and lists of them; other input is passed to
+        `model_validate`. This should only be used for data produced by this
+        package's models, i.e. messages passed between internal services;
+        external input must always be validated.
+        @param obj: `model_dump()` output of this model
+        @returns: Model instance
+        """
+        try:
+            trusted = _trusted_fields[cls]
+        except KeyError:
+            trusted = _trusted_fields[cls] = cls._get_trusted_fields()
+        if trusted is not None and obj.__class__ is dict and \
+                len(obj) == len(trusted[0]) and trusted[0].issuperset(obj):
+            model = object.__new__(cls)
+            values = model.__dict__
+            values.update(obj)
+            for name, build in trusted[1]:
+                values[name] = build(values[name])
+            _set_fields_set(model, set(obj))
+            _set_extra(model, None if trusted[2] is None else {})
+            _set_private(model, None)
+            return model
+        return cls.model_validate(obj)
+
+    @classmethod
+    def _get_trusted_fields(cls) -> Optional[Tuple[
+            frozenset, Tuple[Tuple[str, Callable], ...], Optional[dict]]]:
+        """
+        Get the field names of this model, builders for fields which are not
+        used as-is, and the initial `__pydantic_extra__`, if trusted input
+        may be used without validation.
+        """
+        if cls.__private_attributes__:
+            return None
+        builders = []
+        for name, field in cls.model_fields.items():
+            build = _get_builder(field.annotation)
+            if build is None:
+                return None
+            if build is not _identity:
+                builders.append((name, build))
+        extra = {} if cls.model_config.get("extra") == "allow" else None
+        return frozenset(cls.model_fields), tuple(builders), extra
@@ -24,11 +24,13 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 from datetime import datetime, timedelta
-from typing import Literal, List, Optional
+from functools import wraps
+from typing import Callable, Literal, List, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from neon_data_models.models.base import BaseModel
+from neon_data_models import instrumentation
 
 
 class SessionContext(BaseModel):
@@ -55,14 +57,44 @@ class SessionContext(BaseModel):
         return BaseModel.model_dump(self, *args, **kwargs)
 
 
+# Key of the cache of derived metrics in a `TimingContext`'s `__dict__`. All
+# metrics share one cache, so clearing it on every assignment is one `pop`
+_DERIVED_CACHE = "_derived_metrics"
+
+
+def _derived_metric(func: Callable) -> property:
+    """
+    Like `functools.cached_property`, but caches values in the instance's
+    shared derived metrics cache.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def getter(self):
+        cache = self.__dict__.get(_DERIVED_CACHE)
+        if cache is None:
+            cache = self.__dict__[_DERIVED_CACHE] = {}
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = func(self)
+            return value
+    return property(getter)
+
+
 class TimingContext(BaseModel):
-    def __init__(self, **kwargs):
+    @model_validator(mode="before")
+    @classmethod
+    def _compat_keys(cls, values):
         # Enables backwards-compat. with old context values
-        if transcribed := kwargs.pop("transcribed", None):
-            kwargs.setdefault("handle_utterance", transcribed)
-        if text_parsers := kwargs.pop("text_parsers", None):
-            kwargs.setdefault("transform_utterance", text_parsers)
-        BaseModel.__init__(self, **kwargs)
+        if isinstance(values, dict) and ("transcribed" in values or
+                                         "text_parsers" in values):
+            values = dict(values)
+            if transcribed := values.pop("transcribed", None):
+                values.setdefault("handle_utterance", transcribed)
+            if text_parsers := values.pop("text_parsers", None):
+                values.setdefault("transform_utterance", text_parsers)
+        return values
 
     audio_begin: Optional[datetime] = None
     audio_end: Optional[datetime] = None
@@ -86,6 +118,96 @@ class TimingContext(BaseModel):
     transform_utterance: Optional[timedelta] = None
     wait_in_queue: Optional[timedelta] = None
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self._clear_derived()
+
+    def model_copy(self, *args, **kwargs) -> 'TimingContext':
+        copy = super().model_copy(*args, **kwargs)
+        copy._clear_derived()
+        return copy
+
+    def _clear_derived(self):
+        self.__dict__.pop(_DERIVED_CACHE, None)
+
+    def _sum_durations(self, names: tuple) -> Optional[timedelta]:
+        values = [v for name in names if (v := self.__dict__[name])]
+        return sum(values, timedelta()) if values else None
+
+    @_derived_metric
+    def round_trip(self) -> Optional[timedelta]:
+        """
+        Time from `client_sent` to `response_sent`, if both are set.
+        """
+        if self.client_sent and self.response_sent:
+            return self.response_sent - self.client_sent
+        return None
+
+    @_derived_metric
+    def audio_duration(self) -> Optional[timedelta]:
+        """
+        Time from `audio_begin` to `audio_end`, if both are set.
+        """
+        if self.audio_begin and self.audio_end:
+            return self.audio_end - self.audio_begin
+        return None
+
+    @_derived_metric
+    def transport(self) -> Optional[timedelta]:
+        """
+        Total time spent passing messages between services, or `None` if no
+        transport durations are set.
+        """
+        return self._sum_durations(TRANSPORT_DURATIONS)
+
+    @_derived_metric
+    def processing(self) -> Optional[timedelta]:
+        """
+        Total time spent handling the request in services (excluding
+        transport and time waiting in queue), or `None` if no processing
+        durations are set.
+        """
+        return self._sum_durations(PROCESSING_DURATIONS)
+
+    @_derived_metric
+    def unaccounted(self) -> Optional[timedelta]:
+        """
+        Part of `round_trip` not covered by processing, transport or queue
+        durations, or `None` if `round_trip` is unknown.
+        """
+        if self.round_trip is None:
+            return None
+        return self.round_trip - (self._sum_durations(
+            PROCESSING_DURATIONS + TRANSPORT_DURATIONS + QUEUE_DURATIONS) or
+                                  timedelta())
+
+    def stage(self, name: str):
+        """
+        Get a context manager which records the time spent in its body as
+        the named duration; see `neon_data_models.instrumentation.stage`.
+        """
+        return instrumentation.stage(self, name)
+
+    def mark(self, name: str):
+        """
+        Record the current time as the named timestamp; see
+        `neon_data_models.instrumentation.mark`.
+        """
+        instrumentation.mark(self, name)
+
+
+# Groups of `TimingContext` durations used for derived metrics
+TRANSPORT_DURATIONS = ("client_to_core", "mq_from_client", "mq_from_core",
+                       "client_from_core")
+QUEUE_DURATIONS = ("wait_in_queue",)
+PROCESSING_DURATIONS = tuple(
+    name for name, field in TimingContext.model_fields.items()
+    if field.annotation == Optional[timedelta] and
+    name not in TRANSPORT_DURATIONS + QUEUE_DURATIONS)
+# Read-only, cached properties of `TimingContext`
+DERIVED_METRICS = ("round_trip", "audio_duration", "transport", "processing",
+                   "unaccounted")
+
 
 class KlatContext(BaseModel):
     sid: str
@@ -24,14 +24,18 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from typing import Optional, List, Union
-from pydantic import ConfigDict, Field
+import re
+
+from typing import Optional, List, Type, TypeVar, Union
+from pydantic import ConfigDict, Field, PrivateAttr
+from pydantic_core import from_json
 
 from neon_data_models.models.base import BaseModel
 from neon_data_models.models.base.contexts import (SessionContext, KlatContext,
                                                    TimingContext, MQContext)
 from neon_data_models.models.client import NodeData
 from neon_data_models.models.user import NeonUserConfig
+from neon_data_models.types import RawJson
 
 
 class MessageContext(BaseModel):
@@ -63,3 +67,182 @@ class BaseMessage(BaseModel):
     msg_type: str
     data: dict
     context: MessageContext
+
+
+_T = TypeVar("_T")
+
+_JSON_WHITESPACE = b" \t\r\n"
+_JSON_STRUCTURE = re.compile(rb'["{}\[\]]')
+_JSON_SCALAR = re.compile(
+    rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null')
+# Text between strings and brackets in a container: scalars delimited by
+# separators
+_JSON_GAP = re.compile(
+    rb'[ \t\r\n,:]*(?:(?:%s)[ \t\r\n,:]+)*(?:%s)?' %
+    (_JSON_SCALAR.pattern, _JSON_SCALAR.pattern))
+_JSON_CLOSE = {ord("{"): ord("}"), ord("["): ord("]")}
+
+
+def _skip_whitespace(buf: bytes, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _string_end(buf: bytes, pos: int) -> int:
+    end = pos
+    while True:
+        end = buf.find(b'"', end + 1)
+        if end == -1:
+            raise ValueError("Unterminated string")
+        escapes = 0
+        while buf[end - 1 - escapes] == ord("\\"):
+            escapes += 1
+        if escapes % 2 == 0:
+            return end + 1
+
+
+def _value_end(buf: bytes, pos: int) -> int:
+    if buf[pos:pos + 1] == b'"':
+        return _string_end(buf, pos)
+    if buf[pos] in _JSON_CLOSE:
+        # Strings are skipped with `bytes.find`, so only structural
+        # characters are handled in Python
+        expected = []
+        while True:
+            match = _JSON_STRUCTURE.search(buf, pos)
+            if match is None:
+                raise ValueError("Unterminated value")
+            if not _JSON_GAP.fullmatch(buf, pos, match.start()):
+                raise ValueError(f"Invalid value at {pos}")
+            pos = match.start()
+            char = buf[pos]
+            if char == ord('"'):
+                pos = _string_end(buf, pos)
+                continue
+            if char in _JSON_CLOSE:
+                expected.append(_JSON_CLOSE[char])
+            elif not expected or expected.pop() != char:
+                raise ValueError(f"Unexpected {chr(char)!r} at {pos}")
+            pos += 1
+            if not expected:
+                return pos
+    match = _JSON_SCALAR.match(buf, pos)
+    if match is None:
+        raise ValueError(f"Invalid value at {pos}")
+    return match.end()
+
+
+def _split_json_object(buf: bytes) -> dict:
+    """
+    Split a serialized JSON object into serialized values by key without
+    parsing the values.
+    @raises ValueError: if `buf` is not a JSON object
+    """
+    try:
+        pos = _skip_whitespace(buf, 0)
+        if buf[pos:pos + 1] != b"{":
+            raise ValueError("Expected a JSON object")
+        fields = {}
+        pos = _skip_whitespace(buf, pos + 1)
+        if buf[pos:pos + 1] == b"}":
+            pos += 1
+        else:
+            while True:
+                if buf[pos:pos + 1] != b'"':
+                    raise ValueError(f"Expected a key at {pos}")
+                end = _string_end(buf, pos)
+                key = from_json(buf[pos:end])
+                pos = _skip_whitespace(buf, end)
+                if buf[pos:pos + 1] != b":":
+                    raise ValueError(f"Expected ':' at {pos}")
+                pos = _skip_whitespace(buf, pos + 1)
+                end = _value_end(buf, pos)
+                fields[key] = buf[pos:end]
+                pos = _skip_whitespace(buf, end)
+                if buf[pos:pos + 1] == b",":
+                    pos = _skip_whitespace(buf, pos + 1)
+                    continue
+                if buf[pos:pos + 1] != b"}":
+                    raise ValueError(f"Expected ',' or '}}' at {pos}")
+                pos += 1
+                break
+    except IndexError as e:
+        raise ValueError("Unexpected end of JSON") from e
+    if _skip_whitespace(buf, pos) != len(buf):
+        raise ValueError(f"Unexpected data at {pos}")
+    return fields
+
+
+class PassthroughMessage(BaseMessage):
+    """
+    Message envelope which does not parse or validate `data`. When validated
+    from JSON, `data` is kept as the serialized JSON fragment and written
+    back out unchanged by `model_dump_json`, so forwarding a message only
+    costs parsing and validation of `msg_type` and `context`. Brackets,
+    strings and scalars in `data` are checked, but not the placement of `,`
+    and `:`; `data` with misplaced separators is forwarded as-is and only
+    fails to parse on access.
+    """
+    data: RawJson
+    _typed_data: dict = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def model_validate_json(cls, json_data: Union[str, bytes, bytearray],
+                            **kwargs) -> 'PassthroughMessage':
+        if isinstance(json_data, str):
+            json_data = json_data.encode()
+        try:
+            fields = _split_json_object(bytes(json_data))
+        except ValueError:
+            fields = {}
+        if "data" not in fields:
+            # Let Pydantic report invalid input
+            return super().model_validate_json(json_data, **kwargs)
+        try:
+            message = {key: from_json(value) for key, value in
+                       fields.items() if key != "data"}
+        except ValueError:
+            return super().model_validate_json(json_data, **kwargs)
+        message["data"] = RawJson(fields["data"])
+        return cls.model_validate(message, **kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        if kwargs:
+            return super().model_dump_json(**kwargs)
+        # Build the output with a single join to avoid copying `data`
+        parts = []
+        for name in type(self).model_fields:
+            parts.append("," if parts else "{")
+            if name == "data":
+                parts.extend(('"data":', self.data.json.decode()))
+            else:
+                parts.append(super().model_dump_json(include={name})[1:-1])
+        parts.append("}")
+        return "".join(parts)
+
+    def get_data(self, model: Type[_T]) -> _T:
+        """
+        Get `data` validated as the specified model. Validated objects are
+        cached, so repeated access does not repeat validation.
+        @param model: Pydantic model class to validate `data` as
+        @returns: Validated `data` object
+        """
+        if model not in self._typed_data:
+            self._typed_data[model] = model.model_validate(self.data.value)
+        return self._typed_data[model]
+
+    def to_message(self, model: Optional[Type[BaseMessage]] = None) -> \
+            BaseMessage:
+        """
+        Get a fully-validated message object.
+        @param model: BaseMessage subclass to validate as. If unspecified, the
+            Node API model matching `msg_type` is used
+        @returns: Validated message object
+        """
+        message = {"msg_type": self.msg_type, "data": self.data.value,
+                   "context": self.context}
+        if model is None:
+            from neon_data_models.models.api.node_v1 import parse_node_message
+            return parse_node_message(message)
+        return model.model_validate(message)
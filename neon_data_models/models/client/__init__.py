@@ -24,4 +24,23 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from neon_data_models.models.client.node import *
+from importlib import import_module
+
+# Exports are imported on first access so that importing one model does not
+# import every module in this package
+_LAZY_EXPORTS = {
+    "NodeSoftware": "neon_data_models.models.client.node",
+    "NodeNetworking": "neon_data_models.models.client.node",
+    "NodeLocation": "neon_data_models.models.client.node",
+    "NodeData": "neon_data_models.models.client.node",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
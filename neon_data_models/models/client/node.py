@@ -25,7 +25,7 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from uuid import uuid4
-from pydantic import Field
+from pydantic import Field, model_validator
 from typing import Optional, Dict
 from neon_data_models.models.base import BaseModel
 
@@ -43,13 +43,18 @@ class NodeNetworking(BaseModel):
 
 
 class NodeLocation(BaseModel):
-    def __init__(self, **kwargs):
+    @model_validator(mode="before")
+    @classmethod
+    def _compat_keys(cls, values):
         # Enables backwards-compat. with old coordinate values
-        if lat := kwargs.pop("lat", None):
-            kwargs.setdefault("latitude", lat)
-        if lon := kwargs.pop("lon", None):
-            kwargs.setdefault("longitude", lon)
-        BaseModel.__init__(self, **kwargs)
+        if isinstance(values, dict) and ("lat" in values or "lon" in values):
+            values = dict(values)
+            if lat := values.pop("lat", None):
+                values.setdefault("latitude", lat)
+            if lon := values.pop("lon", None):
+                values.setdefault("longitude", lon)
+        return values
+
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     site_id: Optional[str] = None
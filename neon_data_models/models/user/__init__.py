@@ -24,5 +24,44 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from neon_data_models.models.user.database import *
-from neon_data_models.models.user.neon_profile import *
+from importlib import import_module
+
+# Exports are imported on first access so that importing one model does not
+# import every module in this package
+_LAZY_EXPORTS = {
+    "NeonUserConfig": "neon_data_models.models.user.database",
+    "KlatConfig": "neon_data_models.models.user.database",
+    "BrainForgeConfig": "neon_data_models.models.user.database",
+    "PermissionsConfig": "neon_data_models.models.user.database",
+    "TokenConfig": "neon_data_models.models.user.database",
+    "User": "neon_data_models.models.user.database",
+    "ProfileUser": "neon_data_models.models.user.neon_profile",
+    "ProfileSpeech": "neon_data_models.models.user.neon_profile",
+    "ProfileUnits": "neon_data_models.models.user.neon_profile",
+    "ProfileLocation": "neon_data_models.models.user.neon_profile",
+    "ProfileResponseMode": "neon_data_models.models.user.neon_profile",
+    "ProfilePrivacy": "neon_data_models.models.user.neon_profile",
+    "UserProfile": "neon_data_models.models.user.neon_profile",
+    "UserStore": "neon_data_models.models.user.store",
+    "StoreStats": "neon_data_models.models.user.store",
+    "TokenExpiryIndex": "neon_data_models.models.user.tokens",
+    "ExpiringToken": "neon_data_models.models.user.tokens",
+    "TokenKey": "neon_data_models.models.user.tokens",
+    "validate_patch": "neon_data_models.models.user.patch",
+    "apply_patch": "neon_data_models.models.user.patch",
+    "make_patch": "neon_data_models.models.user.patch",
+    "get_field_tree": "neon_data_models.models.user.projection",
+    "get_partial_model": "neon_data_models.models.user.projection",
+    "project": "neon_data_models.models.user.projection",
+    "PermissionPolicy": "neon_data_models.models.user.permissions",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -24,17 +24,166 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import json
+
+from hashlib import blake2b
 from time import time
-from typing import Dict, Any, List, Literal, Optional
+from typing import Dict, Any, List, Literal, Optional, Tuple, get_args
 from uuid import uuid4
+from weakref import ref
 from neon_data_models.models.base import BaseModel
 from pydantic import Field
 from datetime import date
 
 from neon_data_models.enum import AccessRoles
+from neon_data_models.types import PermissionSet
+
+# Keys of the cached content digest, and of weak references to models whose
+# cached digests include it, in a model's `__dict__`
+_DIGEST_KEY = "_content_digest"
+_PARENTS_KEY = "_digest_parents"
+_META_KEYS = (_DIGEST_KEY, _PARENTS_KEY)
+# Per-model names of fields which may contain nested user models
+_child_fields: Dict[type, Tuple[str, ...]] = {}
+
+
+class _UserModel(BaseModel):
+    """
+    Base class for models stored in the users database. Provides a content
+    digest which is computed once and cached until a field of the model or
+    of a nested model is assigned.
+    """
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self._clear_digest()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, _UserModel):
+            return NotImplemented
+        # Compare fields rather than digests, so changes which do not
+        # invalidate a cached digest are still detected
+        return self.__class__ is other.__class__ and \
+            self._get_fields() == other._get_fields() and \
+            self.__pydantic_extra__ == other.__pydantic_extra__
+
+    def _get_fields(self) -> dict:
+        fields = self.__dict__
+        if _DIGEST_KEY in fields or _PARENTS_KEY in fields:
+            fields = {k: v for k, v in fields.items() if k not in _META_KEYS}
+        return fields
+
+    def _strip_digest(self) -> '_UserModel':
+        for key in _META_KEYS:
+            self.__dict__.pop(key, None)
+        return self
+
+    def __copy__(self) -> '_UserModel':
+        return super().__copy__()._strip_digest()
+
+    def __deepcopy__(self, memo: Optional[dict] = None) -> '_UserModel':
+        return super().__deepcopy__(memo)._strip_digest()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state["__dict__"] = self._get_fields()
+        return state
+
+    def model_copy(self, *args, **kwargs) -> '_UserModel':
+        return super().model_copy(*args, **kwargs)._strip_digest()
 
+    @classmethod
+    def _get_child_fields(cls) -> Tuple[str, ...]:
+        """
+        Get the names of fields which may contain nested user models.
+        """
+        try:
+            return _child_fields[cls]
+        except KeyError:
+            pass
 
-class _UserConfig(BaseModel):
+        def _has_model(annotation: Any) -> bool:
+            if isinstance(annotation, type) and \
+                    issubclass(annotation, _UserModel):
+                return True
+            return any(_has_model(arg) for arg in get_args(annotation))
+
+        fields = _child_fields[cls] = tuple(
+            name for name, field in cls.model_fields.items()
+            if _has_model(field.annotation))
+        return fields
+
+    def _get_children(self) -> Dict[str, Any]:
+        """
+        Get nested user models (or lists of them) by field name.
+        """
+        children = {}
+        values = self.__dict__
+        for name in self._get_child_fields():
+            value = values[name]
+            if isinstance(value, _UserModel) or (
+                    isinstance(value, list) and value and
+                    all(isinstance(v, _UserModel) for v in value)):
+                children[name] = value
+        return children
+
+    def _clear_digest(self):
+        """
+        Clear the cached digest of this model and of models containing it.
+        A model's digest is only cached while the digests of its nested
+        models are, so there is nothing to do if this model has none.
+        """
+        if self.__dict__.pop(_DIGEST_KEY, None) is None:
+            return
+        for parent in self.__dict__.pop(_PARENTS_KEY, {}).values():
+            parent = parent()
+            if parent is not None:
+                parent._clear_digest()
+
+    @property
+    def content_digest(self) -> str:
+        """
+        Stable digest of the serialized content of this model. Models with
+        equal `model_dump()` output have equal digests. The digest combines
+        the digests of nested models, and assigning a field at any depth
+        clears the cached digests of the models containing it. Changing a
+        list or dict in place (i.e. `user.tokens.append(...)` or
+        `user.neon.skills["skill"] = {...}`) is not detected; call
+        `invalidate_digest` after such changes.
+        """
+        cached = self.__dict__.get(_DIGEST_KEY)
+        if cached is not None:
+            return cached
+        child_digests = []
+        for name, value in self._get_children().items():
+            children = value if isinstance(value, list) else (value,)
+            for child in children:
+                child.__dict__.setdefault(_PARENTS_KEY, {})[id(self)] = \
+                    ref(self)
+            child_digests.append(
+                (name, [c.content_digest for c in children]
+                 if isinstance(value, list) else value.content_digest))
+        plain = self.model_dump(mode="json", exclude={
+            name for name, _ in child_digests} if child_digests else None)
+        digest = blake2b(json.dumps([plain, child_digests], sort_keys=True,
+                                    separators=(",", ":")).encode(),
+                         digest_size=16).hexdigest()
+        self.__dict__[_DIGEST_KEY] = digest
+        return digest
+
+    def invalidate_digest(self):
+        """
+        Clear the cached content digest of this model, any nested models,
+        and any models containing it.
+        """
+        self._clear_digest()
+        for value in self._get_children().values():
+            for child in value if isinstance(value, list) else (value,):
+                child.invalidate_digest()
+
+
+class _UserConfig(_UserModel):
     first_name: str = ""
     middle_name: str = ""
     last_name: str = ""
@@ -48,37 +197,37 @@ class _UserConfig(BaseModel):
     phone: str = ""
 
 
-class _LanguageConfig(BaseModel):
+class _LanguageConfig(_UserModel):
     input_languages: List[str] = ["en-us"]
     output_languages: List[str] = ["en-us"]
 
 
-class _UnitsConfig(BaseModel):
+class _UnitsConfig(_UserModel):
     time: Literal[12, 24] = 12
     date: Literal["MDY", "YMD", "YDM", "DMY"] = "MDY"
     measure: Literal["imperial", "metric"] = "imperial"
 
 
-class _ResponseConfig(BaseModel):
+class _ResponseConfig(_UserModel):
     hesitation: bool = False
     limit_dialog: bool = False
     tts_gender: Literal["male", "female"] = "female"
     tts_speed_multiplier: float = 1.0
 
 
-class _LocationConfig(BaseModel):
+class _LocationConfig(_UserModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     name: Optional[str] = None
     timezone: Optional[str] = None
 
 
-class _PrivacyConfig(BaseModel):
+class _PrivacyConfig(_UserModel):
     save_text: bool = True
     save_audio: bool = False
 
 
-class NeonUserConfig(BaseModel):
+class NeonUserConfig(_UserModel):
     """
     Defines user configuration used in Neon Core.
     """
@@ -94,8 +243,11 @@ class NeonUserConfig(BaseModel):
     response_mode: _ResponseConfig = _ResponseConfig()
     privacy: _PrivacyConfig = _PrivacyConfig()
 
+    def __hash__(self):
+        return hash(self.content_digest)
 
-class KlatConfig(BaseModel):
+
+class KlatConfig(_UserModel):
     """
     Defines user configuration used in PyKlatChat.
     """
@@ -103,14 +255,14 @@ class KlatConfig(BaseModel):
     preferences: Dict[str, Any] = {}
 
 
-class BrainForgeConfig(BaseModel):
+class BrainForgeConfig(_UserModel):
     """
     Defines configuration used in BrainForge LLM applications.
     """
     inference_access: Dict[str, Dict[str, List[str]]] = {}
 
 
-class PermissionsConfig(BaseModel):
+class PermissionsConfig(_UserModel):
     """
     Defines roles for supported projects/service families.
     """
@@ -124,11 +276,41 @@ class PermissionsConfig(BaseModel):
     class Config:
         use_enum_values = True
 
+    def to_bits(self) -> int:
+        """
+        Pack roles into a single integer, with `PERMISSION_BITS` bits per
+        service in field order. Each role is stored as `role + ROLE_OFFSET`
+        so that negative roles are representable.
+        """
+        bits = 0
+        for shift, name in zip(_SERVICE_SHIFTS, _SERVICES):
+            bits |= (int(self.__dict__[name]) + ROLE_OFFSET) << shift
+        return bits
+
+    @classmethod
+    def from_bits(cls, bits: int) -> 'PermissionsConfig':
+        """
+        Unpack roles packed by `to_bits`.
+        """
+        return cls(**{name: ((bits >> shift) & _ROLE_MASK) - ROLE_OFFSET
+                      for shift, name in zip(_SERVICE_SHIFTS, _SERVICES)})
+
 
-class TokenConfig(BaseModel):
+# Packed representation of `PermissionsConfig`
+PERMISSION_BITS = 4
+ROLE_OFFSET = -min(AccessRoles)
+_ROLE_MASK = (1 << PERMISSION_BITS) - 1
+_SERVICES = tuple(PermissionsConfig.model_fields)
+_SERVICE_SHIFTS = tuple(range(0, PERMISSION_BITS * len(_SERVICES),
+                              PERMISSION_BITS))
+
+
+class TokenConfig(_UserModel):
     username: str
     client_id: str
-    permissions: Dict[str, bool]
+    permissions: PermissionSet = Field(
+        description="Interned, immutable map of permission names to "
+                    "whether they are granted")
     refresh_token: str
     expiration: int = Field(
         description="Unix timestamp of auth token expiration")
@@ -142,19 +324,19 @@ class TokenConfig(BaseModel):
     access_token: Optional[str] = None
 
 
-class User(BaseModel):
+class User(_UserModel):
     username: str
     password_hash: Optional[str] = None
     user_id: str = Field(default_factory=lambda: str(uuid4()))
     created_timestamp: int = Field(default_factory=lambda: round(time()))
-    neon: NeonUserConfig = NeonUserConfig()
+    neon: NeonUserConfig = Field(default_factory=NeonUserConfig)
     klat: KlatConfig = KlatConfig()
     llm: BrainForgeConfig = BrainForgeConfig()
     permissions: PermissionsConfig = PermissionsConfig()
     tokens: Optional[List[TokenConfig]] = []
 
-    def __eq__(self, other):
-        return self.model_dump() == other.model_dump()
+    def __hash__(self):
+        return hash(self.content_digest)
 
 
 __all__ = [NeonUserConfig.__name__, KlatConfig.__name__,
@@ -24,16 +24,69 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import pytz
 import datetime
 
-from typing import Optional, List, Literal
+from bisect import bisect_right
+from time import time
+from typing import Any, Dict, Iterable, Optional, List, Literal, Tuple
 
 from pydantic import Field
 
 from neon_data_models.models.base import BaseModel
 
 from neon_data_models.models.user.database import User
+from neon_data_models.models.user.patch import apply_patch, make_patch
+from neon_data_models.registry import get_list_adapter
+
+# Timezone name to (UTC offset in hours, Unix time the offset is valid until)
+_utc_offsets: Dict[str, Tuple[float, float]] = {}
+# DOB to (age, formatted DOB), valid for `_ages_date`
+_ages: Dict[datetime.date, Tuple[str, str]] = {}
+_ages_date: Optional[datetime.date] = None
+
+
+def _get_utc_offset(tz_name: str) -> float:
+    """
+    Get the current UTC offset of a timezone in hours. Offsets are cached
+    until the next DST transition of the timezone.
+    """
+    now = time()
+    cached = _utc_offsets.get(tz_name)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    import pytz  # Imported here to keep module import time low
+    tz = pytz.timezone(tz_name)
+    offset = datetime.datetime.fromtimestamp(now, tz).utcoffset()
+    # Transitions are naive UTC datetimes; fixed-offset zones have none
+    transitions = getattr(tz, "_utc_transition_times", None)
+    expires = float("inf")
+    if transitions:
+        utc_now = datetime.datetime.fromtimestamp(
+            now, datetime.timezone.utc).replace(tzinfo=None)
+        index = bisect_right(transitions, utc_now)
+        if index < len(transitions):
+            expires = transitions[index].replace(
+                tzinfo=datetime.timezone.utc).timestamp()
+    _utc_offsets[tz_name] = (offset.total_seconds() / 3600, expires)
+    return _utc_offsets[tz_name][0]
+
+
+def _get_age(dob: datetime.date) -> Tuple[str, str]:
+    """
+    Get the age in years and formatted DOB for a date of birth. Values are
+    cached until the date changes.
+    """
+    global _ages_date
+    today = datetime.date.today()
+    if today != _ages_date:
+        _ages.clear()
+        _ages_date = today
+    cached = _ages.get(dob)
+    if cached is None:
+        age = str(today.year - dob.year - (
+                (today.month, today.day) < (dob.month, dob.day)))
+        cached = _ages[dob] = (age, dob.strftime("%Y/%m/%d"))
+    return cached
 
 
 class ProfileUser(BaseModel):
@@ -103,63 +156,151 @@ class UserProfile(BaseModel):
     response_mode: ProfileResponseMode = ProfileResponseMode()
     privacy: ProfilePrivacy = ProfilePrivacy()
 
-    @classmethod
-    def from_user_object(cls, user: User):
+    @staticmethod
+    def _get_profile_data(user: User, utc_offsets: Dict[str, float]) -> dict:
+        """
+        Get profile values for a user as a dict, reading the user's config
+        models directly rather than dumping them.
+        """
         user_config = user.neon
-        today = datetime.date.today()
-        if user_config.user.dob:
-            dob = user_config.user.dob
-            age = str(today.year - dob.year - (
-                    (today.month, today.day) < (dob.month, dob.day)))
-            dob = dob.strftime("%Y/%m/%d")
+        user_data = user_config.user
+        if user_data.dob:
+            age, dob = _get_age(user_data.dob)
         else:
             age = ""
             dob = "YYYY/MM/DD"
-        full_name = " ".join((n for n in (user_config.user.first_name,
-                                          user_config.user.middle_name,
-                                          user_config.user.last_name) if n))
-        user = ProfileUser(about=user_config.user.about,
-                           age=age, dob=dob,
-                           email=user_config.user.email,
-                           email_verified=False,
-                           first_name=user_config.user.first_name,
-                           full_name=full_name,
-                           last_name=user_config.user.last_name,
-                           middle_name=user_config.user.middle_name,
-                           password=user.password_hash or "",
-                           phone=user_config.user.phone,
-                           phone_verified=False,
-                           picture=user_config.user.avatar_url,
-                           preferred_name=user_config.user.preferred_name,
-                           username=user.username
-                           )
-        alt_stt = [lang.split('-')[0] for lang in
-                   user_config.language.input_languages[1:]]
-        secondary_tts_lang = user_config.language.output_languages[1] if (
-                len(user_config.language.output_languages) > 1) else None
-        speech = ProfileSpeech(
-            alt_languages=alt_stt,
-            secondary_tts_gender=user_config.response_mode.tts_gender,
-            secondary_tts_language=secondary_tts_lang,
-            speed_multiplier=user_config.response_mode.tts_speed_multiplier,
-            stt_language=user_config.language.input_languages[0].split('-')[0],
-            tts_gender=user_config.response_mode.tts_gender,
-            tts_language=user_config.language.output_languages[0])
-        units = ProfileUnits(**user_config.units.model_dump())
-        utc_hours = (pytz.timezone(user_config.location.timezone or "UTC")
-                     .utcoffset(datetime.datetime.now()).total_seconds() / 3600)
-        # TODO: Get city, state, country from lat/lon
-        location = ProfileLocation(lat=user_config.location.latitude,
-                                   lng=user_config.location.longitude,
-                                   tz=user_config.location.timezone,
-                                   utc=utc_hours)
-        response_mode = ProfileResponseMode(
-            **user_config.response_mode.model_dump())
-        privacy = ProfilePrivacy(**user_config.privacy.model_dump())
-
-        return UserProfile(location=location, privacy=privacy,
-                           response_mode=response_mode, speech=speech,
-                           units=units, user=user)
+        full_name = " ".join((n for n in (user_data.first_name,
+                                          user_data.middle_name,
+                                          user_data.last_name) if n))
+        language = user_config.language
+        response_mode = user_config.response_mode
+        location = user_config.location
+        tz_name = location.timezone or "UTC"
+        utc_hours = utc_offsets.get(tz_name)
+        if utc_hours is None:
+            utc_hours = utc_offsets[tz_name] = _get_utc_offset(tz_name)
+        return {
+            "user": {"about": user_data.about,
+                     "age": age, "dob": dob,
+                     "email": user_data.email,
+                     "email_verified": False,
+                     "first_name": user_data.first_name,
+                     "full_name": full_name,
+                     "last_name": user_data.last_name,
+                     "middle_name": user_data.middle_name,
+                     "password": user.password_hash or "",
+                     "phone": user_data.phone,
+                     "phone_verified": False,
+                     "picture": user_data.avatar_url,
+                     "preferred_name": user_data.preferred_name,
+                     "username": user.username},
+            "speech": {
+                "alt_languages": [lang.split('-')[0] for lang in
+                                  language.input_languages[1:]],
+                "secondary_tts_gender": response_mode.tts_gender,
+                "secondary_tts_language": language.output_languages[1] if (
+                    len(language.output_languages) > 1) else None,
+                "speed_multiplier": response_mode.tts_speed_multiplier,
+                "stt_language": language.input_languages[0].split('-')[0],
+                "tts_gender": response_mode.tts_gender,
+                "tts_language": language.output_languages[0]},
+            "units": {"time": user_config.units.time,
+                      "date": user_config.units.date,
+                      "measure": user_config.units.measure},
+            # TODO: Get city, state, country from lat/lon
+            "location": {"lat": location.latitude,
+                         "lng": location.longitude,
+                         "tz": location.timezone,
+                         "utc": utc_hours},
+            "response_mode": {"hesitation": response_mode.hesitation,
+                              "limit_dialog": response_mode.limit_dialog},
+            "privacy": {"save_audio": user_config.privacy.save_audio,
+                        "save_text": user_config.privacy.save_text}}
+
+    @classmethod
+    def from_user_object(cls, user: User):
+        return cls.model_validate(cls._get_profile_data(user, {}))
+
+    @classmethod
+    def from_user_objects(cls, users: Iterable[User]) -> \
+            List['UserProfile']:
+        """
+        Convert many users to profiles. Timezone offsets are looked up once
+        per timezone and all profiles are validated in a single call.
+        @param users: Users to convert
+        @returns: List of UserProfile objects in the order of `users`
+        """
+        utc_offsets = {}
+        return get_list_adapter(cls).validate_python(
+            [cls._get_profile_data(user, utc_offsets) for user in users])
+
+    def to_user_patch(self, user: Optional[User] = None) -> Dict[str, Any]:
+        """
+        Get a merge patch (see `neon_data_models.models.user.patch`) which
+        applies the values of this profile to a user, i.e. to send in a
+        `UserDbRequest` `update`. Values which are not represented in
+        `User` (i.e. `full_name` or `age`) are ignored. Language codes are
+        only changed if their primary language differs, since profiles do not
+        include input language regions.
+        @param user: User to update. If set, the returned patch only contains
+            changed values
+        @returns: Merge patch of `User`
+        """
+        profile_user = self.user
+        dob = None
+        if profile_user.dob and profile_user.dob != "YYYY/MM/DD":
+            dob = datetime.datetime.strptime(profile_user.dob,
+                                             "%Y/%m/%d").date().isoformat()
+        languages = user.neon.language if user else None
+        input_languages = []
+        for i, lang in enumerate([self.speech.stt_language] +
+                                 self.speech.alt_languages):
+            current = languages.input_languages[i] if languages and \
+                i < len(languages.input_languages) else None
+            input_languages.append(current if current and
+                                   current.split('-')[0] == lang else lang)
+        output_languages = [self.speech.tts_language]
+        if self.speech.secondary_tts_language:
+            output_languages.append(self.speech.secondary_tts_language)
+        patch = {"neon": {
+            "user": {"first_name": profile_user.first_name,
+                     "middle_name": profile_user.middle_name,
+                     "last_name": profile_user.last_name,
+                     "preferred_name": profile_user.preferred_name,
+                     "dob": dob,
+                     "email": profile_user.email,
+                     "avatar_url": profile_user.picture,
+                     "about": profile_user.about,
+                     "phone": profile_user.phone},
+            "language": {"input_languages": input_languages,
+                         "output_languages": output_languages},
+            "units": self.units.model_dump(),
+            "location": {"latitude": self.location.lat,
+                         "longitude": self.location.lng,
+                         "timezone": self.location.tz},
+            "response_mode": {
+                "hesitation": self.response_mode.hesitation,
+                "limit_dialog": self.response_mode.limit_dialog,
+                "tts_gender": self.speech.tts_gender,
+                "tts_speed_multiplier": self.speech.speed_multiplier},
+            "privacy": self.privacy.model_dump()}}
+        if profile_user.password:
+            patch["password_hash"] = profile_user.password
+        if user is None:
+            return patch
+        return make_patch(user, apply_patch(user, patch))
+
+    def to_user_object(self, user: Optional[User] = None) -> User:
+        """
+        Apply the values of this profile to a user; see `to_user_patch`.
+        @param user: User to update. If unset, a new user is created with the
+            profile `username`
+        @returns: New, validated User with profile values applied
+        """
+        if user is None:
+            return apply_patch(User(username=self.user.username),
+                               self.to_user_patch())
+        return apply_patch(user, self.to_user_patch(user))
 
 
 __all__ = [ProfileUser.__name__, ProfileSpeech.__name__, ProfileUnits.__name__,
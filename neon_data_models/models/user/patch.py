@@ -0,0 +1,174 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+JSON merge patches (RFC 7396) of users. A patch is a dict of changed values
+where nested dicts are merged and `None` removes a key; removed model fields
+are reset to their defaults, except for fields with generated defaults (i.e.
+`user_id`), which cannot be removed. As in RFC 7396, lists are replaced as a
+whole and a value cannot be set to `None` by a patch.
+"""
+
+from typing import Any, Dict, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+from neon_data_models.models.user.database import User
+from neon_data_models.registry import get_adapter
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _validate(annotation: Any, patch: Any, path: str) -> Any:
+    annotation = _unwrap_optional(annotation)
+    if isinstance(patch, dict):
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            validated = {}
+            for key, value in patch.items():
+                field = annotation.model_fields.get(key)
+                if field is None:
+                    raise ValueError(f"{path}{key}: not a field of "
+                                     f"{annotation.__name__}")
+                if value is None:
+                    if field.is_required():
+                        raise ValueError(f"{path}{key}: required field "
+                                         f"cannot be removed")
+                    if field.default_factory is not None:
+                        # Resetting would generate a new value (i.e. a new
+                        # `user_id`) rather than restore a known default
+                        raise ValueError(f"{path}{key}: field with a "
+                                         f"generated default cannot be "
+                                         f"removed")
+                    validated[key] = None
+                else:
+                    validated[key] = _validate(field.annotation, value,
+                                               f"{path}{key}.")
+            return validated
+        if get_origin(annotation) is dict:
+            value_type = get_args(annotation)[1] if get_args(annotation) \
+                else Any
+            return {key: None if value is None else
+                    _validate(value_type, value, f"{path}{key}.")
+                    for key, value in patch.items()}
+    try:
+        adapter = get_adapter(annotation)
+        return adapter.dump_python(adapter.validate_python(patch),
+                                   mode="json")
+    except ValidationError as e:
+        raise ValueError(f"{path.rstrip('.')}: "
+                         f"{e.errors()[0]['msg']}") from e
+
+
+def validate_patch(patch: Dict[str, Any],
+                   model: Type[BaseModel] = User) -> Dict[str, Any]:
+    """
+    Validate a merge patch against a model schema, path by path.
+    @param patch: Merge patch to validate
+    @param model: Model the patch applies to
+    @returns: Patch with values normalized to their JSON representation
+    @raises ValueError: if any path is not a field of the model, removes a
+        required field or a field with a generated default, or has an invalid
+        value
+    """
+    return _validate(model, patch, "")
+
+
+def _merge(target: Any, patch: Any) -> Any:
+    if not isinstance(patch, dict):
+        return patch
+    merged = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = _merge(merged.get(key), value)
+    return merged
+
+
+def apply_patch(obj: BaseModel, patch: Dict[str, Any]) -> BaseModel:
+    """
+    Apply a merge patch to a model.
+    @param obj: Model to patch; this object is not modified
+    @param patch: Merge patch, i.e. from `make_patch`
+    @returns: New, validated model with the patch applied
+    @raises ValidationError: if the patched model is invalid
+    """
+    return obj.model_validate(_merge(obj.model_dump(mode="json"), patch))
+
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    patch = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif old[key] != value:
+            if isinstance(value, dict) and isinstance(old[key], dict):
+                patch[key] = _diff(old[key], value)
+            else:
+                patch[key] = value
+    return patch
+
+
+def _check_removals(model: Type[BaseModel], patch: Dict[str, Any],
+                    path: str):
+    # A `None` in a patch resets a model field to its default, so a field set
+    # to `None` can only be patched if that is its default
+    for key, value in patch.items():
+        field = model.model_fields[key]
+        if value is None:
+            if field.is_required() or \
+                    field.get_default(call_default_factory=True) is not None:
+                raise ValueError(f"{path}{key}: cannot be set to None by a "
+                                 f"merge patch")
+        elif isinstance(value, dict):
+            annotation = _unwrap_optional(field.annotation)
+            if isinstance(annotation, type) and \
+                    issubclass(annotation, BaseModel):
+                _check_removals(annotation, value, f"{path}{key}.")
+
+
+def make_patch(old: BaseModel, new: BaseModel) -> Dict[str, Any]:
+    """
+    Get the minimal merge patch which changes one model into another.
+    @param old: Model before changes
+    @param new: Model after changes
+    @returns: Merge patch such that `apply_patch(old, patch) == new`
+    @raises ValueError: if `new` sets a field to `None` which has a different
+        default, since a merge patch cannot express that change
+    """
+    patch = _diff(old.model_dump(mode="json"), new.model_dump(mode="json"))
+    _check_removals(type(new), patch, "")
+    return patch
+
+
+__all__ = [validate_patch.__name__, apply_patch.__name__,
+           make_patch.__name__]
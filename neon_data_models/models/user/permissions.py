@@ -0,0 +1,127 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple, Union
+
+from neon_data_models.enum import AccessRoles
+from neon_data_models.models.user.database import (
+    ROLE_OFFSET, PermissionsConfig, User, _ROLE_MASK, _SERVICES,
+    _SERVICE_SHIFTS)
+
+_SHIFTS = dict(zip(_SERVICES, _SERVICE_SHIFTS))
+
+Permissions = Union[int, PermissionsConfig, User]
+
+
+def _to_bits(permissions: Permissions) -> int:
+    if isinstance(permissions, int):
+        return permissions
+    if isinstance(permissions, User):
+        permissions = permissions.permissions
+    return permissions.to_bits()
+
+
+class PermissionPolicy:
+    """
+    Table of actions and the minimum role required for each, checked against
+    permissions packed by `PermissionsConfig.to_bits`. Each check is a shift,
+    mask and comparison, independent of the number of actions.
+    """
+    def __init__(self, rules: Mapping[str, Tuple[str, AccessRoles]]):
+        """
+        @param rules: dict of action name to (service, minimum role), where
+            service is a `PermissionsConfig` field (i.e. `"klat"`)
+        @raises ValueError: if a service is not a `PermissionsConfig` field
+        """
+        self._rules: Dict[str, Tuple[int, int]] = {}
+        for action, (service, role) in rules.items():
+            self.add_rule(action, service, role)
+
+    def __contains__(self, action: str) -> bool:
+        return action in self._rules
+
+    @property
+    def actions(self) -> List[str]:
+        return list(self._rules)
+
+    def add_rule(self, action: str, service: str, role: AccessRoles):
+        """
+        Add or replace the rule for an action.
+        @param action: Action name
+        @param service: `PermissionsConfig` field the action is checked
+            against
+        @param role: Minimum role required for the action
+        """
+        if service not in _SHIFTS:
+            raise ValueError(f"Not a PermissionsConfig field: {service}")
+        self._rules[action] = (_SHIFTS[service], int(role) + ROLE_OFFSET)
+
+    def allows(self, permissions: Permissions, action: str) -> bool:
+        """
+        Check if permissions allow an action.
+        @param permissions: Packed permissions, PermissionsConfig, or User
+        @param action: Action name
+        @returns: True if the role for the action's service is at least the
+            required role
+        @raises KeyError: if there is no rule for `action`
+        """
+        shift, threshold = self._rules[action]
+        return (_to_bits(permissions) >> shift) & _ROLE_MASK >= threshold
+
+    def allowed_actions(self, permissions: Permissions) -> Set[str]:
+        """
+        Get all actions allowed by permissions.
+        """
+        bits = _to_bits(permissions)
+        return {action for action, (shift, threshold) in self._rules.items()
+                if (bits >> shift) & _ROLE_MASK >= threshold}
+
+    def evaluate_many(self, permissions: Iterable[Permissions],
+                      action: str) -> List[bool]:
+        """
+        Check an action for many users, i.e. for an admin listing.
+        @param permissions: Packed permissions, PermissionsConfig, or User
+            objects
+        @param action: Action name
+        @returns: Result for each entry of `permissions`
+        """
+        shift, threshold = self._rules[action]
+        return [(_to_bits(p) >> shift) & _ROLE_MASK >= threshold
+                for p in permissions]
+
+    def filter_allowed(self, users: Iterable[Any], action: str) -> List[Any]:
+        """
+        Get the users allowed to perform an action.
+        @param users: User objects
+        @param action: Action name
+        @returns: List of users in `users` allowed to perform `action`
+        """
+        users = list(users)
+        return [user for user, allowed in
+                zip(users, self.evaluate_many(users, action)) if allowed]
+
+
+__all__ = [PermissionPolicy.__name__]
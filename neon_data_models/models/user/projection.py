@@ -0,0 +1,136 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Projections of users to a subset of fields. Fields are specified as dotted
+paths of model fields (i.e. `permissions` or `neon.units.time`).
+"""
+
+from functools import lru_cache
+from typing import (Any, Dict, Iterable, Optional, Tuple, Type, Union,
+                    get_args, get_origin)
+
+from pydantic import Field, create_model
+
+from neon_data_models.models.base import BaseModel
+from neon_data_models.models.user.database import User
+
+# Nested dict of field names; `True` includes the whole field. This is also
+# the format of `include` in `model_dump`
+FieldTree = Dict[str, Union[bool, 'FieldTree']]
+
+
+def _get_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def get_field_tree(fields: Iterable[str],
+                   model: Type[BaseModel] = User) -> FieldTree:
+    """
+    Parse dotted field paths into a tree of field names.
+    @param fields: Dotted field paths
+    @param model: Model the paths refer to
+    @returns: Nested dict of field names
+    @raises ValueError: if a path is not a field of `model`
+    """
+    tree = {}
+    for path in fields:
+        node = tree
+        current = model
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            if current is None:
+                raise ValueError(f"{path}: {'.'.join(parts[:i])} "
+                                 f"has no fields")
+            field = current.model_fields.get(part)
+            if field is None:
+                raise ValueError(f"{path}: not a field of {current.__name__}")
+            if node.get(part) is True:
+                # The whole field is already included
+                break
+            if i == len(parts) - 1:
+                node[part] = True
+            else:
+                node = node.setdefault(part, {})
+            current = _get_model(field.annotation)
+    return tree
+
+
+def _create_partial(model: Type[BaseModel],
+                    tree: FieldTree) -> Type[BaseModel]:
+    fields = {}
+    for name, subtree in tree.items():
+        field = model.model_fields[name]
+        if subtree is True:
+            fields[name] = (field.annotation, field)
+            continue
+        partial = _create_partial(_get_model(field.annotation), subtree)
+        fields[name] = (partial, ... if field.is_required() else
+                        Field(default_factory=partial))
+    return create_model(f"Partial{model.__name__}", __base__=BaseModel,
+                        __module__=__name__, **fields)
+
+
+@lru_cache(maxsize=256)
+def _get_partial_model(fields: Tuple[str, ...],
+                       model: Type[BaseModel]) -> Type[BaseModel]:
+    return _create_partial(model, get_field_tree(fields, model))
+
+
+def get_partial_model(fields: Iterable[str],
+                      model: Type[BaseModel] = User) -> Type[BaseModel]:
+    """
+    Get a model containing only the specified fields of `model`. Other
+    fields are ignored in validation. Models are cached per set of fields.
+    @param fields: Dotted field paths to include
+    @param model: Model to project
+    @returns: Partial model class
+    @raises ValueError: if a path is not a field of `model`
+    """
+    return _get_partial_model(tuple(sorted(set(fields))), model)
+
+
+def project(obj: BaseModel, fields: Iterable[str], **kwargs) -> \
+        Dict[str, Any]:
+    """
+    Serialize only the specified fields of a model.
+    @param obj: Model to serialize
+    @param fields: Dotted field paths to include
+    @param kwargs: Additional arguments passed to `model_dump`
+    @returns: dict which validates as `get_partial_model(fields)`
+    @raises ValueError: if a path is not a field of `obj`
+    """
+    return obj.model_dump(include=get_field_tree(fields, type(obj)),
+                          **kwargs)
+
+
+__all__ = [get_field_tree.__name__, get_partial_model.__name__,
+           project.__name__]
@@ -0,0 +1,215 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from neon_data_models.models.user.database import User
+
+
+class StoreStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class _IndexKeys(NamedTuple):
+    username: str
+    email: str
+    tokens: Tuple[str, ...]
+
+
+def _get_keys(user: User) -> _IndexKeys:
+    tokens = []
+    for token in user.tokens or []:
+        if token.access_token:
+            tokens.append(token.access_token)
+        if token.refresh_token:
+            tokens.append(token.refresh_token)
+    return _IndexKeys(user.username, user.neon.user.email.casefold(),
+                      tuple(tokens))
+
+
+class UserStore:
+    """
+    In-memory store of `User` objects with constant-time lookups by
+    `user_id`, `username`, email (`neon.user.email`, case-insensitive) and
+    access or refresh token. If a capacity is set, the least recently used
+    users are evicted when it is exceeded. All methods are thread-safe.
+
+    Indexes are updated by `put`; a `User` changed in place must be passed to
+    `put` again for lookups to reflect the change.
+    """
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        @param capacity: Maximum number of users to store. If unset, the store
+            is unbounded
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self._capacity = capacity
+        self._lock = Lock()
+        # user_id to User, in order of least to most recently used
+        self._users: OrderedDict = OrderedDict()
+        # user_id to the keys the user is indexed by
+        self._keys: Dict[str, _IndexKeys] = {}
+        self._by_username: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+        self._by_token: Dict[str, str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    @property
+    def capacity(self) -> Optional[int]:
+        return self._capacity
+
+    @property
+    def stats(self) -> StoreStats:
+        """
+        Get lookup and eviction counters and the current size.
+        """
+        with self._lock:
+            return StoreStats(self._hits, self._misses, self._evictions,
+                              len(self._users))
+
+    def put(self, user: User):
+        """
+        Add or replace a user. A stored user with the same `username` and a
+        different `user_id` is removed.
+        @param user: User to store
+        """
+        keys = _get_keys(user)
+        with self._lock:
+            self._unindex(user.user_id)
+            other_id = self._by_username.get(keys.username)
+            if other_id is not None:
+                self._unindex(other_id)
+                del self._users[other_id]
+            self._users[user.user_id] = user
+            self._users.move_to_end(user.user_id)
+            self._keys[user.user_id] = keys
+            self._by_username[keys.username] = user.user_id
+            if keys.email:
+                self._by_email[keys.email] = user.user_id
+            for token in keys.tokens:
+                self._by_token[token] = user.user_id
+            if self._capacity is not None:
+                while len(self._users) > self._capacity:
+                    evicted_id, _ = self._users.popitem(last=False)
+                    self._unindex(evicted_id)
+                    self._evictions += 1
+
+    def put_many(self, users: Iterable[User]):
+        """
+        Add or replace many users; see `put`.
+        """
+        for user in users:
+            self.put(user)
+
+    def remove(self, user_id: str) -> Optional[User]:
+        """
+        Remove a user.
+        @param user_id: `user_id` of the user to remove
+        @returns: Removed User, or None if the user was not stored
+        """
+        with self._lock:
+            self._unindex(user_id)
+            return self._users.pop(user_id, None)
+
+    def clear(self):
+        """
+        Remove all users. Counters are not reset.
+        """
+        with self._lock:
+            self._users.clear()
+            self._keys.clear()
+            self._by_username.clear()
+            self._by_email.clear()
+            self._by_token.clear()
+
+    def _unindex(self, user_id: str):
+        keys = self._keys.pop(user_id, None)
+        if keys is None:
+            return
+        # Secondary keys may have been claimed by another user since
+        for index, key in ((self._by_username, keys.username),
+                           (self._by_email, keys.email),
+                           *((self._by_token, t) for t in keys.tokens)):
+            if index.get(key) == user_id:
+                del index[key]
+
+    def _lookup(self, index: Optional[Dict[str, str]],
+                key: str) -> Optional[User]:
+        with self._lock:
+            user_id = key if index is None else index.get(key)
+            user = self._users.get(user_id) if user_id is not None else None
+            if user is None:
+                self._misses += 1
+                return None
+            self._users.move_to_end(user_id)
+            self._hits += 1
+            return user
+
+    def get(self, user_id: str) -> Optional[User]:
+        """
+        Get a user by `user_id`.
+        @returns: User, or None if not stored
+        """
+        return self._lookup(None, user_id)
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        """
+        Get a user by `username`.
+        @returns: User, or None if not stored
+        """
+        return self._lookup(self._by_username, username)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """
+        Get a user by `neon.user.email`, ignoring case.
+        @returns: User, or None if not stored
+        """
+        return self._lookup(self._by_email, email.casefold())
+
+    def get_by_token(self, token: str) -> Optional[User]:
+        """
+        Get the user with a `TokenConfig` having the specified
+        `access_token` or `refresh_token`.
+        @returns: User, or None if not stored
+        """
+        return self._lookup(self._by_token, token)
+
+
+__all__ = [UserStore.__name__, StoreStats.__name__]
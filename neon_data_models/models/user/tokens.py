@@ -0,0 +1,248 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import time
+from typing import (Callable, Dict, Iterable, List, Literal, NamedTuple,
+                    Optional, Set, Tuple)
+
+from neon_data_models.models.user.database import TokenConfig, User
+
+TokenKind = Literal["access", "refresh"]
+
+
+class TokenKey(NamedTuple):
+    username: str
+    client_id: str
+    token_name: str
+
+
+class ExpiringToken(NamedTuple):
+    expiration: int
+    kind: TokenKind
+    key: TokenKey
+
+
+def _get_key(token: TokenConfig) -> TokenKey:
+    return TokenKey(token.username, token.client_id, token.token_name)
+
+
+class TokenExpiryIndex:
+    """
+    Min-heaps of `TokenConfig.expiration` and `refresh_expiration` times, so
+    expired tokens are found in O(k log n) rather than by scanning every
+    user. Access and refresh expirations are kept in separate heaps, so
+    sweeping one kind never visits the other. Replaced and removed tokens
+    are left in the heaps and skipped when reached.
+    """
+    def __init__(self):
+        # Per kind, (expiration, sequence, key); sequence breaks ties
+        self._heaps: Dict[str, List[Tuple[int, int, TokenKey]]] = \
+            {"access": [], "refresh": []}
+        # (kind, key) to the sequence of its current heap entry
+        self._current: Dict[Tuple[str, TokenKey], int] = {}
+        self._by_username: Dict[str, Set[TokenKey]] = {}
+        self._sequence = count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        # Number of indexed tokens
+        return self._size
+
+    @classmethod
+    def from_users(cls, users: Iterable[User]) -> 'TokenExpiryIndex':
+        """
+        Build an index of all tokens of a stream of users.
+        """
+        index = cls()
+        for user in users:
+            for token in user.tokens or []:
+                index._add(token, push=False)
+        for heap in index._heaps.values():
+            heapify(heap)
+        return index
+
+    def _add(self, token: TokenConfig, push: bool = True):
+        key = _get_key(token)
+        keys = self._by_username.setdefault(key.username, set())
+        if key not in keys:
+            keys.add(key)
+            self._size += 1
+        for kind, expiration in (("access", token.expiration),
+                                 ("refresh", token.refresh_expiration)):
+            sequence = next(self._sequence)
+            self._current[(kind, key)] = sequence
+            entry = (expiration, sequence, key)
+            if push:
+                heappush(self._heaps[kind], entry)
+            else:
+                self._heaps[kind].append(entry)
+
+    def _maybe_compact(self):
+        if sum(map(len, self._heaps.values())) > \
+                2 * len(self._current) + 64:
+            self.compact()
+
+    def add(self, token: TokenConfig):
+        """
+        Add or update a token, identified by username, `client_id` and
+        `token_name`.
+        """
+        self._add(token)
+        self._maybe_compact()
+
+    def remove(self, token: TokenConfig):
+        """
+        Remove a token, if it is indexed.
+        """
+        self._remove_key(_get_key(token))
+
+    def _remove_key(self, key: TokenKey):
+        self._current.pop(("access", key), None)
+        self._current.pop(("refresh", key), None)
+        keys = self._by_username.get(key.username)
+        if keys is not None and key in keys:
+            keys.remove(key)
+            self._size -= 1
+            if not keys:
+                del self._by_username[key.username]
+
+    def update_user(self, user: User):
+        """
+        Index the current tokens of a user, removing any tokens of the same
+        username which are no longer in `user.tokens`.
+        """
+        self.remove_user(user.username)
+        for token in user.tokens or []:
+            self._add(token)
+        self._maybe_compact()
+
+    def remove_user(self, username: str):
+        """
+        Remove all tokens of a user.
+        """
+        for key in list(self._by_username.get(username, ())):
+            self._remove_key(key)
+
+    def _is_current(self, kind: str, entry: tuple) -> bool:
+        return self._current.get((kind, entry[2])) == entry[1]
+
+    def _get_heaps(self, kind: Optional[TokenKind]) -> List[tuple]:
+        if kind is None:
+            return list(self._heaps.items())
+        return [(kind, self._heaps[kind])]
+
+    def pop_expired(self, now: Optional[float] = None,
+                    kind: Optional[TokenKind] = None) -> List[ExpiringToken]:
+        """
+        Remove and return expirations at or before `now`. An expired refresh
+        token removes the token from the index; an expired access token only
+        removes its access expiration, since the token may still be refreshed.
+        @param now: Unix timestamp; defaults to the current time
+        @param kind: If set, only return expirations of this kind. Others are
+            kept in the index
+        @returns: Expired tokens in order of expiration
+        """
+        now = time() if now is None else now
+        expired = []
+        for heap_kind, heap in self._get_heaps(kind):
+            while heap and heap[0][0] <= now:
+                entry = heappop(heap)
+                if not self._is_current(heap_kind, entry):
+                    continue
+                expired.append(ExpiringToken(entry[0], heap_kind, entry[2]))
+                if heap_kind == "refresh":
+                    self._remove_key(entry[2])
+                else:
+                    del self._current[("access", entry[2])]
+        if kind is None:
+            expired.sort()
+        return expired
+
+    def expiring(self, within: float, now: Optional[float] = None,
+                 kind: Optional[TokenKind] = None) -> List[ExpiringToken]:
+        """
+        Get tokens expiring within a period without removing them, i.e. to
+        refresh them before they expire. Only heap entries which expire in
+        the period are visited.
+        @param within: Period in seconds
+        @param now: Unix timestamp; defaults to the current time
+        @param kind: If set, only return expirations of this kind
+        @returns: Tokens expiring at or before `now + within`, in order of
+            expiration
+        """
+        limit = (time() if now is None else now) + within
+        found = []
+        for heap_kind, heap in self._get_heaps(kind):
+            stack = [0] if heap else []
+            while stack:
+                i = stack.pop()
+                entry = heap[i]
+                if entry[0] > limit:
+                    continue
+                if self._is_current(heap_kind, entry):
+                    found.append(ExpiringToken(entry[0], heap_kind, entry[2]))
+                stack.extend(j for j in (2 * i + 1, 2 * i + 2)
+                             if j < len(heap))
+        found.sort()
+        return found
+
+    def purge_expired(self, get_user: Callable[[str], Optional[User]],
+                      now: Optional[float] = None) -> List[User]:
+        """
+        Remove tokens with an expired refresh token from `User.tokens`.
+        @param get_user: Callable returning the User with a username, i.e.
+            `UserStore.get_by_username`
+        @param now: Unix timestamp; defaults to the current time
+        @returns: Users which were modified. Users stored in a `UserStore`
+            should be passed to `UserStore.put` to update its token index
+        """
+        expired: Dict[str, Set[TokenKey]] = {}
+        for token in self.pop_expired(now, kind="refresh"):
+            expired.setdefault(token.key.username, set()).add(token.key)
+        modified = []
+        for username, keys in expired.items():
+            user = get_user(username)
+            if user is None or not user.tokens:
+                continue
+            tokens = [t for t in user.tokens if _get_key(t) not in keys]
+            if len(tokens) != len(user.tokens):
+                user.tokens = tokens
+                modified.append(user)
+        return modified
+
+    def compact(self):
+        """
+        Drop replaced and removed entries from the heaps.
+        """
+        for kind, heap in self._heaps.items():
+            heap[:] = [e for e in heap if self._is_current(kind, e)]
+            heapify(heap)
+
+
+__all__ = [TokenExpiryIndex.__name__, ExpiringToken.__name__,
+           TokenKey.__name__]
@@ -0,0 +1,138 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from importlib import import_module
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Type, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+# Modules from which models are registered by `get_models`
+_MODEL_MODULES = ("neon_data_models.models.api.node_v1",
+                  "neon_data_models.models.api.mq",
+                  "neon_data_models.models.base.contexts",
+                  "neon_data_models.models.base.messagebus",
+                  "neon_data_models.models.client.node",
+                  "neon_data_models.models.user.database",
+                  "neon_data_models.models.user.neon_profile")
+
+_adapters: Dict[Any, TypeAdapter] = {}
+_build_times: Dict[str, float] = {}
+_lock = Lock()
+
+
+def _type_name(tp: Any) -> str:
+    origin = get_origin(tp)
+    if origin is None:
+        return getattr(tp, "__qualname__", repr(tp))
+    args = ", ".join(_type_name(a) for a in get_args(tp))
+    return f"{_type_name(origin)}[{args}]"
+
+
+def get_models() -> List[Type[BaseModel]]:
+    """
+    Get all public models defined in `neon_data_models.models`.
+    """
+    models = []
+    for module_name in _MODEL_MODULES:
+        module = import_module(module_name)
+        for obj in vars(module).values():
+            if isinstance(obj, type) and issubclass(obj, BaseModel) and \
+                    obj.__module__ == module_name and \
+                    not obj.__name__.startswith("_"):
+                models.append(obj)
+    return models
+
+
+def get_adapter(tp: Any) -> TypeAdapter:
+    """
+    Get a `TypeAdapter` for the specified type. Adapters are built on first
+    request and cached for the life of the process. If `tp` is a model, the
+    model itself is also built.
+    @param tp: Type to get an adapter for (i.e. `User` or `List[User]`)
+    @returns: TypeAdapter for `tp`
+    """
+    adapter = _adapters.get(tp)
+    if adapter is None:
+        with _lock:
+            adapter = _adapters.get(tp)
+            if adapter is None:
+                start = perf_counter()
+                if isinstance(tp, type) and issubclass(tp, BaseModel):
+                    # Models with `defer_build` are not completed by
+                    # building an adapter for them
+                    tp.model_rebuild()
+                adapter = TypeAdapter(tp)
+                _build_times[_type_name(tp)] = perf_counter() - start
+                _adapters[tp] = adapter
+    return adapter
+
+
+def get_list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Get a cached `TypeAdapter` for `List[model]`.
+    """
+    return get_adapter(List[model])
+
+
+def get_dict_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Get a cached `TypeAdapter` for `Dict[str, model]`.
+    """
+    return get_adapter(Dict[str, model])
+
+
+def warm_up(models: Optional[List[Type[BaseModel]]] = None) -> \
+        Dict[str, float]:
+    """
+    Build adapters for models and common containers of them ahead of time,
+    i.e. at service startup.
+    @param models: Models to build adapters for. Defaults to all models
+        returned by `get_models`
+    @returns: dict of type name to adapter build time in seconds
+    """
+    for model in models or get_models():
+        get_adapter(model)
+        get_list_adapter(model)
+        get_dict_adapter(model)
+    return get_build_times()
+
+
+def get_build_times() -> Dict[str, float]:
+    """
+    Get the time in seconds spent building each cached adapter.
+    """
+    return dict(_build_times)
+
+
+def clear_cache():
+    """
+    Remove all cached adapters and build times.
+    """
+    with _lock:
+        _adapters.clear()
+        _build_times.clear()
@@ -0,0 +1,209 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gzip
+import lzma
+
+from typing import (IO, Any, Callable, Iterable, Iterator, List, Literal,
+                    Optional, Union)
+from os import PathLike
+
+from pydantic import BaseModel
+
+from neon_data_models.batch import validate_many
+
+Compression = Optional[Literal["gzip", "lzma"]]
+Source = Union[str, PathLike, IO[bytes]]
+
+_DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _get_compression(path: Union[str, PathLike],
+                     compression: Compression) -> Compression:
+    if compression:
+        return compression
+    path = str(path)
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith((".xz", ".lzma")):
+        return "lzma"
+    return None
+
+
+def open_log(path: Union[str, PathLike], mode: str = "rb",
+             compression: Compression = None) -> IO[bytes]:
+    """
+    Open a log file in binary mode, with optional compression.
+    @param path: Path to the file
+    @param mode: File mode (`rb`, `wb`, or `ab`)
+    @param compression: `gzip` or `lzma`. If unspecified, compression is
+        determined by file extension (`.gz`, `.xz`, `.lzma`)
+    @returns: Binary file object
+    """
+    compression = _get_compression(path, compression)
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "lzma":
+        return lzma.open(path, mode)
+    return open(path, mode)
+
+
+def iter_lines(file: IO[bytes],
+               chunk_size: int = _DEFAULT_CHUNK_SIZE) -> Iterator[List[bytes]]:
+    """
+    Read a binary stream in chunks and yield the complete lines in each
+    chunk, including blank lines so callers can count line numbers. Streams
+    with `read1` (i.e. socket files) are read incrementally, so lines are
+    yielded as soon as they are received.
+    @param file: Binary file object or socket file
+    @param chunk_size: Maximum number of bytes to read at a time
+    @returns: Iterator of lists of lines
+    """
+    read = getattr(file, "read1", file.read)
+    pending = []
+    while chunk := read(chunk_size):
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            continue
+        pending.append(chunk)
+        lines = b"".join(pending).split(b"\n")
+        pending = [lines.pop()]
+        yield lines
+    if remainder := b"".join(pending):
+        yield [remainder]
+
+
+def read_messages(source: Source, model: Any = None,
+                  compression: Compression = None,
+                  chunk_size: int = _DEFAULT_CHUNK_SIZE,
+                  on_error: Optional[Callable[[int, List[dict]], None]] =
+                  None) -> Iterator[BaseModel]:
+    """
+    Read and validate messages from a JSON lines log. Each chunk of lines is
+    validated in a single call, so memory use is bounded by `chunk_size`
+    regardless of the size of the log.
+    @param source: Path to a log file, or a binary file object or socket file
+    @param model: Type to validate each line as. Defaults to `NodeMessage`,
+        which selects the Node API model by `msg_type`
+    @param compression: Compression of `source` if it is a path; see
+        `open_log`
+    @param chunk_size: Number of bytes to read at a time
+    @param on_error: Callback for invalid lines, called with the 1-indexed
+        line number and validation errors. If unset, invalid lines raise a
+        `ValueError`
+    @returns: Iterator of validated messages
+    """
+    if model is None:
+        from neon_data_models.models.api.node_v1 import NodeMessage
+        model = NodeMessage
+    file = source if hasattr(source, "read") else \
+        open_log(source, "rb", compression)
+    line_number = 0
+    try:
+        for lines in iter_lines(file, chunk_size):
+            line_numbers = [line_number + i + 1
+                            for i, line in enumerate(lines) if line.strip()]
+            line_number += len(lines)
+            if not line_numbers:
+                continue
+            result = validate_many(model, b"\n".join(
+                line for line in lines if line.strip()), jsonl=True)
+            for index, message in enumerate(result.models):
+                if index in result.errors:
+                    if on_error is None:
+                        raise ValueError(f"Invalid message on line "
+                                         f"{line_numbers[index]}: "
+                                         f"{result.errors[index]}")
+                    on_error(line_numbers[index], result.errors[index])
+                else:
+                    yield message
+    finally:
+        if file is not source:
+            file.close()
+
+
+class MessageWriter:
+    """
+    Buffered writer for JSON lines message logs.
+    """
+    def __init__(self, destination: Union[str, PathLike, IO[bytes]],
+                 compression: Compression = None, append: bool = True,
+                 buffer_size: int = _DEFAULT_CHUNK_SIZE):
+        """
+        @param destination: Path to a log file or a binary file object
+        @param compression: Compression of `destination` if it is a path; see
+            `open_log`
+        @param append: If True, append to an existing file at `destination`
+        @param buffer_size: Number of bytes to buffer before writing
+        """
+        self._owns_file = not hasattr(destination, "write")
+        self._file = open_log(destination, "ab" if append else "wb",
+                              compression) if self._owns_file else destination
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+
+    def write(self, message: BaseModel):
+        """
+        Serialize a message and add it to the write buffer.
+        """
+        line = message.model_dump_json().encode() + b"\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def write_many(self, messages: Iterable[BaseModel]):
+        """
+        Serialize and write many messages.
+        """
+        for message in messages:
+            self.write(message)
+
+    def flush(self):
+        """
+        Write any buffered messages to the underlying file.
+        """
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self):
+        """
+        Flush buffered messages and close the underlying file if it was
+        opened by this writer.
+        """
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> 'MessageWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
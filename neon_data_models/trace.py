@@ -0,0 +1,197 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from hashlib import md5
+from os import PathLike
+from typing import (Any, Iterable, Iterator, List, Mapping, NamedTuple,
+                    Tuple, Union)
+
+from neon_data_models.models.base.contexts import TimingContext
+
+# Order of pipeline stages. `TimingContext` records durations without start
+# times, so stages are laid out back-to-back in this order from the earliest
+# recorded timestamp.
+STAGE_ORDER = ("client_to_core", "mq_from_client", "mq_input_handler",
+               "iris_input_handling", "wait_in_queue", "transform_audio",
+               "get_stt", "transform_utterance", "save_transcript", "get_tts",
+               "mq_response_handler", "mq_from_core", "client_from_core")
+TIMESTAMP_ORDER = ("client_sent", "gradio_sent", "audio_begin", "audio_end",
+                   "speech_start", "handle_utterance", "response_sent")
+
+Timings = Union[Mapping[str, TimingContext], Iterable[Any]]
+
+
+class _Span(NamedTuple):
+    name: str
+    start: float
+    duration: float
+
+
+class _Interaction(NamedTuple):
+    message_id: str
+    session_id: str
+    start: float
+    end: float
+    spans: List[_Span]
+    events: List[Tuple[str, float]]
+
+
+def _iter_timings(timings: Timings) -> \
+        Iterator[Tuple[str, str, TimingContext]]:
+    """
+    Yield (message_id, session_id, TimingContext) from a mapping of
+    message_id to TimingContext or from an iterable of messages.
+    """
+    if isinstance(timings, Mapping):
+        for message_id, timing in timings.items():
+            yield message_id, "default", timing
+        return
+    for index, message in enumerate(timings):
+        context = message.context
+        if context.timing is None:
+            continue
+        message_id = context.mq.message_id if context.mq else \
+            f"message_{index}"
+        session_id = context.session.session_id if context.session else \
+            "default"
+        yield message_id, session_id, context.timing
+
+
+def _layout(message_id: str, session_id: str,
+            timing: TimingContext) -> _Interaction:
+    events = [(name, getattr(timing, name).timestamp())
+              for name in TIMESTAMP_ORDER if getattr(timing, name)]
+    start = min((t for _, t in events), default=0.0)
+    spans = []
+    offset = start
+    for name in STAGE_ORDER:
+        if duration := getattr(timing, name):
+            spans.append(_Span(name, offset, duration.total_seconds()))
+            offset += duration.total_seconds()
+    end = max([offset] + [t for _, t in events])
+    return _Interaction(message_id, session_id, start, end, spans, events)
+
+
+def to_chrome_trace(timings: Timings) -> dict:
+    """
+    Build a Chrome trace-event document (as loaded by `chrome://tracing` or
+    Perfetto). Each session is a process and each message is a thread.
+    @param timings: Mapping of `MQContext.message_id` to TimingContext, or
+        an iterable of messages with `context.timing`
+    @returns: dict trace document
+    """
+    events = []
+    pids = {}
+    for tid, (message_id, session_id, timing) in \
+            enumerate(_iter_timings(timings), start=1):
+        interaction = _layout(message_id, session_id, timing)
+        if session_id not in pids:
+            pids[session_id] = len(pids) + 1
+            events.append({"name": "process_name", "ph": "M",
+                           "pid": pids[session_id], "tid": 0,
+                           "args": {"name": session_id}})
+        pid = pids[session_id]
+        events.append({"name": "thread_name", "ph": "M", "pid": pid,
+                       "tid": tid, "args": {"name": message_id}})
+        for span in interaction.spans:
+            events.append({"name": span.name, "cat": "stage", "ph": "X",
+                           "ts": span.start * 1e6,
+                           "dur": span.duration * 1e6,
+                           "pid": pid, "tid": tid,
+                           "args": {"message_id": message_id}})
+        for name, timestamp in interaction.events:
+            events.append({"name": name, "cat": "timestamp", "ph": "i",
+                           "s": "t", "ts": timestamp * 1e6, "pid": pid,
+                           "tid": tid, "args": {"message_id": message_id}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _attributes(**kwargs) -> List[dict]:
+    return [{"key": key, "value": {"stringValue": str(value)}}
+            for key, value in kwargs.items()]
+
+
+def _nanos(seconds: float) -> str:
+    return str(round(seconds * 1e9))
+
+
+def to_otlp_spans(timings: Timings,
+                  service_name: str = "neon") -> dict:
+    """
+    Build an OTLP/JSON `ExportTraceServiceRequest` document. Each message is
+    a trace with a root span covering the interaction, a child span per
+    stage, and timestamps as events on the root span.
+    @param timings: Mapping of `MQContext.message_id` to TimingContext, or
+        an iterable of messages with `context.timing`
+    @param service_name: `service.name` resource attribute
+    @returns: dict OTLP/JSON document
+    """
+    spans = []
+    for message_id, session_id, timing in _iter_timings(timings):
+        interaction = _layout(message_id, session_id, timing)
+        trace_id = md5(message_id.encode()).hexdigest()
+        root_id = trace_id[:16]
+        spans.append({
+            "traceId": trace_id, "spanId": root_id, "name": "interaction",
+            "kind": 1, "startTimeUnixNano": _nanos(interaction.start),
+            "endTimeUnixNano": _nanos(interaction.end),
+            "attributes": _attributes(message_id=message_id,
+                                      session_id=session_id),
+            "events": [{"name": name, "timeUnixNano": _nanos(timestamp)}
+                       for name, timestamp in interaction.events]})
+        for span in interaction.spans:
+            spans.append({
+                "traceId": trace_id,
+                "spanId": md5(f"{message_id}:{span.name}".encode())
+                .hexdigest()[:16],
+                "parentSpanId": root_id, "name": span.name, "kind": 1,
+                "startTimeUnixNano": _nanos(span.start),
+                "endTimeUnixNano": _nanos(span.start + span.duration),
+                "attributes": _attributes(message_id=message_id)})
+    return {"resourceSpans": [{
+        "resource": {"attributes": _attributes(**{
+            "service.name": service_name})},
+        "scopeSpans": [{"scope": {"name": "neon_data_models"},
+                        "spans": spans}]}]}
+
+
+def write_chrome_trace(path: Union[str, PathLike], timings: Timings):
+    """
+    Write a Chrome trace-event JSON file; see `to_chrome_trace`.
+    """
+    with open(path, "w") as f:
+        json.dump(to_chrome_trace(timings), f)
+
+
+def write_otlp_json(path: Union[str, PathLike], timings: Timings,
+                    service_name: str = "neon"):
+    """
+    Write an OTLP/JSON trace file; see `to_otlp_spans`.
+    """
+    with open(path, "w") as f:
+        json.dump(to_otlp_spans(timings, service_name), f)
@@ -0,0 +1,317 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from base64 import b64decode, b64encode
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+from weakref import WeakValueDictionary
+
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema, from_json, to_json
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Serialization context key used to collect binary segments; see
+# `neon_data_models.util.dump_binary`
+BINARY_SEGMENTS_CONTEXT = "neon_binary_segments"
+
+
+class Base64Audio:
+    """
+    Base64-encoded audio. Values are kept in the form they were created from
+    (a base64 string or raw bytes) and only converted on first access of the
+    other form, so raw audio which is never serialized to JSON is never
+    encoded. `str()` and `encode()` return the base64 value, so this may be
+    used where a base64 string is expected; raw bytes are available via
+    `raw`.
+    """
+    __slots__ = ("_b64", "_raw")
+
+    def __init__(self, b64: str = ""):
+        self._b64 = b64
+        self._raw = None
+
+    @classmethod
+    def from_bytes(cls, raw: BytesLike) -> 'Base64Audio':
+        """
+        Create an object from raw audio bytes. `raw` is referenced, not
+        copied, and is returned by `raw`.
+        """
+        obj = cls.__new__(cls)
+        obj._b64 = None
+        obj._raw = raw
+        return obj
+
+    @property
+    def b64(self) -> str:
+        """
+        Base64-encoded audio.
+        """
+        if self._b64 is None:
+            self._b64 = b64encode(self._raw).decode()
+        return self._b64
+
+    @property
+    def raw(self) -> BytesLike:
+        """
+        Raw audio bytes. This may be a `memoryview` into a larger buffer.
+        """
+        if self._raw is None:
+            self._raw = b64decode(self._b64)
+        return self._raw
+
+    def encode(self, encoding: str = "utf-8", errors: str = "strict") -> \
+            bytes:
+        """
+        Get the base64-encoded audio as bytes, like `str.encode`.
+        """
+        return self.b64.encode(encoding, errors)
+
+    def __str__(self) -> str:
+        return self.b64
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Base64Audio):
+            if self._raw is not None and other._raw is not None:
+                return self._raw == other._raw
+            return self.b64 == other.b64
+        if isinstance(other, str):
+            return self.b64 == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.b64)
+
+    def __repr__(self) -> str:
+        if self._b64 is None:
+            return f"{self.__class__.__name__}({len(self._raw)} bytes)"
+        return f"{self.__class__.__name__}({len(self._b64)} base64 chars)"
+
+    def __reduce__(self):
+        if self._b64 is None:
+            return self.__class__.from_bytes, (bytes(self._raw),)
+        return self.__class__, (self._b64,)
+
+    @classmethod
+    def _validate(cls, value: Any) -> 'Base64Audio':
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        raise ValueError(f"Expected base64 string or bytes, got: "
+                         f"{type(value).__name__}")
+
+    @staticmethod
+    def _serialize(value: 'Base64Audio',
+                   info: core_schema.SerializationInfo) -> Any:
+        segments = (info.context or {}).get(BINARY_SEGMENTS_CONTEXT)
+        if segments is not None and info.mode_is_json():
+            return segments.add(value.raw)
+        return value.b64
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+            cls, source: Any,
+            handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize, info_arg=True))
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+            cls, schema: core_schema.CoreSchema,
+            handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        return {"type": "string", "contentEncoding": "base64"}
+
+
+class RawJson:
+    """
+    A JSON value kept as serialized text. The value is only parsed on first
+    access of `value`, so a value which is forwarded without being read is
+    never parsed. Values validated from Python objects are kept as-is and
+    only serialized on first access of `json`.
+    """
+    __slots__ = ("_json", "_value", "_parsed")
+
+    def __init__(self, json_data: BytesLike):
+        self._json = bytes(json_data)
+        self._value = None
+        self._parsed = False
+
+    @classmethod
+    def from_value(cls, value: Any) -> 'RawJson':
+        """
+        Create an object from a JSON-compatible Python value.
+        """
+        obj = cls.__new__(cls)
+        obj._json = None
+        obj._value = value
+        obj._parsed = True
+        return obj
+
+    @property
+    def json(self) -> bytes:
+        """
+        Serialized JSON value.
+        """
+        if self._json is None:
+            self._json = to_json(self._value)
+        return self._json
+
+    @property
+    def value(self) -> Any:
+        """
+        Parsed JSON value.
+        @raises ValueError: if the serialized value is not valid JSON
+        """
+        if not self._parsed:
+            self._value = from_json(self._json)
+            self._parsed = True
+        return self._value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RawJson):
+            if self._json is not None and self._json == other._json:
+                return True
+            return self.value == other.value
+        return self.value == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if self._parsed:
+            return f"{self.__class__.__name__}.from_value({self._value!r})"
+        return f"{self.__class__.__name__}({len(self._json)} bytes)"
+
+    @classmethod
+    def _validate(cls, value: Any) -> 'RawJson':
+        if isinstance(value, cls):
+            return value
+        return cls.from_value(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+            cls, source: Any,
+            handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda v: v.value))
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+            cls, schema: core_schema.CoreSchema,
+            handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        return {}
+
+
+class PermissionSet(Mapping):
+    """
+    Immutable mapping of permission names to booleans. Instances are
+    interned, so identical permission maps share one object. Serializes as a
+    plain dict.
+
+    `granted` is a frozenset of the names of permissions which are `True`.
+    Hot paths should check `name in permissions.granted`, which is a slot
+    read and a set lookup and is faster than `dict.get`. `allows(name)`
+    does the same check but adds a Python method call.
+    """
+    __slots__ = ("_map", "granted", "_hash", "__weakref__")
+    _interned: 'WeakValueDictionary[frozenset, PermissionSet]' = \
+        WeakValueDictionary()
+
+    def __new__(cls, permissions: Optional[Dict[str, bool]] = None):
+        items = frozenset((permissions or {}).items())
+        interned = cls._interned.get(items)
+        if interned is None:
+            interned = super().__new__(cls)
+            object.__setattr__(interned, "_map", dict(items))
+            object.__setattr__(interned, "granted",
+                               frozenset(k for k, v in items if v))
+            object.__setattr__(interned, "_hash", hash(items))
+            cls._interned[items] = interned
+        return interned
+
+    def __setattr__(self, name: str, value: Any):
+        # Instances are shared, so they must not be modified
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __getitem__(self, name: str) -> bool:
+        return self._map[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._map)
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._map!r})"
+
+    def __reduce__(self):
+        return self.__class__, (self._map,)
+
+    def allows(self, name: str) -> bool:
+        """
+        Check if a permission is granted.
+        """
+        return name in self.granted
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+            cls, source: Any,
+            handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        from_dict = core_schema.no_info_after_validator_function(
+            cls, core_schema.dict_schema(core_schema.str_schema(),
+                                         core_schema.bool_schema()))
+        return core_schema.json_or_python_schema(
+            json_schema=from_dict,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_dict]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                dict))
+
+
+__all__ = [Base64Audio.__name__, RawJson.__name__,
+           PermissionSet.__name__]
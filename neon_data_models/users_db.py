@@ -0,0 +1,267 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Reference implementation of the users database service, for testing and
+load testing the `UserDbRequest` protocol without a message broker. Users
+are stored in SQLite and requests are passed through an asyncio queue as
+serialized JSON, as they would be over MQ.
+
+Operations:
+- `create`: store `user`; fails if `username` exists
+- `read`: get the user, or only `fields` of it
+- `update`: replace the user with `user`, or apply `patch`
+- `delete`: remove the user
+
+If `password` is set, it must equal the stored `password_hash` (this service
+does not hash passwords). If `access_token` is set, it must be the
+`access_token` of one of the user's tokens.
+"""
+
+import asyncio
+import sqlite3
+
+from os import PathLike
+from typing import List, Optional, Union
+
+from pydantic_core import from_json
+
+from neon_data_models.models.api.mq import (UserDbBatchRequest,
+                                            UserDbBatchResponse,
+                                            UserDbOperation, UserDbRequest,
+                                            UserDbResult)
+from neon_data_models.models.user.database import User
+from neon_data_models.models.user.patch import apply_patch
+from neon_data_models.models.user.projection import project
+
+
+class UsersDatabase:
+    """
+    SQLite storage of `User` records, indexed by `username` and `user_id`.
+    """
+    def __init__(self, path: Union[str, PathLike] = ":memory:"):
+        """
+        @param path: Path to the database file. Defaults to an in-memory
+            database
+        """
+        # Transactions are managed explicitly by `handle_many`
+        self._db = sqlite3.connect(str(path), check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("CREATE TABLE IF NOT EXISTS users ("
+                         "user_id TEXT PRIMARY KEY, "
+                         "username TEXT NOT NULL UNIQUE, "
+                         "data TEXT NOT NULL)")
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def _get(self, username: str) -> Optional[User]:
+        row = self._db.execute("SELECT data FROM users WHERE username = ?",
+                               (username,)).fetchone()
+        return User.model_validate_json(row[0]) if row else None
+
+    def _write(self, user: User, replace_id: Optional[str] = None):
+        if replace_id is not None:
+            self._db.execute("DELETE FROM users WHERE user_id = ?",
+                             (replace_id,))
+        self._db.execute("INSERT INTO users VALUES (?, ?, ?)",
+                         (user.user_id, user.username,
+                          user.model_dump_json()))
+
+    @staticmethod
+    def _check_auth(request: UserDbOperation, user: User):
+        if request.password is not None and \
+                request.password != user.password_hash:
+            raise PermissionError("Invalid password")
+        if request.access_token is not None and not any(
+                t.access_token == request.access_token
+                for t in user.tokens or []):
+            raise PermissionError("Invalid access token")
+
+    def _handle(self, request: UserDbOperation) -> UserDbResult:
+        if request.operation == "create":
+            if request.user is None:
+                raise ValueError("`create` requires `user`")
+            if request.user.username != request.username:
+                raise ValueError("`user.username` does not match `username`")
+            self._write(request.user)
+            return UserDbResult(success=True, user=request.user)
+
+        user = self._get(request.username)
+        if user is None:
+            raise KeyError(f"User not found: {request.username}")
+        self._check_auth(request, user)
+        if request.operation == "read":
+            if request.fields is not None:
+                return UserDbResult(success=True, projection=project(
+                    user, request.fields, mode="json"))
+            return UserDbResult(success=True, user=user)
+        if request.operation == "update":
+            if request.patch is not None:
+                updated = apply_patch(user, request.patch)
+            elif request.user is not None:
+                updated = request.user
+            else:
+                raise ValueError("`update` requires `user` or `patch`")
+            self._write(updated, replace_id=user.user_id)
+            return UserDbResult(success=True, user=updated)
+        self._db.execute("DELETE FROM users WHERE user_id = ?",
+                         (user.user_id,))
+        return UserDbResult(success=True, user=user)
+
+    def handle(self, request: UserDbOperation) -> UserDbResult:
+        """
+        Handle one operation in its own transaction.
+        @param request: Operation to handle
+        @returns: Result; failures are returned with `success=False`
+        """
+        return self.handle_many([request])[0]
+
+    def handle_many(self, requests: List[UserDbOperation]) -> \
+            List[UserDbResult]:
+        """
+        Handle operations in order in a single transaction. Each failed
+        operation is rolled back without affecting the others.
+        @param requests: Operations to handle
+        @returns: Result of each operation
+        """
+        results = []
+        self._db.execute("BEGIN")
+        try:
+            for request in requests:
+                self._db.execute("SAVEPOINT operation")
+                try:
+                    results.append(self._handle(request))
+                except (KeyError, ValueError, PermissionError,
+                        sqlite3.IntegrityError) as e:
+                    self._db.execute("ROLLBACK TO operation")
+                    error = e.args[0] if isinstance(e, KeyError) else str(e)
+                    results.append(UserDbResult(success=False, error=error))
+                self._db.execute("RELEASE operation")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        return results
+
+
+class UsersDbServer:
+    """
+    In-process users database service. Requests are serialized, queued and
+    handled by a worker task, and responses are serialized back to the
+    caller, so the cost of validation on both sides is included.
+    """
+    def __init__(self, database: Optional[UsersDatabase] = None):
+        """
+        @param database: Database to serve. Defaults to an in-memory database
+        """
+        self.database = database or UsersDatabase()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """
+        Start handling requests; this must be called from a running loop.
+        """
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop handling requests after the queued requests are handled.
+        """
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def __aenter__(self) -> 'UsersDbServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    def _handle_message(self, message: str) -> str:
+        try:
+            data = from_json(message)
+            if isinstance(data, dict) and "requests" in data:
+                batch = UserDbBatchRequest.model_validate(data)
+                return UserDbBatchResponse(
+                    message_id=batch.message_id,
+                    routing_key=batch.routing_key,
+                    results=self.database.handle_many(batch.requests)
+                ).model_dump_json()
+            request = UserDbRequest.model_validate(data)
+            return self.database.handle(request).model_dump_json()
+        except ValueError as e:
+            # Invalid JSON or `ValidationError`
+            return UserDbResult(success=False,
+                                error=str(e)).model_dump_json()
+
+    async def _run(self):
+        while True:
+            message, future = await self._queue.get()
+            try:
+                if not future.cancelled():
+                    future.set_result(self._handle_message(message))
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def send(self, message: str) -> str:
+        """
+        Send a serialized request and wait for the serialized response.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future))
+        return await future
+
+    async def request(self, request: Union[UserDbRequest,
+                                           UserDbBatchRequest]) -> \
+            Union[UserDbResult, UserDbBatchResponse]:
+        """
+        Send a request and wait for the response.
+        @param request: Single or batch request
+        @returns: UserDbResult for a single request, or UserDbBatchResponse
+            for a batch request. Invalid requests return a failed
+            UserDbResult
+        """
+        response = from_json(await self.send(request.model_dump_json()))
+        if isinstance(request, UserDbBatchRequest) and "results" in response:
+            return UserDbBatchResponse.model_validate(response)
+        return UserDbResult.model_validate(response)
+
+
+__all__ = [UsersDatabase.__name__, UsersDbServer.__name__]
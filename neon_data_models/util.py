@@ -25,13 +25,19 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import json
+import struct
 
 from os import makedirs
 from os.path import join, dirname
-from typing import Optional
+from secrets import token_hex
+from typing import Optional, Type, TypeVar, Union
 from pydantic import BaseModel
 
 import neon_data_models.models
+from neon_data_models.types import BINARY_SEGMENTS_CONTEXT, BytesLike
+
+_BINARY_MAGIC = b"NDM\x01"
+_M = TypeVar("_M", bound=BaseModel)
 
 
 def build_json_schema(output_path: Optional[str] = None):
@@ -50,3 +56,113 @@ def build_json_schema(output_path: Optional[str] = None):
                     json.dump(obj.model_json_schema(), f, indent=2)
         except TypeError:
             pass
+
+
+class _BinarySegments:
+    """
+    Collects `Base64Audio` values during serialization. Each value is
+    replaced with a marker which is unique to this frame, so `dump_binary`
+    can find the value's location in the header and replace it.
+    """
+    def __init__(self):
+        self.token = token_hex(16)
+        self.segments = []
+
+    def add(self, raw: BytesLike) -> str:
+        self.segments.append(raw)
+        return f"{self.token}:{len(self.segments) - 1}"
+
+
+def dump_binary(model: BaseModel) -> bytes:
+    """
+    Serialize a model to a binary frame. `Base64Audio` values are written as
+    raw bytes following a JSON header rather than being base64-encoded; the
+    header contains `null` at each value's location and a separate table
+    lists the JSON path of each segment. Frame layout: magic, table length,
+    header length, segment count, segment lengths, JSON table, JSON header,
+    segments.
+    @param model: Model to serialize
+    @returns: Serialized frame
+    """
+    collector = _BinarySegments()
+    header = model.model_dump(mode="json",
+                              context={BINARY_SEGMENTS_CONTEXT: collector})
+    paths = []
+    segments = []
+    header = _extract_segments(header, collector, [], paths, segments)
+    table = json.dumps(paths, separators=(",", ":")).encode()
+    header = json.dumps(header, separators=(",", ":"),
+                        ensure_ascii=False).encode()
+    return b"".join([_BINARY_MAGIC,
+                     struct.pack(f"!III{len(segments)}Q", len(table),
+                                 len(header), len(segments),
+                                 *(len(s) for s in segments)),
+                     table, header, *segments])
+
+
+def load_binary(frame: BytesLike, model: Type[_M]) -> _M:
+    """
+    Deserialize a frame created with `dump_binary`. Audio values reference
+    the input buffer directly and are not copied.
+    @param frame: Serialized frame
+    @param model: Model class to validate as
+    @returns: Validated model
+    @raises ValueError: if `frame` is not a valid binary frame
+    """
+    view = memoryview(frame)
+    if bytes(view[:len(_BINARY_MAGIC)]) != _BINARY_MAGIC:
+        raise ValueError("Invalid binary frame")
+    offset = len(_BINARY_MAGIC)
+    try:
+        table_len, header_len, num_segments = \
+            struct.unpack_from("!III", view, offset)
+        offset += 12
+        segment_lengths = struct.unpack_from(f"!{num_segments}Q", view,
+                                             offset)
+    except struct.error as e:
+        raise ValueError(f"Truncated binary frame: {e}") from e
+    offset += 8 * num_segments
+    paths = json.loads(bytes(view[offset:offset + table_len]))
+    offset += table_len
+    header = json.loads(bytes(view[offset:offset + header_len]))
+    offset += header_len
+    if not isinstance(paths, list) or len(paths) != num_segments:
+        raise ValueError("Binary frame segment table does not match header")
+    for path, length in zip(paths, segment_lengths):
+        try:
+            _set_path(header, path, view[offset:offset + length])
+        except (IndexError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid segment path: {path}") from e
+        offset += length
+    if offset != len(view):
+        raise ValueError("Binary frame length does not match header")
+    return model.model_validate(header)
+
+
+def _extract_segments(obj: Union[dict, list, str, int, float, None],
+                      collector: _BinarySegments, path: list,
+                      paths: list, segments: list):
+    if isinstance(obj, str) and obj.startswith(collector.token):
+        paths.append(path)
+        segments.append(collector.segments[int(obj.rsplit(":", 1)[1])])
+        return None
+    if isinstance(obj, dict):
+        return {k: _extract_segments(v, collector, path + [k], paths,
+                                     segments) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_extract_segments(v, collector, path + [i], paths, segments)
+                for i, v in enumerate(obj)]
+    return obj
+
+
+def _set_path(obj: Union[dict, list], path: list, value: BytesLike):
+    if not isinstance(path, list) or not path:
+        raise TypeError("Path must be a non-empty list")
+    for key in path:
+        if not isinstance(obj, dict if isinstance(key, str) else list) or \
+                isinstance(key, bool):
+            raise TypeError(f"Invalid path element: {key!r}")
+        parent, obj = obj, obj[key]
+    if obj is not None:
+        raise ValueError(f"Segment path is not a placeholder: {path}")
+    parent[path[-1]] = value
@@ -42,3 +42,73 @@ class TestMQ(TestCase):
                           user="test_user", message_id="test")
         with self.assertRaises(ValidationError):
             UserDbRequest(operation="create", username="test_user")
+
+    def test_user_db_request_patch(self):
+        request = UserDbRequest(operation="update", username="test_user",
+                                message_id="test",
+                                patch={"neon": {"location": {
+                                    "latitude": "47.6"}}})
+        self.assertEqual(request.patch,
+                         {"neon": {"location": {"latitude": 47.6}}})
+        self.assertEqual(UserDbRequest.model_validate_json(
+            request.model_dump_json()), request)
+        with self.assertRaises(ValidationError):
+            UserDbRequest(operation="update", username="test_user",
+                          message_id="test",
+                          patch={"neon": {"units": {"time": 13}}})
+        with self.assertRaises(ValidationError):
+            UserDbRequest(operation="read", username="test_user",
+                          message_id="test", patch={})
+        with self.assertRaises(ValidationError):
+            UserDbRequest(operation="update", username="test_user",
+                          message_id="test", patch={},
+                          user={"username": "test_user"})
+
+    def test_user_db_request_fields(self):
+        request = UserDbRequest(operation="read", username="test_user",
+                                message_id="test",
+                                fields=["permissions", "neon.units"])
+        self.assertEqual(request.fields, ["permissions", "neon.units"])
+        with self.assertRaises(ValidationError):
+            UserDbRequest(operation="read", username="test_user",
+                          message_id="test", fields=["neon.invalid"])
+        with self.assertRaises(ValidationError):
+            UserDbRequest(operation="update", username="test_user",
+                          message_id="test", fields=["permissions"])
+
+    def test_user_db_batch(self):
+        from neon_data_models.models.api.mq import (UserDbBatchRequest,
+                                                    UserDbBatchResponse,
+                                                    UserDbOperation)
+        operations = [UserDbOperation(operation="create",
+                                      username=f"user_{i}",
+                                      user={"username": f"user_{i}"})
+                      for i in range(5)]
+        operations.append(UserDbRequest(operation="read", username="user_0",
+                                        message_id="test",
+                                        fields=["permissions"]))
+        batches = list(UserDbBatchRequest.from_operations(
+            operations, batch_size=4, routing_key="test"))
+        self.assertEqual([len(b.requests) for b in batches], [4, 2])
+        self.assertNotEqual(batches[0].message_id, batches[1].message_id)
+        self.assertEqual(batches[0].routing_key, "test")
+
+        # Requests are serialized as operations
+        serialized = batches[1].model_dump(mode="json")
+        self.assertNotIn("message_id", serialized["requests"][1])
+        self.assertEqual(UserDbBatchRequest.model_validate(serialized)
+                         .requests[1].fields, ["permissions"])
+
+        with self.assertRaises(ValidationError):
+            UserDbBatchRequest(message_id="test", requests=[])
+        with self.assertRaises(ValidationError):
+            UserDbBatchRequest(message_id="test", requests=[
+                {"operation": "read", "username": "test",
+                 "patch": {"username": "new"}}])
+
+        response = UserDbBatchResponse(message_id="test", results=[
+            {"success": True, "user": {"username": "user_0"}},
+            {"success": False, "error": "User not found"},
+            {"success": True, "projection": {"permissions": {}}}])
+        self.assertEqual(response.errors, {1: "User not found"})
+        self.assertEqual(response.results[0].user.username, "user_0")
@@ -325,3 +325,39 @@ class TestNodeV1(TestCase):
         # Validate cast from timestamp/epoch to datetime/timedelta
         self.assertEqual(CoreAlertExpired(data=datetime_alert, context={}),
                          CoreAlertExpired(data=iso_alert, context={}))
+
+    def test_parse_node_message(self):
+        from neon_data_models.models.api.node_v1 import (parse_node_message,
+                                                         NodeTextInput,
+                                                         NodeGetTts,
+                                                         NodeKlatResponse)
+        text_input = NodeTextInput(data={"utterances": ["hello"],
+                                         "lang": "en-us"},
+                                   context={"username": "test_user"})
+        get_tts = NodeGetTts(data={"text": "hello", "lang": "en-us"},
+                             context={})
+        klat_response = NodeKlatResponse(
+            data={"en-us": {"sentence": "test",
+                            "audio": {"male": None, "female": None}}},
+            context={})
+
+        for message in (text_input, get_tts, klat_response):
+            # Parse from bytes, str, and dict
+            serialized = message.model_dump_json()
+            self.assertEqual(parse_node_message(serialized), message)
+            self.assertEqual(parse_node_message(serialized.encode()), message)
+            parsed = parse_node_message(message.model_dump())
+            self.assertIsInstance(parsed, message.__class__)
+            self.assertEqual(parsed, message)
+
+        # Unknown `msg_type`
+        with self.assertRaises(ValidationError):
+            parse_node_message({"msg_type": "unknown", "data": {},
+                                "context": {}})
+        # Missing `msg_type`
+        with self.assertRaises(ValidationError):
+            parse_node_message('{"data": {}, "context": {}}')
+        # Invalid data for `msg_type`
+        with self.assertRaises(ValidationError):
+            parse_node_message({"msg_type": "neon.get_tts",
+                                "data": {"utterances": []}, "context": {}})
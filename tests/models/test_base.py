@@ -25,8 +25,9 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import importlib
+import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from unittest import TestCase
 from time import time
@@ -60,6 +61,46 @@ class TestBaseModel(TestCase):
         self.assertEqual(model.model_config["extra"], "ignore")
         self.assertEqual(allowed.model_config["extra"], "allow")
 
+    def test_model_validate_trusted(self):
+        from neon_data_models.models.base.contexts import TimingContext
+        from neon_data_models.models.api.node_v1 import NodeTextInput
+        from neon_data_models.models.user.database import NeonUserConfig
+
+        timing = TimingContext(client_sent=time(), get_stt=0.5)
+        serialized = timing.model_dump()
+        trusted_timing = TimingContext.model_validate_trusted(serialized)
+        self.assertEqual(trusted_timing, timing)
+        self.assertEqual(trusted_timing.model_fields_set, set(serialized))
+
+        # Trusted input is not validated
+        invalid = {**serialized, "get_stt": "invalid"}
+        self.assertEqual(TimingContext.model_validate_trusted(
+            invalid).get_stt, "invalid")
+        with self.assertRaises(ValidationError):
+            TimingContext.model_validate(invalid)
+
+        # Partial input is validated to apply defaults
+        self.assertEqual(TimingContext.model_validate_trusted(
+            {"get_stt": 0.5}).get_stt, timedelta(seconds=0.5))
+
+        # Nested models and lists of them are built without validation
+        message = NodeTextInput(data={"utterances": ["test"],
+                                      "lang": "en-us"},
+                                context={"timing": serialized,
+                                         "user_profiles": [{}]})
+        dumped = message.model_dump()
+        trusted_message = NodeTextInput.model_validate_trusted(dumped)
+        self.assertEqual(trusted_message, message)
+        self.assertIsInstance(trusted_message.context.timing, TimingContext)
+        self.assertIsInstance(trusted_message.context.user_profiles[0],
+                              NeonUserConfig)
+        dumped["context"]["timing"] = invalid
+        self.assertEqual(NodeTextInput.model_validate_trusted(
+            dumped).context.timing.get_stt, "invalid")
+        with self.assertRaises(ValidationError):
+            NodeTextInput.model_validate_trusted(
+                {**message.model_dump(), "context": "invalid"})
+
 
 class TestContexts(TestCase):
     def test_session_context(self):
@@ -115,6 +156,49 @@ class TestContexts(TestCase):
                          timing.transform_utterance)
         self.assertEqual(timing, TimingContext(**serialized))
 
+        # Alias handling in validation from dict and JSON
+        legacy = {"transcribed": test_time, "text_parsers": test_duration}
+        self.assertEqual(TimingContext.model_validate(legacy), timing)
+        self.assertEqual(TimingContext.model_validate_json(json.dumps(legacy)),
+                         timing)
+        # New keys take precedence over legacy keys
+        self.assertIsNone(TimingContext(transcribed=test_time,
+                                        handle_utterance=None)
+                          .handle_utterance)
+
+    def test_timing_context_derived(self):
+        from neon_data_models.models.base.contexts import TimingContext
+        timing = TimingContext(client_sent=1000.0, response_sent=1002.0,
+                               audio_begin=990.0, audio_end=995.0,
+                               get_stt=0.5, get_tts=0.25,
+                               mq_from_client=0.25, wait_in_queue=0.5)
+        self.assertEqual(timing.round_trip, timedelta(seconds=2))
+        self.assertEqual(timing.audio_duration, timedelta(seconds=5))
+        self.assertEqual(timing.processing, timedelta(seconds=0.75))
+        self.assertEqual(timing.transport, timedelta(seconds=0.25))
+        self.assertEqual(timing.unaccounted, timedelta(seconds=0.5))
+
+        # Derived metrics are not serialized and do not affect equality
+        self.assertNotIn("round_trip", timing.model_dump())
+        self.assertEqual(timing, TimingContext(**timing.model_dump()))
+
+        # Cached values are invalidated by changes
+        timing.get_tts = timedelta(seconds=0.5)
+        self.assertEqual(timing.processing, timedelta(seconds=1))
+        self.assertEqual(timing.unaccounted, timedelta(seconds=0.25))
+        with timing.stage("get_tts"):
+            pass
+        self.assertLess(timing.processing, timedelta(seconds=1))
+        copy = timing.model_copy(update={
+            "response_sent": datetime.fromtimestamp(1001.0, timezone.utc)})
+        self.assertEqual(copy.round_trip, timedelta(seconds=1))
+        self.assertEqual(timing.round_trip, timedelta(seconds=2))
+
+        default = TimingContext()
+        for name in ("round_trip", "audio_duration", "processing",
+                     "transport", "unaccounted"):
+            self.assertIsNone(getattr(default, name))
+
     def test_klat_context(self):
         from neon_data_models.models.base.contexts import KlatContext
         with self.assertRaises(ValidationError):
@@ -192,3 +276,70 @@ class TestMessagebus(TestCase):
 
         # Round-trip serialization results in the same object
         self.assertEqual(extra_context, MessageContext(**serialized))
+
+    def test_passthrough_message(self):
+        from neon_data_models.models.base.messagebus import PassthroughMessage
+        from neon_data_models.types import RawJson
+        from neon_data_models.models.api.node_v1 import (NodeAudioInput,
+                                                         AudioInputData)
+        audio_input = NodeAudioInput(data={"audio_data": "abc123",
+                                           "lang": "en-us"},
+                                     context={"destination": ["audio"]})
+        serialized = audio_input.model_dump_json()
+
+        message = PassthroughMessage.model_validate_json(serialized)
+        self.assertEqual(message.msg_type, "neon.audio_input")
+        self.assertEqual(message.context.destination, ["audio"])
+        # Data is not parsed or validated
+        self.assertIsInstance(message.data, RawJson)
+        self.assertEqual(message.data.json,
+                         audio_input.data.model_dump_json().encode())
+        # Data is serialized unchanged
+        self.assertEqual(message.model_dump_json(), serialized)
+        self.assertEqual(message.model_dump_json(exclude={"context"}),
+                         audio_input.model_dump_json(exclude={"context"}))
+        self.assertEqual(message.model_dump()["data"],
+                         audio_input.data.model_dump())
+        self.assertEqual(message.data, audio_input.data.model_dump())
+        # Whitespace and key order in the payload are preserved
+        spaced = ('{ "msg_type" : "test", "data" : {"b": [1, {"a": "}\\""}],'
+                  ' "a": null} , "context": {} }')
+        self.assertIn('"data":{"b": [1, {"a": "}\\""}], "a": null},',
+                      PassthroughMessage.model_validate_json(
+                          spaced).model_dump_json())
+
+        # Typed access
+        data = message.get_data(AudioInputData)
+        self.assertIsInstance(data, AudioInputData)
+        self.assertIs(message.get_data(AudioInputData), data)
+        self.assertEqual(message.to_message(), audio_input)
+        self.assertEqual(message.to_message(NodeAudioInput), audio_input)
+
+        # Invalid JSON is rejected
+        for invalid in ('{"msg_type": "test", "data": {"a": [1}, '
+                        '"context": {}}',
+                        '{"msg_type": "test", "data": "abc, "context": {}}',
+                        '{"msg_type": "test", "data": {}, "context": {}} x',
+                        '{"msg_type": "test", "data": {"a": tru}, '
+                        '"context": {}}',
+                        '{"msg_type": "test", "data": [01], "context": {}}',
+                        '{"msg_type": "test", "data": {}, "context": {x}}',
+                        '{"msg_type": tru, "data": {}, "context": {}}',
+                        '{"msg_type": "test", "context": {}}'):
+            with self.assertRaises(ValidationError):
+                PassthroughMessage.model_validate_json(invalid)
+
+        # Messages may also be created from Python objects
+        message = PassthroughMessage(msg_type="neon.audio_input",
+                                     data=audio_input.data.model_dump(),
+                                     context=audio_input.context)
+        self.assertEqual(message.model_dump_json(), serialized)
+        self.assertEqual(message.to_message(), audio_input)
+
+        # Invalid data is only rejected on access
+        message = PassthroughMessage(msg_type="neon.audio_input",
+                                     data={"lang": "en-us"}, context={})
+        with self.assertRaises(ValidationError):
+            message.get_data(AudioInputData)
+        with self.assertRaises(ValidationError):
+            message.to_message()
@@ -47,3 +47,13 @@ class TestNode(TestCase):
 
         self.assertIsInstance(config_2.location.latitude, float)
         self.assertIsInstance(config_2.location.longitude, float)
+
+        # Location compat. handling in validation from dict and JSON
+        legacy = {"location": {"lat": 42.0, "lon": -71.0}}
+        self.assertEqual(NodeData.model_validate(legacy).location,
+                         config_2.location)
+        self.assertEqual(NodeData.model_validate_json(
+            '{"location": {"lat": 42.0, "lon": -71.0}}').location,
+                         config_2.location)
+        self.assertEqual(NodeLocation.model_validate_json(
+            '{"lat": 42.0, "latitude": 40.0}').latitude, 40.0)
@@ -163,3 +163,538 @@ class TestNeonProfile(TestCase):
         self.assertIsInstance(user_profile.location.lng, float)
         self.assertEqual(user_profile.location.tz, "America/Los_Angeles")
         self.assertIn(user_profile.location.utc, (-7.0, -8.0))
+
+    def test_from_user_objects(self):
+        from neon_data_models.models.user import UserProfile
+        users = [User(username=f"user_{i}",
+                      neon={"user": {"dob": date(2000 + i, 1, 1)},
+                            "location": {"timezone": tz}})
+                 for i, tz in enumerate(("America/Los_Angeles", None,
+                                         "America/Los_Angeles"))]
+        profiles = UserProfile.from_user_objects(iter(users))
+        self.assertEqual(profiles, [UserProfile.from_user_object(u)
+                                    for u in users])
+        self.assertEqual(profiles[1].location.utc, 0.0)
+        self.assertEqual(UserProfile.from_user_objects([]), [])
+
+    def test_to_user_object(self):
+        from neon_data_models.models.user import UserProfile
+        user = User(username="test_user", password_hash="hash",
+                    neon={"user": {"first_name": "Test",
+                                   "dob": date(2000, 1, 2)},
+                          "language": {"input_languages": ["en-us", "uk-ua"],
+                                       "output_languages": ["en-us"]},
+                          "location": {"timezone": "America/Los_Angeles"},
+                          "skills": {"skill": {"setting": True}}})
+        profile = UserProfile.from_user_object(user)
+        self.assertEqual(profile.to_user_patch(user), {})
+        self.assertEqual(profile.to_user_object(user), user)
+
+        profile.units.measure = "metric"
+        profile.speech.alt_languages = ["uk", "de"]
+        profile.speech.tts_gender = "male"
+        profile.user.last_name = "User"
+        patch = profile.to_user_patch(user)
+        self.assertEqual(patch, {"neon": {
+            "units": {"measure": "metric"},
+            "language": {"input_languages": ["en-us", "uk-ua", "de"]},
+            "response_mode": {"tts_gender": "male"},
+            "user": {"last_name": "User"}}})
+
+        updated = profile.to_user_object(user)
+        self.assertEqual(updated.user_id, user.user_id)
+        self.assertEqual(updated.neon.skills, user.neon.skills)
+        self.assertEqual(updated.neon.user.dob, date(2000, 1, 2))
+        self.assertEqual(updated.neon.units.measure, "metric")
+        self.assertEqual(user.neon.units.measure, "imperial")
+        converted = UserProfile.from_user_object(updated)
+        self.assertEqual(converted.speech.alt_languages, ["uk", "de"])
+        self.assertEqual(converted.speech.tts_gender, "male")
+        self.assertEqual(converted.units, profile.units)
+        self.assertEqual(converted.user.full_name, "Test User")
+
+        # New users are created from the profile
+        new_user = profile.to_user_object()
+        self.assertEqual(new_user.username, "test_user")
+        self.assertEqual(new_user.password_hash, "hash")
+        self.assertEqual(new_user.neon.language.input_languages,
+                         ["en", "uk", "de"])
+
+    def test_utc_offset_cache(self):
+        from neon_data_models.models.user import neon_profile
+        offset = neon_profile._get_utc_offset("America/Los_Angeles")
+        self.assertIn(offset, (-7.0, -8.0))
+        cached_offset, expires = \
+            neon_profile._utc_offsets["America/Los_Angeles"]
+        self.assertEqual(cached_offset, offset)
+        # Valid until the next DST transition
+        self.assertGreater(expires, time())
+        self.assertLess(expires, time() + 366 * 24 * 3600)
+        self.assertEqual(neon_profile._get_utc_offset("UTC"), 0.0)
+        self.assertEqual(neon_profile._utc_offsets["UTC"][1], float("inf"))
+
+        # Cached values are used until they expire
+        neon_profile._utc_offsets["America/Los_Angeles"] = (1.0, expires)
+        self.assertEqual(
+            neon_profile._get_utc_offset("America/Los_Angeles"), 1.0)
+        neon_profile._utc_offsets["America/Los_Angeles"] = (1.0, time())
+        self.assertEqual(
+            neon_profile._get_utc_offset("America/Los_Angeles"), offset)
+
+    def test_age_cache(self):
+        from neon_data_models.models.user import neon_profile
+        dob = date.today().replace(year=2000)
+        self.assertEqual(neon_profile._get_age(dob),
+                         (str(date.today().year - 2000),
+                          dob.strftime("%Y/%m/%d")))
+        self.assertIn(dob, neon_profile._ages)
+        # Cached ages are cleared when the date changes
+        neon_profile._ages[dob] = ("0", "")
+        self.assertEqual(neon_profile._get_age(dob), ("0", ""))
+        neon_profile._ages_date = None
+        self.assertEqual(neon_profile._get_age(dob)[0],
+                         str(date.today().year - 2000))
+
+
+class TestUserStore(TestCase):
+    @staticmethod
+    def _get_user(name: str, email: str = "", token: str = "") -> User:
+        tokens = [{"username": name, "client_id": "test_id",
+                   "permissions": {}, "refresh_token": f"refresh_{token}",
+                   "access_token": f"access_{token}",
+                   "expiration": round(time()),
+                   "refresh_expiration": round(time()),
+                   "token_name": "test_token",
+                   "creation_timestamp": round(time()),
+                   "last_refresh_timestamp": round(time())}] if token else []
+        return User(username=name, neon={"user": {"email": email}},
+                    tokens=tokens)
+
+    def test_lookups(self):
+        from neon_data_models.models.user import UserStore
+        store = UserStore()
+        user = self._get_user("test", "Test@neon.ai", "token")
+        other = self._get_user("other")
+        store.put_many([user, other])
+        self.assertEqual(len(store), 2)
+        self.assertIn(user.user_id, store)
+
+        self.assertIs(store.get(user.user_id), user)
+        self.assertIs(store.get_by_username("test"), user)
+        self.assertIs(store.get_by_email("test@NEON.ai"), user)
+        self.assertIs(store.get_by_token("access_token"), user)
+        self.assertIs(store.get_by_token("refresh_token"), user)
+        self.assertIs(store.get_by_username("other"), other)
+        self.assertIsNone(store.get_by_email(""))
+        self.assertIsNone(store.get_by_token("invalid"))
+        self.assertEqual(store.stats.hits, 6)
+        self.assertEqual(store.stats.misses, 2)
+
+        # Updates replace old index keys
+        updated = self._get_user("test", "new@neon.ai", "new")
+        updated.user_id = user.user_id
+        store.put(updated)
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get_by_email("test@neon.ai"))
+        self.assertIsNone(store.get_by_token("access_token"))
+        self.assertIs(store.get_by_token("access_new"), updated)
+
+        # A new user with an existing username replaces the old user
+        replacement = self._get_user("test")
+        store.put(replacement)
+        self.assertNotIn(user.user_id, store)
+        self.assertIsNone(store.get_by_token("access_new"))
+        self.assertIs(store.get_by_username("test"), replacement)
+
+        self.assertIs(store.remove(other.user_id), other)
+        self.assertIsNone(store.remove(other.user_id))
+        self.assertIsNone(store.get_by_username("other"))
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_capacity(self):
+        from neon_data_models.models.user import UserStore
+        with self.assertRaises(ValueError):
+            UserStore(0)
+        store = UserStore(capacity=2)
+        users = [self._get_user(f"user_{i}", token=str(i)) for i in range(3)]
+        store.put(users[0])
+        store.put(users[1])
+        # Lookup makes `users[0]` most recently used
+        store.get_by_username("user_0")
+        store.put(users[2])
+        self.assertEqual(store.stats.size, 2)
+        self.assertEqual(store.stats.evictions, 1)
+        self.assertNotIn(users[1].user_id, store)
+        self.assertIsNone(store.get_by_token("access_1"))
+        self.assertIs(store.get_by_token("access_0"), users[0])
+
+    def test_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from neon_data_models.models.user import UserStore
+        store = UserStore(capacity=50)
+        users = [self._get_user(f"user_{i}", f"{i}@neon.ai", str(i))
+                 for i in range(200)]
+
+        def _worker(user):
+            store.put(user)
+            store.get_by_email(user.neon.user.email)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(_worker, users))
+        self.assertEqual(len(store), 50)
+        self.assertEqual(len(store._by_username), 50)
+        self.assertEqual(len(store._by_email), 50)
+        self.assertEqual(len(store._by_token), 100)
+        self.assertEqual(store.stats.hits + store.stats.misses, 200)
+
+
+class TestTokenExpiryIndex(TestCase):
+    @staticmethod
+    def _get_token(username: str, name: str, expiration: int,
+                   refresh_expiration: int) -> dict:
+        return {"username": username, "client_id": "test_id",
+                "permissions": {}, "refresh_token": f"refresh_{name}",
+                "expiration": expiration,
+                "refresh_expiration": refresh_expiration, "token_name": name,
+                "creation_timestamp": 0, "last_refresh_timestamp": 0}
+
+    def _get_users(self):
+        return [User(username="user_1", tokens=[
+                    self._get_token("user_1", "a", 100, 1000),
+                    self._get_token("user_1", "b", 200, 2000)]),
+                User(username="user_2", tokens=[
+                    self._get_token("user_2", "a", 150, 1500)])]
+
+    def test_expiry(self):
+        from neon_data_models.models.user import TokenExpiryIndex, TokenKey
+        index = TokenExpiryIndex.from_users(self._get_users())
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.pop_expired(now=50), [])
+
+        expiring = index.expiring(100, now=50)
+        self.assertEqual([(t.expiration, t.kind) for t in expiring],
+                         [(100, "access"), (150, "access")])
+        self.assertEqual(index.expiring(1000, now=500, kind="refresh")[0].key,
+                         TokenKey("user_1", "test_id", "a"))
+        # `expiring` does not remove entries
+        self.assertEqual(len(index.expiring(100, now=50)), 2)
+
+        # Tokens with expired access tokens may still be refreshed
+        expired = index.pop_expired(now=150)
+        self.assertEqual([t.expiration for t in expired], [100, 150])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.pop_expired(now=150), [])
+
+        # Filtering by kind keeps other expirations
+        self.assertEqual(index.pop_expired(now=1000, kind="refresh")[0]
+                         .expiration, 1000)
+        self.assertEqual(len(index), 2)
+        self.assertEqual([t.expiration for t in index.pop_expired(now=1000)],
+                         [200])
+
+    def test_updates(self):
+        from neon_data_models.models.user import TokenExpiryIndex
+        users = self._get_users()
+        index = TokenExpiryIndex.from_users(users)
+
+        # Updated tokens replace old expirations
+        users[0].tokens[0].expiration = 500
+        index.add(users[0].tokens[0])
+        self.assertEqual(len(index), 3)
+        self.assertEqual([t.key.username for t in index.pop_expired(now=150)],
+                         ["user_2"])
+
+        users[0].tokens = users[0].tokens[1:]
+        index.update_user(users[0])
+        self.assertEqual(len(index), 2)
+        index.remove(users[1].tokens[0])
+        self.assertEqual(len(index), 1)
+        index.remove_user("user_1")
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.pop_expired(now=10000), [])
+
+        for i in range(200):
+            index.update_user(users[0])
+        self.assertLess(sum(map(len, index._heaps.values())), 100)
+
+    def test_purge_expired(self):
+        from neon_data_models.models.user import (TokenExpiryIndex,
+                                                  UserStore)
+        users = self._get_users()
+        store = UserStore()
+        store.put_many(users)
+        index = TokenExpiryIndex.from_users(users)
+        modified = index.purge_expired(store.get_by_username, now=1500)
+        self.assertEqual(modified, users)
+        self.assertEqual([t.token_name for t in users[0].tokens], ["b"])
+        self.assertEqual(users[1].tokens, [])
+        self.assertEqual(index.purge_expired(store.get_by_username,
+                                             now=1500), [])
+        self.assertEqual(len(index), 1)
+
+    def test_refresh_sweep_skips_access_expirations(self):
+        from neon_data_models.models.user import TokenExpiryIndex
+        users = self._get_users()
+        for user in users:
+            for token in user.tokens:
+                token.expiration = 0
+                token.refresh_expiration = 10000
+        index = TokenExpiryIndex.from_users(users)
+        access_heap = list(index._heaps["access"])
+        for _ in range(2):
+            self.assertEqual(index.pop_expired(now=100, kind="refresh"), [])
+            # Expired access entries are not popped and pushed back
+            self.assertEqual(index._heaps["access"], access_heap)
+        self.assertEqual(len(index.pop_expired(now=100, kind="access")), 3)
+        self.assertEqual(index._heaps["access"], [])
+        self.assertEqual(len(index), 3)
+
+
+class TestContentDigest(TestCase):
+    def test_digest(self):
+        user = User(username="test", neon={"skills": {"a": {"x": 1},
+                                                      "b": {"y": 2}}})
+        same = User(username="test", user_id=user.user_id,
+                    created_timestamp=user.created_timestamp,
+                    neon={"skills": {"b": {"y": 2}, "a": {"x": 1}}})
+        self.assertEqual(user.content_digest, same.content_digest)
+        self.assertEqual(user, same)
+        self.assertEqual(hash(user), hash(same))
+        self.assertEqual(len({user, same}), 1)
+        self.assertEqual(user.neon, same.neon)
+        self.assertNotEqual(user, user.neon)
+        self.assertNotEqual(user, "test")
+
+        # Cached digests are invalidated by field assignment at any depth
+        digest = user.content_digest
+        user.neon.user.email = "test@neon.ai"
+        self.assertNotEqual(user.content_digest, digest)
+        self.assertNotEqual(user, same)
+        same.neon.user.email = "test@neon.ai"
+        self.assertEqual(user, same)
+
+        # and by copying with changes
+        copy = user.model_copy(update={"username": "copy"})
+        self.assertNotEqual(copy, user)
+        self.assertEqual(user.model_copy(), user)
+
+        # Equality does not depend on cached digests
+        before = user.model_copy(deep=True)
+        digest = user.content_digest
+        self.assertEqual(before.content_digest, digest)
+        user.neon.skills["c"] = {}
+        self.assertNotEqual(user, before)
+        self.assertNotEqual(user.neon, before.neon)
+        user.neon.skills.pop("c")
+        self.assertEqual(user, before)
+
+        # In-place changes of containers require explicit invalidation of
+        # the digest, which also clears nested models
+        user.neon.skills["c"] = {}
+        self.assertEqual(user.content_digest, digest)
+        user.invalidate_digest()
+        self.assertNotEqual(user.content_digest, digest)
+        self.assertNotEqual(user.neon.content_digest, before.neon.content_digest)
+
+        # Appending a nested model in place also requires invalidation
+        digest = user.content_digest
+        user.tokens.append(TokenConfig(
+            username="test", client_id="test", permissions={},
+            refresh_token="", expiration=0, refresh_expiration=0,
+            token_name="test", creation_timestamp=0,
+            last_refresh_timestamp=0))
+        self.assertEqual(user.content_digest, digest)
+        user.invalidate_digest()
+        self.assertNotEqual(user.content_digest, digest)
+
+        # Assigning a field only invalidates the digests of that model and
+        # models containing it
+        digest = same.content_digest
+        user.username = "changed"
+        self.assertIs(same.__dict__["_content_digest"], digest)
+        neon_digest = user.neon.content_digest
+        user.neon.units.time = 24
+        self.assertNotIn("_content_digest", user.__dict__)
+        self.assertNotIn("_content_digest", user.neon.__dict__)
+        self.assertNotEqual(user.neon.content_digest, neon_digest)
+
+        # Models shared by copies invalidate every containing model
+        digest = user.content_digest
+        copy = user.model_copy()
+        self.assertIs(copy.neon, user.neon)
+        self.assertEqual(copy.content_digest, digest)
+        user.neon.units.time = 12
+        self.assertNotEqual(user.content_digest, digest)
+        self.assertEqual(copy.content_digest, user.content_digest)
+
+    def test_digest_copies(self):
+        import pickle
+        from copy import copy, deepcopy
+        user = User(username="test", neon={"units": {"time": 24}})
+        digest = user.content_digest
+        for copied in (deepcopy(user), pickle.loads(pickle.dumps(user)),
+                       user.model_copy(deep=True)):
+            self.assertEqual(copied, user)
+            self.assertNotIn("_content_digest", copied.__dict__)
+            self.assertEqual(copied.content_digest, digest)
+            copied.neon.units.time = 12
+            self.assertNotEqual(copied.content_digest, digest)
+            self.assertEqual(user.content_digest, digest)
+        self.assertNotIn("_content_digest", copy(user).__dict__)
+
+    def test_default_models_not_shared(self):
+        first = User(username="first")
+        second = User(username="second")
+        self.assertIsNot(first.neon, second.neon)
+        first.neon.units.time = 24
+        self.assertEqual(second.neon.units.time, 12)
+        self.assertEqual(User(username="third").neon.units.time, 12)
+        self.assertEqual(NeonUserConfig().units.time, 12)
+
+
+class TestPatch(TestCase):
+    def test_make_apply_patch(self):
+        from neon_data_models.models.user import apply_patch, make_patch
+        skills = {f"skill_{i}": {"setting": i, "values": list(range(100))}
+                  for i in range(100)}
+        user = User(username="test", neon={"skills": skills})
+        self.assertEqual(make_patch(user, user), {})
+
+        updated = user.model_copy(deep=True)
+        updated.neon.units.time = 24
+        updated.neon.user.dob = date(2001, 1, 1)
+        updated.neon.skills["skill_1"]["setting"] = "new"
+        updated.neon.skills.pop("skill_2")
+        updated.invalidate_digest()
+        patch = make_patch(user, updated)
+        self.assertEqual(patch, {"neon": {
+            "units": {"time": 24}, "user": {"dob": "2001-01-01"},
+            "skills": {"skill_1": {"setting": "new"}, "skill_2": None}}})
+        self.assertLess(len(str(patch)) * 100, len(user.model_dump_json()))
+
+        patched = apply_patch(user, patch)
+        self.assertEqual(patched, updated)
+        self.assertEqual(user.neon.units.time, 12)
+
+        # Removed fields are reset to defaults
+        patched = apply_patch(updated, {"neon": {"units": None}})
+        self.assertEqual(patched.neon.units.time, 12)
+        with self.assertRaises(ValidationError):
+            apply_patch(user, {"neon": {"units": {"time": 13}}})
+
+        # Fields set to `None` can only be patched if that is their default
+        reverted = apply_patch(updated, make_patch(updated, user))
+        self.assertIsNone(reverted.neon.user.dob)
+        self.assertEqual(reverted, user)
+        updated.tokens = None
+        with self.assertRaises(ValueError):
+            make_patch(user, updated)
+
+    def test_validate_patch(self):
+        from neon_data_models.models.user import validate_patch
+        self.assertEqual(validate_patch({"neon": {"user": {"dob": date(
+            2001, 1, 1)}}, "tokens": None}),
+            {"neon": {"user": {"dob": "2001-01-01"}}, "tokens": None})
+        self.assertEqual(validate_patch({"neon": {"skills": {
+            "skill": {"key": None}}}}),
+            {"neon": {"skills": {"skill": {"key": None}}}})
+        for invalid in ({"neon": {"units": {"time": 13}}},
+                        {"neon": {"invalid": True}},
+                        {"username": None},
+                        {"user_id": None},
+                        {"created_timestamp": None},
+                        {"tokens": {"username": "test"}},
+                        {"neon": {"skills": {"skill": "value"}}}):
+            with self.assertRaises(ValueError):
+                validate_patch(invalid)
+
+
+class TestProjection(TestCase):
+    def test_field_tree(self):
+        from neon_data_models.models.user import get_field_tree
+        self.assertEqual(get_field_tree(["neon.units.time", "neon.user",
+                                         "neon.user.email", "permissions"]),
+                         {"neon": {"units": {"time": True}, "user": True},
+                          "permissions": True})
+        for invalid in ("invalid", "neon.invalid", "username.invalid",
+                        "tokens.username"):
+            with self.assertRaises(ValueError):
+                get_field_tree([invalid])
+
+    def test_partial_model(self):
+        from neon_data_models.models.user import get_partial_model, project
+        fields = ["permissions", "neon.units", "neon.user.email"]
+        model = get_partial_model(fields)
+        self.assertIs(get_partial_model(reversed(fields)), model)
+        self.assertEqual(set(model.model_fields), {"permissions", "neon"})
+
+        user = User(username="test", neon={"user": {"email": "a@neon.ai",
+                                                    "first_name": "Test"},
+                                           "skills": {"skill": {"x": 1}}},
+                    permissions={"core": 1})
+        projected = project(user, fields, mode="json")
+        self.assertEqual(projected, {
+            "neon": {"user": {"email": "a@neon.ai"},
+                     "units": user.neon.units.model_dump()},
+            "permissions": user.permissions.model_dump(mode="json")})
+
+        partial = model.model_validate(projected)
+        self.assertEqual(partial.neon.user.email, "a@neon.ai")
+        self.assertEqual(partial.permissions.core, 1)
+        # Unprojected fields are ignored in validation
+        self.assertEqual(model.model_validate(user.model_dump()), partial)
+        # Projected defaults are filled
+        self.assertEqual(model.model_validate({}).neon.units.time, 12)
+        with self.assertRaises(ValidationError):
+            model.model_validate({"neon": {"units": {"time": 13}}})
+        self.assertIn("username",
+                      get_partial_model(["username"]).model_json_schema()
+                      ["required"])
+
+
+class TestPermissions(TestCase):
+    def test_bits(self):
+        from neon_data_models.enum import AccessRoles
+        from neon_data_models.models.user import PermissionsConfig
+        default = PermissionsConfig()
+        self.assertEqual(PermissionsConfig.from_bits(default.to_bits()),
+                         default)
+        for role in AccessRoles:
+            config = PermissionsConfig(klat=role, llm=AccessRoles.OWNER,
+                                       node=AccessRoles.NODE)
+            self.assertEqual(PermissionsConfig.from_bits(config.to_bits()),
+                             config)
+        self.assertNotEqual(PermissionsConfig(core=1).to_bits(),
+                            PermissionsConfig(diana=1).to_bits())
+
+    def test_policy(self):
+        from neon_data_models.enum import AccessRoles
+        from neon_data_models.models.user import PermissionPolicy
+        policy = PermissionPolicy({
+            "chat": ("klat", AccessRoles.GUEST),
+            "moderate": ("klat", AccessRoles.ADMIN),
+            "infer": ("llm", AccessRoles.USER),
+            "node_api": ("node", AccessRoles.NODE)})
+        self.assertIn("chat", policy)
+        self.assertEqual(len(policy.actions), 4)
+        with self.assertRaises(ValueError):
+            policy.add_rule("invalid", "invalid", AccessRoles.USER)
+
+        user = User(username="test", permissions={"klat": AccessRoles.USER})
+        bits = user.permissions.to_bits()
+        for permissions in (user, user.permissions, bits):
+            self.assertTrue(policy.allows(permissions, "chat"))
+            self.assertFalse(policy.allows(permissions, "moderate"))
+            self.assertFalse(policy.allows(permissions, "infer"))
+        self.assertEqual(policy.allowed_actions(bits), {"chat", "node_api"})
+        with self.assertRaises(KeyError):
+            policy.allows(bits, "invalid")
+
+        users = [User(username=f"user_{role.name}",
+                      permissions={"klat": role}) for role in AccessRoles]
+        self.assertEqual(policy.evaluate_many(users, "moderate"),
+                         [role >= AccessRoles.ADMIN for role in AccessRoles])
+        self.assertEqual([u.username for u in
+                          policy.filter_allowed(users, "moderate")],
+                         ["user_ADMIN", "user_OWNER"])
@@ -0,0 +1,136 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from datetime import timedelta
+from io import BytesIO
+from time import time
+from unittest import TestCase, skipUnless
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _get_timings(count: int) -> list:
+    from neon_data_models.models.base.contexts import TimingContext
+    now = time()
+    return [TimingContext(client_sent=now + i, get_stt=i / 100,
+                          get_tts=None if i % 2 else 0.5)
+            for i in range(count)]
+
+
+class TestTimingTable(TestCase):
+    def _test_table(self, use_numpy: bool):
+        from neon_data_models.analytics import TimingTable, DURATION_FIELDS
+        from neon_data_models.models.base.contexts import TimingContext
+        table = TimingTable(use_numpy=use_numpy)
+        self.assertEqual(table.summarize(), {})
+        self.assertEqual(table.stats("get_stt").count, 0)
+
+        timings = _get_timings(101)
+        table.extend(timings)
+        self.assertEqual(len(table), 101)
+
+        stats = table.stats("get_stt")
+        self.assertEqual(stats.count, 101)
+        self.assertAlmostEqual(stats.mean, 0.5)
+        self.assertAlmostEqual(stats.p50, 0.5)
+        self.assertAlmostEqual(stats.p95, 0.95)
+        self.assertAlmostEqual(stats.p99, 0.99)
+        self.assertAlmostEqual(stats.max, 1.0)
+
+        summary = table.summarize()
+        self.assertEqual(set(summary.keys()), {"get_stt", "get_tts"})
+        self.assertEqual(summary["get_tts"].count, 51)
+        self.assertEqual(summary["get_tts"].p99, 0.5)
+        self.assertTrue(set(summary.keys()).issubset(DURATION_FIELDS))
+        self.assertEqual(table.stats("client_sent").count, 101)
+
+        counts, edges = table.histogram("get_stt", bins=4)
+        self.assertEqual(counts, [25, 25, 25, 26])
+        self.assertEqual(len(edges), 5)
+        self.assertAlmostEqual(edges[0], 0.0)
+        self.assertAlmostEqual(edges[-1], 1.0)
+        counts, _ = table.histogram("get_stt", bins=2, value_range=(0, 0.5))
+        self.assertEqual(counts, [25, 26])
+
+        # Derived metrics match the TimingContext properties
+        self.assertEqual(table.stats("round_trip").count, 0)
+        processing = table.column("processing")
+        for timing, value in zip(timings, processing):
+            self.assertAlmostEqual(value, timing.processing.total_seconds())
+        self.assertEqual(table.stats("transport").count, 0)
+        table.add(TimingContext(client_sent=1000.0, response_sent=1002.0,
+                                get_stt=0.5, client_to_core=0.25))
+        self.assertEqual(len(table.column("processing")), 102)
+        self.assertEqual(table.stats("round_trip").max, 2.0)
+        self.assertEqual(table.stats("transport").max, 0.25)
+        self.assertEqual(table.stats("unaccounted").max, 1.25)
+        with self.assertRaises(KeyError):
+            table.column("invalid")
+        return table
+
+    def test_table_stdlib(self):
+        self._test_table(False)
+
+    @skipUnless(numpy, "NumPy is not installed")
+    def test_table_numpy(self):
+        numpy_summary = self._test_table(True).summarize()
+        stdlib_summary = self._test_table(False).summarize()
+        self.assertEqual(numpy_summary.keys(), stdlib_summary.keys())
+        for field, stats in numpy_summary.items():
+            for value, expected in zip(stats, stdlib_summary[field]):
+                self.assertAlmostEqual(value, expected)
+
+    def test_from_jsonl(self):
+        from neon_data_models.analytics import TimingTable
+        timings = _get_timings(10)
+        data = b"\n".join(t.model_dump_json().encode() for t in timings)
+        table = TimingTable.from_jsonl(BytesIO(data), use_numpy=False)
+        self.assertEqual(len(table), 10)
+        self.assertAlmostEqual(table.stats("get_stt").max,
+                               timings[-1].get_stt.total_seconds())
+        self.assertEqual(table.column("get_stt")[1],
+                         timedelta(seconds=0.01).total_seconds())
+
+    def test_extend_batches(self):
+        from unittest.mock import patch
+        from neon_data_models.analytics import TimingTable
+        timings = _get_timings(10)
+        table = TimingTable(use_numpy=False)
+        pending = []
+
+        def _generate():
+            for index, timing in enumerate(timings):
+                # Records are added before the next batch is read
+                pending.append(index - len(table.column("client_sent")))
+                yield timing
+
+        with patch("neon_data_models.analytics._EXTEND_BATCH_SIZE", 4):
+            table.extend(_generate())
+        self.assertEqual(len(table), 10)
+        self.assertEqual(max(pending), 3)
@@ -0,0 +1,176 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from os.path import join, isfile
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+
+def _get_message(message_id: str, session_id: str = "default",
+                 text: str = "test"):
+    from neon_data_models.models.api.node_v1 import NodeTextInput
+    return NodeTextInput(data={"utterances": [text], "lang": "en-us"},
+                         context={"mq": {"message_id": message_id},
+                                  "session": {"session_id": session_id}})
+
+
+class TestMessageArchive(TestCase):
+    def test_archive(self):
+        from neon_data_models.archive import MessageArchive
+        from neon_data_models.models.api.node_v1 import NodeGetTts
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "messages.jsonl")
+            messages = [_get_message(f"mid_{i}", f"session_{i % 2}")
+                        for i in range(10)]
+            tts = NodeGetTts(data={"text": "hi", "lang": "en-us"},
+                             context={})
+            with MessageArchive(path) as archive:
+                for message in messages:
+                    archive.append(message)
+                archive.append(tts)
+                self.assertEqual(len(archive), 11)
+                self.assertIn("mid_3", archive)
+                self.assertNotIn("mid_10", archive)
+                self.assertEqual(archive.get("mid_3"), messages[3])
+                self.assertIsNone(archive.get("mid_10"))
+                self.assertEqual(bytes(archive.get_raw("mid_4")),
+                                 messages[4].model_dump_json().encode())
+
+                self.assertEqual(list(archive.find(msg_type="neon.get_tts")),
+                                 [tts])
+                self.assertEqual(list(archive.find(session_id="session_1")),
+                                 messages[1::2])
+                self.assertEqual(len(list(archive.find())), 11)
+
+            self.assertTrue(isfile(f"{path}.idx"))
+            # Reopen with existing index
+            with MessageArchive(path) as archive:
+                self.assertEqual(len(archive), 11)
+                self.assertEqual(archive.get("mid_9"), messages[9])
+                archive.append(_get_message("mid_10"))
+                self.assertEqual(archive.get("mid_10"), _get_message("mid_10"))
+
+    def test_rebuild_and_compact(self):
+        from neon_data_models.archive import MessageArchive
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "messages.jsonl")
+            with MessageArchive(path) as archive:
+                for i in range(5):
+                    archive.append(_get_message(f"mid_{i}"))
+                archive.append(_get_message("mid_0", text="updated"))
+                self.assertEqual(archive.get("mid_0").data.utterances,
+                                 ["updated"])
+                # Stale index is rebuilt on open
+                archive.flush()
+                with open(f"{path}.idx", "w") as f:
+                    f.write("")
+
+            with MessageArchive(path) as archive:
+                # Replaced messages are not counted or found
+                self.assertEqual(len(archive), 5)
+                self.assertEqual([m.data.utterances for m in archive.find(
+                    msg_type="recognizer_loop:utterance")
+                    if m.context.mq.message_id == "mid_0"], [["updated"]])
+                self.assertEqual(len(list(archive.find())), 5)
+                self.assertEqual(len(list(archive.find(
+                    session_id="default"))), 5)
+                self.assertEqual(archive.get("mid_0").data.utterances,
+                                 ["updated"])
+                self.assertEqual(archive.compact(), 1)
+                self.assertEqual(len(archive), 5)
+                self.assertEqual(archive.get("mid_0").data.utterances,
+                                 ["updated"])
+                self.assertEqual(archive.compact(
+                    keep=lambda m: m["context"]["mq"]["message_id"] !=
+                    "mid_1"), 1)
+                self.assertNotIn("mid_1", archive)
+
+            with MessageArchive(path) as archive:
+                self.assertEqual(len(archive), 4)
+                self.assertEqual(archive.get("mid_2"), _get_message("mid_2"))
+
+    def test_torn_index(self):
+        from neon_data_models.archive import MessageArchive, main
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "messages.jsonl")
+            with MessageArchive(path) as archive:
+                for i in range(3):
+                    archive.append(_get_message(f"mid_{i}"))
+            # Simulate a crash while writing the last index entry
+            with open(f"{path}.idx", "rb") as f:
+                index = f.read()
+            with open(f"{path}.idx", "wb") as f:
+                f.write(index[:-10])
+            with MessageArchive(path) as archive:
+                self.assertEqual(len(archive), 3)
+                self.assertEqual(archive.get("mid_2"), _get_message("mid_2"))
+
+            with open(f"{path}.idx", "wb") as f:
+                f.write(index[:-10])
+            with patch("sys.argv", ["archive", "rebuild-index", path]):
+                main()
+            with open(f"{path}.idx", "rb") as f:
+                self.assertEqual(f.read(), index)
+
+    def test_torn_record(self):
+        from neon_data_models.archive import MessageArchive, main
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "messages.jsonl")
+            with MessageArchive(path) as archive:
+                for i in range(3):
+                    archive.append(_get_message(f"mid_{i}"))
+            with open(path, "rb") as f:
+                data = f.read()
+            with open(f"{path}.idx", "rb") as f:
+                index = f.read()
+
+            # Simulate a crash while writing the last record, with and
+            # without its index entry
+            for torn_index in (index, index[:-10], b""):
+                with open(path, "wb") as f:
+                    f.write(data[:-10])
+                with open(f"{path}.idx", "wb") as f:
+                    f.write(torn_index)
+                with MessageArchive(path) as archive:
+                    self.assertEqual(len(archive), 2)
+                    self.assertNotIn("mid_2", archive)
+                    archive.append(_get_message("mid_2"))
+                with MessageArchive(path) as archive:
+                    self.assertEqual(archive.get("mid_2"),
+                                     _get_message("mid_2"))
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), data)
+
+            # A final record which is not valid JSON is also removed
+            with open(path, "wb") as f:
+                f.write(data + b'{"msg_type": tru}\n')
+            with patch("sys.argv", ["archive", "rebuild-index", path]):
+                main()
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), data)
+            with open(f"{path}.idx", "rb") as f:
+                self.assertEqual(f.read(), index)
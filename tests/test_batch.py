@@ -0,0 +1,109 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from time import time
+from unittest import TestCase
+
+
+class TestBatch(TestCase):
+    def test_validate_many_users(self):
+        from neon_data_models.batch import validate_many
+        from neon_data_models.models.user.database import User
+        users = [User(username=f"user_{i}") for i in range(5)]
+        serialized = [u.model_dump(mode="json") for u in users]
+
+        # Python objects
+        result = validate_many(User, serialized)
+        self.assertEqual(result.models, users)
+        self.assertEqual(result.errors, {})
+
+        # JSON array
+        result = validate_many(User, json.dumps(serialized))
+        self.assertEqual(result.models, users)
+        result = validate_many(User, json.dumps(serialized).encode())
+        self.assertEqual(result.valid, users)
+
+        # JSON lines
+        jsonl = "\n".join(u.model_dump_json() for u in users) + "\n"
+        self.assertEqual(validate_many(User, jsonl).models, users)
+        self.assertEqual(validate_many(User, jsonl.encode()).models, users)
+
+        # Generator input
+        self.assertEqual(validate_many(User, iter(serialized)).models, users)
+
+    def test_validate_many_errors(self):
+        from neon_data_models.batch import validate_many
+        from neon_data_models.models.user.database import User
+        records = [{"username": "valid"}, {"password_hash": "no username"},
+                   {"username": "valid_2"}, {"username": "test",
+                                             "tokens": [{"username": "test"}]}]
+        for data in (records, json.dumps(records),
+                     "\n".join(json.dumps(r) for r in records).encode()):
+            result = validate_many(User, data)
+            self.assertEqual(len(result.models), 4)
+            self.assertEqual([u.username for u in result.valid],
+                             ["valid", "valid_2"])
+            self.assertIsNone(result.models[1])
+            self.assertEqual(set(result.errors.keys()), {1, 3})
+            self.assertEqual(result.errors[1][0]["loc"], ("username",))
+            self.assertEqual(result.errors[3][0]["loc"][:2], ("tokens", 0))
+
+        # Invalid JSON line
+        result = validate_many(User, b'{"username": "valid"}\n{invalid\n')
+        self.assertEqual(result.valid[0].username, "valid")
+        self.assertEqual(result.errors[1][0]["type"], "json_invalid")
+
+        # Explicit JSON lines; corrupt lines are not read as an array
+        for data in (b'[1, 2\n{"username": "valid"}',
+                     b'["corrupt"]\n{"username": "valid"}',
+                     b'{"username": "a"}, {"username": "b"}\n'
+                     b'{"username": "valid"}'):
+            result = validate_many(User, data, jsonl=True)
+            self.assertEqual(len(result.models), 2)
+            self.assertEqual(list(result.errors.keys()), [0])
+            self.assertEqual(result.models[1].username, "valid")
+
+    def test_validate_many_messages(self):
+        from neon_data_models.batch import validate_many
+        from neon_data_models.models.api.node_v1 import (NodeMessage,
+                                                         NodeTextInput,
+                                                         NodeGetTts)
+        from neon_data_models.models.base.contexts import TimingContext
+        messages = [NodeTextInput(data={"utterances": ["hi"],
+                                        "lang": "en-us"}, context={}),
+                    NodeGetTts(data={"text": "hi", "lang": "en-us"},
+                               context={})]
+        jsonl = "\n".join(m.model_dump_json() for m in messages)
+        self.assertEqual(validate_many(NodeMessage, jsonl).models, messages)
+        result = validate_many(NodeTextInput, jsonl)
+        self.assertEqual(result.valid, messages[:1])
+        self.assertEqual(list(result.errors.keys()), [1])
+
+        timings = [{"transcribed": time()}, {"get_stt": 0.5}]
+        result = validate_many(TimingContext, json.dumps(timings))
+        self.assertIsNotNone(result.models[0].handle_utterance)
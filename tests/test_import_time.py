@@ -0,0 +1,101 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import subprocess
+import sys
+
+from typing import Dict
+from unittest import TestCase
+
+
+def _import_times(statement: str) -> Dict[str, int]:
+    """
+    Get `python -X importtime` self times in microseconds for each module
+    imported by `statement` in a fresh interpreter.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             statement], capture_output=True, text=True,
+                            check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, module = line.split(":", 1)[1].split("|")
+        times[module.strip()] = int(self_time)
+    return times
+
+
+class TestImportTime(TestCase):
+    # Budget in milliseconds for time spent in this package's modules,
+    # excluding dependencies like `pydantic`
+    budgets_ms = {
+        "from neon_data_models.models.client.node import NodeData": 100,
+        "from neon_data_models.models.api.node_v1 import NodeTextInput": 200,
+        "from neon_data_models.models.user import User": 150,
+        "import neon_data_models.models": 50,
+    }
+
+    def test_import_budget(self):
+        for statement, budget in self.budgets_ms.items():
+            times = _import_times(statement)
+            package_time = sum(t for m, t in times.items()
+                               if m.startswith("neon_data_models")) / 1000
+            self.assertLess(package_time, budget, statement)
+
+    def test_lazy_imports(self):
+        times = _import_times("import neon_data_models.models")
+        self.assertNotIn("neon_data_models.models.base", times)
+        self.assertNotIn("pydantic", times)
+
+        times = _import_times(
+            "from neon_data_models.models.client import NodeData")
+        for module in ("pytz", "neon_data_models.models.user",
+                       "neon_data_models.models.api"):
+            self.assertNotIn(module, times)
+
+        times = _import_times("from neon_data_models.models.user import User")
+        self.assertNotIn("neon_data_models.models.user.neon_profile", times)
+        self.assertNotIn("pytz", times)
+
+    def test_lazy_exports(self):
+        from importlib import import_module
+        import neon_data_models.models
+        import neon_data_models.models.api as api
+        import neon_data_models.models.client as client
+        import neon_data_models.models.user as user
+
+        self.assertIs(neon_data_models.models.user, user)
+        for package in (api, client, user):
+            # Lazy exports match the `__all__` of the defining modules
+            modules = set(package._LAZY_EXPORTS.values())
+            exported = set()
+            for module in modules:
+                exported.update(import_module(module).__all__)
+            self.assertEqual(set(package.__all__), exported)
+            for name in package.__all__:
+                self.assertIsNotNone(getattr(package, name))
+            with self.assertRaises(AttributeError):
+                getattr(package, "invalid")
@@ -0,0 +1,111 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from datetime import datetime, timedelta
+from time import sleep, time
+from unittest import TestCase
+
+
+class TestInstrumentation(TestCase):
+    def tearDown(self):
+        from neon_data_models.instrumentation import set_enabled
+        set_enabled(True)
+
+    def test_stage(self):
+        from neon_data_models.models.base.contexts import TimingContext
+        from neon_data_models.instrumentation import stage
+        timing = TimingContext()
+        with timing.stage("mq_input_handler"):
+            with stage(timing, "get_stt"):
+                sleep(0.01)
+        self.assertIsInstance(timing.get_stt, timedelta)
+        self.assertGreaterEqual(timing.get_stt, timedelta(seconds=0.01))
+        self.assertGreaterEqual(timing.mq_input_handler, timing.get_stt)
+        self.assertEqual(timing.model_fields_set,
+                         {"get_stt", "mq_input_handler"})
+        self.assertEqual(TimingContext.model_validate_json(
+            timing.model_dump_json()), timing)
+
+        # Durations are recorded if the body raises
+        with self.assertRaises(RuntimeError):
+            with timing.stage("get_tts"):
+                raise RuntimeError()
+        self.assertIsInstance(timing.get_tts, timedelta)
+
+        # Missing TimingContext
+        with stage(None, "get_stt"):
+            pass
+
+        with self.assertRaises(ValueError):
+            timing.stage("client_sent")
+        with self.assertRaises(ValueError):
+            timing.stage("invalid")
+
+    def test_mark(self):
+        from neon_data_models.models.base.contexts import TimingContext
+        timing = TimingContext()
+        timing.mark("client_sent")
+        self.assertIsInstance(timing.client_sent, datetime)
+        with self.assertRaises(ValueError):
+            timing.mark("get_stt")
+
+        # Marked timestamps are comparable with ones parsed from epoch times
+        timing = TimingContext(client_sent=time())
+        timing.mark("response_sent")
+        self.assertIsNotNone(timing.response_sent.tzinfo)
+        self.assertGreaterEqual(timing.round_trip, timedelta())
+        self.assertEqual(timing.unaccounted, timing.round_trip)
+
+    def test_timed(self):
+        from neon_data_models.models.base.contexts import TimingContext
+        from neon_data_models.instrumentation import timed
+
+        @timed("get_tts", lambda text, timing: timing)
+        def get_tts(text: str, timing: TimingContext):
+            return text.upper()
+
+        timing = TimingContext()
+        self.assertEqual(get_tts("test", timing), "TEST")
+        self.assertIsInstance(timing.get_tts, timedelta)
+        self.assertEqual(get_tts("test", None), "TEST")
+        self.assertEqual(get_tts.__name__, "get_tts")
+
+    def test_disabled(self):
+        from neon_data_models.models.base.contexts import TimingContext
+        from neon_data_models.instrumentation import (set_enabled, is_enabled,
+                                                      timed)
+        set_enabled(False)
+        self.assertFalse(is_enabled())
+        timing = TimingContext()
+        with timing.stage("get_stt"):
+            pass
+        timing.mark("client_sent")
+        timed("get_tts", lambda: timing)(lambda: None)()
+        self.assertEqual(timing, TimingContext())
+        set_enabled(True)
+        with timing.stage("get_stt"):
+            pass
+        self.assertIsNotNone(timing.get_stt)
@@ -0,0 +1,70 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Dict, List
+from unittest import TestCase
+
+
+class TestRegistry(TestCase):
+    def test_get_models(self):
+        from neon_data_models.registry import get_models
+        from neon_data_models.models.user.database import User
+        from neon_data_models.models.api.node_v1 import NodeAudioInput
+        from neon_data_models.models.base.contexts import TimingContext
+        models = get_models()
+        for model in (User, NodeAudioInput, TimingContext):
+            self.assertIn(model, models)
+        self.assertFalse(any(m.__name__.startswith("_") for m in models))
+
+    def test_get_adapter(self):
+        from neon_data_models.registry import (get_adapter, get_list_adapter,
+                                               get_dict_adapter,
+                                               get_build_times, clear_cache)
+        from neon_data_models.models.user.database import User
+        clear_cache()
+        adapter = get_list_adapter(User)
+        self.assertIs(adapter, get_adapter(List[User]))
+        self.assertIs(get_dict_adapter(User), get_adapter(Dict[str, User]))
+        users = adapter.validate_python([{"username": "test"}])
+        self.assertIsInstance(users[0], User)
+
+        build_times = get_build_times()
+        self.assertEqual(set(build_times.keys()),
+                         {"list[User]", "dict[str, User]"})
+        clear_cache()
+        self.assertEqual(get_build_times(), {})
+
+    def test_warm_up(self):
+        from neon_data_models.registry import (warm_up, get_models,
+                                               clear_cache)
+        from neon_data_models.models.user.database import User
+        clear_cache()
+        build_times = warm_up([User])
+        self.assertEqual(len(build_times), 3)
+        self.assertTrue(all(t >= 0 for t in build_times.values()))
+        self.assertEqual(len(warm_up()), 3 * len(get_models()))
+        for model in get_models():
+            self.assertTrue(model.__pydantic_complete__, model)
@@ -0,0 +1,128 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from io import BytesIO
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+
+def _get_messages(count: int) -> list:
+    from neon_data_models.models.api.node_v1 import NodeTextInput, NodeGetTts
+    messages = []
+    for i in range(count):
+        if i % 2:
+            messages.append(NodeGetTts(data={"text": f"text {i}",
+                                             "lang": "en-us"},
+                                       context={"mq": {"message_id": f"{i}"}}))
+        else:
+            messages.append(NodeTextInput(data={"utterances": [f"text {i}"],
+                                                "lang": "en-us"},
+                                          context={}))
+    return messages
+
+
+class TestStream(TestCase):
+    def test_iter_lines(self):
+        from neon_data_models.stream import iter_lines
+        data = b"line 1\nline 2\n\nline 3 is long\nline 4"
+        lines = [line for chunk in iter_lines(BytesIO(data), chunk_size=4)
+                 for line in chunk]
+        self.assertEqual(lines, [b"line 1", b"line 2", b"", b"line 3 is long",
+                                 b"line 4"])
+
+    def test_read_socket(self):
+        import socket
+        from neon_data_models.stream import read_messages
+        messages = _get_messages(2)
+        sender, receiver = socket.socketpair()
+        try:
+            reader = read_messages(receiver.makefile("rb"))
+            sender.sendall(messages[0].model_dump_json().encode() + b"\n")
+            # Messages are read before the sender closes the connection
+            receiver.settimeout(5)
+            self.assertEqual(next(reader), messages[0])
+            sender.sendall(messages[1].model_dump_json().encode() + b"\n")
+            self.assertEqual(next(reader), messages[1])
+            sender.close()
+            self.assertEqual(list(reader), [])
+        finally:
+            sender.close()
+            receiver.close()
+
+    def test_write_read_messages(self):
+        from neon_data_models.stream import MessageWriter, read_messages
+        messages = _get_messages(50)
+        with TemporaryDirectory() as tmp:
+            for filename in ("log.jsonl", "log.jsonl.gz", "log.jsonl.xz"):
+                path = join(tmp, filename)
+                with MessageWriter(path, buffer_size=512) as writer:
+                    writer.write_many(messages[:25])
+                # Append to existing log
+                with MessageWriter(path) as writer:
+                    writer.write_many(messages[25:])
+                read = list(read_messages(path, chunk_size=256))
+                self.assertEqual(read, messages)
+                for message, expected in zip(read, messages):
+                    self.assertIsInstance(message, expected.__class__)
+
+    def test_read_file_object(self):
+        from neon_data_models.stream import MessageWriter, read_messages
+        from neon_data_models.models.base.messagebus import PassthroughMessage
+        messages = _get_messages(5)
+        buffer = BytesIO()
+        with MessageWriter(buffer) as writer:
+            writer.write_many(messages)
+        self.assertFalse(buffer.closed)
+        buffer.seek(0)
+        read = list(read_messages(buffer, model=PassthroughMessage))
+        self.assertEqual([m.msg_type for m in read],
+                         [m.msg_type for m in messages])
+
+    def test_read_invalid(self):
+        from neon_data_models.stream import read_messages
+        valid = _get_messages(1)[0].model_dump_json().encode()
+        data = b"\n".join((valid, b'{"msg_type": "unknown"}', b"{invalid",
+                           valid))
+        with self.assertRaises(ValueError):
+            list(read_messages(BytesIO(data)))
+
+        errors = {}
+        read = list(read_messages(BytesIO(data), chunk_size=64,
+                                  on_error=lambda n, e: errors.update({n: e})))
+        self.assertEqual(len(read), 2)
+        self.assertEqual(set(errors.keys()), {2, 3})
+
+        # Line numbers include blank lines; lines starting with `[` are
+        # reported like any other invalid line
+        data = b"\n".join((valid, b"", valid, b'["corrupt"', b"", valid))
+        errors = {}
+        read = list(read_messages(BytesIO(data),
+                                  on_error=lambda n, e: errors.update({n: e})))
+        self.assertEqual(len(read), 3)
+        self.assertEqual(list(errors.keys()), [4])
+        with self.assertRaisesRegex(ValueError, "line 4"):
+            list(read_messages(BytesIO(data)))
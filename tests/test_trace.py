@@ -0,0 +1,105 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+
+class TestTrace(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from neon_data_models.models.base.contexts import TimingContext
+        cls.timing = TimingContext(client_sent=1000.0, get_stt=0.5,
+                                   get_tts=0.25, response_sent=1001.0)
+
+    def test_chrome_trace(self):
+        from neon_data_models.trace import to_chrome_trace
+        trace = to_chrome_trace({"m1": self.timing, "m2": self.timing})
+        events = trace["traceEvents"]
+        stages = [e for e in events if e["ph"] == "X"]
+        self.assertEqual([e["name"] for e in stages],
+                         ["get_stt", "get_tts", "get_stt", "get_tts"])
+        self.assertEqual(stages[0]["ts"], 1000.0 * 1e6)
+        self.assertEqual(stages[0]["dur"], 0.5 * 1e6)
+        # Stages are laid out back-to-back
+        self.assertEqual(stages[1]["ts"], stages[0]["ts"] + stages[0]["dur"])
+        self.assertEqual({e["tid"] for e in stages}, {1, 2})
+        self.assertEqual({e["pid"] for e in stages}, {1})
+        instants = [e["name"] for e in events if e["ph"] == "i"]
+        self.assertEqual(instants, ["client_sent", "response_sent"] * 2)
+        names = [e["args"]["name"] for e in events
+                 if e["name"] == "thread_name"]
+        self.assertEqual(names, ["m1", "m2"])
+
+    def test_chrome_trace_messages(self):
+        from neon_data_models.trace import to_chrome_trace
+        from neon_data_models.models.base.messagebus import BaseMessage
+        messages = [BaseMessage(msg_type="test", data={},
+                                context={"mq": {"message_id": f"m{i}"},
+                                         "session": {"session_id": f"s{i}"},
+                                         "timing": self.timing})
+                    for i in range(2)]
+        messages.append(BaseMessage(msg_type="test", data={}, context={}))
+        events = to_chrome_trace(messages)["traceEvents"]
+        processes = {e["pid"]: e["args"]["name"] for e in events
+                     if e["name"] == "process_name"}
+        self.assertEqual(processes, {1: "s0", 2: "s1"})
+
+    def test_otlp_spans(self):
+        from neon_data_models.trace import to_otlp_spans
+        doc = to_otlp_spans({"m1": self.timing}, service_name="test")
+        resource = doc["resourceSpans"][0]
+        self.assertEqual(resource["resource"]["attributes"][0]["value"],
+                         {"stringValue": "test"})
+        spans = resource["scopeSpans"][0]["spans"]
+        root, stt, tts = spans
+        self.assertEqual(root["name"], "interaction")
+        self.assertEqual(len(root["traceId"]), 32)
+        self.assertEqual(len(root["spanId"]), 16)
+        self.assertEqual(root["startTimeUnixNano"], str(1000 * 10 ** 9))
+        self.assertEqual(root["endTimeUnixNano"], str(1001 * 10 ** 9))
+        self.assertEqual([e["name"] for e in root["events"]],
+                         ["client_sent", "response_sent"])
+        for span in (stt, tts):
+            self.assertEqual(span["traceId"], root["traceId"])
+            self.assertEqual(span["parentSpanId"], root["spanId"])
+        self.assertEqual(stt["endTimeUnixNano"], tts["startTimeUnixNano"])
+        self.assertEqual(tts["endTimeUnixNano"], str(1000750000000))
+
+    def test_write(self):
+        from neon_data_models.trace import write_chrome_trace, \
+            write_otlp_json, to_chrome_trace, to_otlp_spans
+        timings = {"m1": self.timing}
+        with TemporaryDirectory() as tmp:
+            write_chrome_trace(join(tmp, "trace.json"), timings)
+            write_otlp_json(join(tmp, "otlp.json"), timings)
+            with open(join(tmp, "trace.json")) as f:
+                self.assertEqual(json.load(f), to_chrome_trace(timings))
+            with open(join(tmp, "otlp.json")) as f:
+                self.assertEqual(json.load(f), to_otlp_spans(timings))
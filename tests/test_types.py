@@ -0,0 +1,144 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from base64 import b64decode, b64encode
+from pickle import dumps, loads
+from unittest import TestCase
+
+from pydantic import ValidationError
+
+
+class TestBase64Audio(TestCase):
+    def test_base64_audio(self):
+        from neon_data_models.types import Base64Audio
+        raw = b"\x00\x01audio\xff"
+        encoded = b64encode(raw).decode()
+
+        from_str = Base64Audio(encoded)
+        from_bytes = Base64Audio.from_bytes(raw)
+        self.assertEqual(from_str, from_bytes)
+        self.assertEqual(hash(from_str), hash(from_bytes))
+        self.assertEqual(from_str, encoded)
+        self.assertEqual(bytes(from_str), raw)
+        self.assertEqual(from_str.raw, raw)
+        self.assertEqual(str(from_bytes), encoded)
+        self.assertIs(type(from_bytes.b64), str)
+
+        # Values are usable as base64 strings
+        self.assertEqual(b64decode(str(from_str)), raw)
+        self.assertEqual(from_str.encode(), encoded.encode())
+        self.assertEqual(from_bytes.encode(), encoded.encode())
+
+        # Raw bytes are only encoded when needed
+        self.assertIsNone(Base64Audio.from_bytes(raw)._b64)
+        self.assertEqual(loads(dumps(from_bytes)), from_str)
+
+        # Raw buffers are not copied
+        buffer = memoryview(b"header" + raw)[6:]
+        self.assertIs(Base64Audio.from_bytes(buffer).raw, buffer)
+
+    def test_model_field(self):
+        from neon_data_models.types import Base64Audio
+        from neon_data_models.models.api.node_v1 import AudioInputData
+        raw = b"audio bytes"
+        encoded = b64encode(raw).decode()
+
+        from_str = AudioInputData(audio_data=encoded, lang="en-us")
+        from_bytes = AudioInputData(audio_data=raw, lang="en-us")
+        self.assertIsInstance(from_str.audio_data, Base64Audio)
+        self.assertEqual(from_str, from_bytes)
+        self.assertEqual(b64decode(str(from_bytes.audio_data)), raw)
+
+        # Serialization is always base64
+        self.assertEqual(from_bytes.model_dump()["audio_data"], encoded)
+        self.assertIs(type(from_bytes.model_dump()["audio_data"]), str)
+        self.assertEqual(from_bytes.model_dump(mode="json")["audio_data"],
+                         encoded)
+        self.assertEqual(AudioInputData.model_validate_json(
+            from_bytes.model_dump_json()), from_str)
+
+        # JSON Schema
+        schema = AudioInputData.model_json_schema()
+        self.assertEqual(schema["properties"]["audio_data"]["type"], "string")
+
+        with self.assertRaises(ValidationError):
+            AudioInputData(audio_data=1, lang="en-us")
+
+
+class TestPermissionSet(TestCase):
+    def test_permission_set(self):
+        from neon_data_models.types import PermissionSet
+        permissions = PermissionSet({"chat": True, "admin": False})
+        self.assertIs(PermissionSet({"admin": False, "chat": True}),
+                      permissions)
+        self.assertIsNot(PermissionSet({"chat": True}), permissions)
+        self.assertIs(PermissionSet(), PermissionSet({}))
+        self.assertEqual(permissions, {"chat": True, "admin": False})
+        self.assertEqual(dict(permissions), {"chat": True, "admin": False})
+        self.assertEqual(hash(permissions),
+                         hash(PermissionSet(dict(permissions))))
+        self.assertTrue(permissions["chat"])
+        self.assertIn("admin", permissions)
+        self.assertTrue(permissions.allows("chat"))
+        self.assertFalse(permissions.allows("admin"))
+        self.assertFalse(permissions.allows("invalid"))
+        self.assertEqual(permissions.granted, {"chat"})
+        self.assertIsInstance(permissions.granted, frozenset)
+        with self.assertRaises(TypeError):
+            permissions["admin"] = True
+        with self.assertRaises(AttributeError):
+            permissions.granted = frozenset({"admin"})
+        with self.assertRaises(AttributeError):
+            del permissions.granted
+
+    def test_model_field(self):
+        import pickle
+        from copy import deepcopy
+        from neon_data_models.models.user import TokenConfig
+        from neon_data_models.types import PermissionSet
+        kwargs = dict(username="test", client_id="test", refresh_token="",
+                      expiration=0, refresh_expiration=0, token_name="test",
+                      creation_timestamp=0, last_refresh_timestamp=0)
+        token = TokenConfig(permissions={"chat": True}, **kwargs)
+        self.assertIsInstance(token.permissions, PermissionSet)
+        from_json = TokenConfig.model_validate_json(token.model_dump_json())
+        self.assertIs(from_json.permissions, token.permissions)
+        self.assertIs(deepcopy(token).permissions, token.permissions)
+        self.assertIs(pickle.loads(pickle.dumps(token)).permissions,
+                      token.permissions)
+
+        # Serialized as a copy which does not change the interned value
+        dumped = token.model_dump()["permissions"]
+        self.assertIs(type(dumped), dict)
+        dumped["chat"] = False
+        self.assertTrue(token.permissions["chat"])
+
+        self.assertTrue(TokenConfig(permissions={"chat": "true"},
+                                    **kwargs).permissions.allows("chat"))
+        with self.assertRaises(ValidationError):
+            TokenConfig(permissions={"chat": "maybe"}, **kwargs)
+        with self.assertRaises(ValidationError):
+            TokenConfig(permissions=["chat"], **kwargs)
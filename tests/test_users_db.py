@@ -0,0 +1,142 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from neon_data_models.models.api.mq import (UserDbBatchRequest,
+                                            UserDbBatchResponse,
+                                            UserDbOperation, UserDbRequest,
+                                            UserDbResult)
+from neon_data_models.models.user.database import User
+from neon_data_models.users_db import UsersDatabase, UsersDbServer
+
+
+def _request(operation: str, username: str = "test", **kwargs) -> \
+        UserDbRequest:
+    return UserDbRequest(operation=operation, username=username,
+                         message_id="test", **kwargs)
+
+
+class TestUsersDatabase(TestCase):
+    def test_operations(self):
+        db = UsersDatabase()
+        user = User(username="test", password_hash="hash",
+                    tokens=[{"username": "test", "client_id": "client",
+                             "permissions": {}, "refresh_token": "",
+                             "access_token": "token", "expiration": 0,
+                             "refresh_expiration": 0, "token_name": "test",
+                             "creation_timestamp": 0,
+                             "last_refresh_timestamp": 0}])
+        result = db.handle(_request("create", user=user))
+        self.assertTrue(result.success)
+        self.assertEqual(len(db), 1)
+        self.assertFalse(db.handle(_request("create", user=user)).success)
+        self.assertFalse(db.handle(_request("create", "other",
+                                            user=user)).success)
+
+        self.assertEqual(db.handle(_request("read")).user, user)
+        self.assertEqual(db.handle(_request("read", password="hash")).user,
+                         user)
+        self.assertEqual(db.handle(_request("read", password="wrong")).error,
+                         "Invalid password")
+        self.assertTrue(db.handle(_request("read",
+                                           access_token="token")).success)
+        self.assertFalse(db.handle(_request("read",
+                                            access_token="wrong")).success)
+        self.assertEqual(db.handle(_request("read", "missing")).error,
+                         "User not found: missing")
+        self.assertEqual(db.handle(_request(
+            "read", fields=["neon.units.time"])).projection,
+            {"neon": {"units": {"time": 12}}})
+
+        result = db.handle(_request("update", patch={
+            "neon": {"units": {"time": 24}}}))
+        self.assertEqual(result.user.neon.units.time, 24)
+        self.assertEqual(db.handle(_request("read")).user.neon.units.time,
+                         24)
+        self.assertFalse(db.handle(_request("update")).success)
+        renamed = user.model_copy(update={"username": "renamed"})
+        self.assertTrue(db.handle(_request("update", user=renamed)).success)
+        self.assertFalse(db.handle(_request("read")).success)
+        self.assertEqual(db.handle(_request("read", "renamed")).user.user_id,
+                         user.user_id)
+
+        self.assertTrue(db.handle(_request("delete", "renamed")).success)
+        self.assertEqual(len(db), 0)
+        db.close()
+
+    def test_handle_many(self):
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "users.db")
+            db = UsersDatabase(path)
+            results = db.handle_many([
+                UserDbOperation(operation="create", username=name,
+                                user={"username": name})
+                for name in ("a", "b", "a", "c")])
+            self.assertEqual([r.success for r in results],
+                             [True, True, False, True])
+            db.close()
+            # Successful operations are persisted
+            db = UsersDatabase(path)
+            self.assertEqual(len(db), 3)
+            db.close()
+
+
+class TestUsersDbServer(TestCase):
+    def test_server(self):
+        async def _test():
+            async with UsersDbServer() as server:
+                result = await server.request(_request(
+                    "create", user={"username": "test"}))
+                self.assertIsInstance(result, UserDbResult)
+                self.assertTrue(result.success)
+                results = await asyncio.gather(*(
+                    server.request(_request("read")) for _ in range(10)))
+                self.assertTrue(all(r.user.username == "test"
+                                    for r in results))
+
+                batch = UserDbBatchRequest(message_id="batch", requests=[
+                    _request("create", f"user_{i}",
+                             user={"username": f"user_{i}"})
+                    for i in range(5)] + [_request("read", "missing")])
+                response = await server.request(batch)
+                self.assertIsInstance(response, UserDbBatchResponse)
+                self.assertEqual(response.message_id, "batch")
+                self.assertEqual(list(response.errors), [5])
+                self.assertEqual(len(server.database), 6)
+
+                error = UserDbResult.model_validate_json(
+                    await server.send('{"operation": "get"}'))
+                self.assertFalse(error.success)
+                error = UserDbResult.model_validate_json(
+                    await server.send("not json"))
+                self.assertFalse(error.success)
+
+        asyncio.run(_test())
@@ -0,0 +1,90 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Development System
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2024 Neongecko.com Inc.
+# BSD-3
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from unittest import TestCase
+
+
+class TestBinaryCodec(TestCase):
+    def test_dump_load_binary(self):
+        from neon_data_models.util import dump_binary, load_binary
+        from neon_data_models.models.api.node_v1 import (NodeAudioInput,
+                                                         NodeKlatResponse)
+        raw = bytes(range(256)) * 16
+        audio_input = NodeAudioInput(data={"audio_data": raw,
+                                           "lang": "en-us"},
+                                     context={"username": "test"})
+        frame = dump_binary(audio_input)
+        # Audio is not base64-encoded in the frame
+        self.assertLess(len(frame), len(audio_input.model_dump_json()))
+        self.assertIn(raw, frame)
+
+        loaded = load_binary(frame, NodeAudioInput)
+        self.assertEqual(loaded, audio_input)
+        self.assertIsInstance(loaded.data.audio_data.raw, memoryview)
+        self.assertEqual(bytes(loaded.data.audio_data), raw)
+
+        klat_response = NodeKlatResponse(
+            data={"en-us": {"sentence": "test",
+                            "audio": {"male": raw, "female": None}},
+                  "uk-ua": {"sentence": "test",
+                            "audio": {"male": None, "female": raw[:10]}}},
+            context={})
+        self.assertEqual(load_binary(dump_binary(klat_response),
+                                     NodeKlatResponse), klat_response)
+
+        with self.assertRaises(ValueError):
+            load_binary(b"invalid frame", NodeAudioInput)
+        with self.assertRaises(ValueError):
+            load_binary(frame + b"extra", NodeAudioInput)
+
+        # Truncated frames
+        for length in (len(frame) - 1, 10, 6):
+            with self.assertRaises(ValueError):
+                load_binary(frame[:length], NodeAudioInput)
+
+    def test_binary_free_form_data(self):
+        from neon_data_models.util import dump_binary, load_binary
+        from neon_data_models.models.api.node_v1 import CoreWWDetected
+        # Free-form payloads that look like segment references are data
+        message = CoreWWDetected(data={"ref": {"$binary": 5},
+                                       "items": [{"$binary": 0}]},
+                                 context={"extra": {"$binary": 0}})
+        self.assertEqual(load_binary(dump_binary(message), CoreWWDetected),
+                         message)
+
+    def test_binary_invalid_segment_table(self):
+        import struct
+        from neon_data_models.util import _BINARY_MAGIC, load_binary
+        from neon_data_models.models.api.node_v1 import CoreWWDetected
+        header = b'{"msg_type":"neon.ww_detected","data":{"a":1},' \
+                 b'"context":{}}'
+        for table in (b'[["data","missing"]]', b'[["data","a"]]',
+                      b'[[]]', b'[["data",0]]', b'{}'):
+            frame = _BINARY_MAGIC + struct.pack("!III1Q", len(table),
+                                                len(header), 1, 1) + \
+                table + header + b"x"
+            with self.assertRaises(ValueError):
+                load_binary(frame, CoreWWDetected)